@@ -1,20 +1,287 @@
+import os
 import sqlite3
+import threading
 from contextlib import contextmanager
-from typing import List, Dict, Optional
-from datetime import datetime
+from itertools import islice
+from typing import List, Dict, Optional, Iterable, Iterator
+from datetime import datetime, timezone, timedelta
 import uuid
 
 
 class DatabaseManager:
-    def __init__(self, db_name="nazm_ara.db"):
+    """
+    SQLite storage for users, tasks, tags and habits.
+    In persistent mode (the default) every thread reuses one long-lived connection
+    instead of opening a new one per statement; call close() on shutdown.
+    """
+    # Ordered schema migrations as (version, method name). Append new steps here and
+    # never edit a released one; the database records its version in PRAGMA user_version.
+    MIGRATIONS = [
+        (1, "migrateToV1"),
+        (2, "migrateToV2"),
+        (3, "migrateToV3"),
+        (4, "migrateToV4"),
+        (5, "migrateToV5"),
+        (6, "migrateToV6"),
+        (7, "migrateToV7"),
+        (8, "migrateToV8"),
+        (9, "migrateToV9"),
+    ]
+    SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+    # Per-connection PRAGMA sets. All profiles use WAL so readers never block the writer;
+    # they differ in how often SQLite fsyncs and how much memory it may use.
+    # auto_vacuum must precede journal_mode: it only takes effect on a database that has no
+    # WAL header or tables yet, and older databases are converted by compactTombstones(full_vacuum=True).
+    #   durable:  fsync on every commit, nothing is lost on power failure
+    #   balanced: fsync at checkpoints only, a power cut may lose the last commits but never corrupts
+    #   fast:     no fsync at all, for throwaway or easily rebuilt databases
+    STORAGE_PROFILES = {
+        "durable": {
+            "auto_vacuum": "INCREMENTAL",
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "cache_size": -8000,        # negative values are KiB
+            "mmap_size": 0,
+            "temp_store": "DEFAULT",
+            "foreign_keys": "ON",
+        },
+        "balanced": {
+            "auto_vacuum": "INCREMENTAL",
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -32000,
+            "mmap_size": 134217728,     # 128 MiB
+            "temp_store": "MEMORY",
+            "foreign_keys": "ON",
+        },
+        "fast": {
+            "auto_vacuum": "INCREMENTAL",
+            "journal_mode": "WAL",
+            "synchronous": "OFF",
+            "cache_size": -64000,
+            "mmap_size": 268435456,     # 256 MiB
+            "temp_store": "MEMORY",
+            "foreign_keys": "ON",
+        },
+    }
+    DEFAULT_STORAGE_PROFILE = "balanced"
+    # Rows per executemany/fetchmany call in the bulk import and export paths
+    BULK_CHUNK_SIZE = 500
+    # A buffered task write that fails this many flushes in a row is quarantined, see flushPendingWrites()
+    MAX_FLUSH_ATTEMPTS = 5
+    CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+    # Synced soft-deleted rows are kept this long before compactTombstones() removes them,
+    # in batches small enough that the write lock is only ever held briefly
+    TOMBSTONE_RETENTION_DAYS = 30
+    COMPACTION_BATCH_SIZE = 500
+    # Folds Persian/Arabic spelling variants together for the full-text index: Arabic yeh
+    # and kaf to their Persian forms, hamza-seated alefs and teh marbuta to their plain
+    # letters, Persian and Arabic-Indic digits to ASCII, and ZWNJ, tatweel and harakat removed
+    SEARCH_NORMALIZATION = str.maketrans({
+        "\u064a": "\u06cc", "\u0649": "\u06cc", "\u0643": "\u06a9",
+        "\u0623": "\u0627", "\u0625": "\u0627", "\u0671": "\u0627",
+        "\u0629": "\u0647", "\u06c0": "\u0647",
+        **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+        **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+        "\u200c": None, "\u0640": None,
+        **{chr(code): None for code in range(0x064B, 0x0653)},
+    })
+    SEARCH_PAGE_SIZE = 50
+
+    # Days of daily_habits read per query while walking along a streak
+    STREAK_WINDOW_DAYS = 64
+    COMPLETION_WINDOWS = (7, 30, 365)
+
+    # Source tables of the full-text indexes (<table>_fts) and the columns they index
+    SEARCH_INDEXES = {
+        "tasks": ("title", "description"),
+        "habits": ("title", "question", "description"),
+    }
+
+    # Tables exchanged with the sync server, parents before children, mapped to the
+    # columns that identify a row when applying server changes
+    SYNC_TABLES = {
+        "tags": ("local_id",),
+        "habits": ("local_id",),
+        "tasks": ("local_id",),
+        "daily_habits": ("user_id", "habit_id", "date"),
+    }
+
+    # Queries on the UI's hot paths. They are kept here so findUnindexedQueries()
+    # checks exactly the SQL the methods run.
+    HOT_QUERIES = {
+        "tasks_by_date": """
+            SELECT * FROM tasks WHERE date_time = ? AND deleted_at IS NULL AND user_id = ?
+        """,
+        "tasks_in_range": """
+            SELECT * FROM tasks
+            WHERE user_id = ? AND deleted_at IS NULL AND date_time BETWEEN ? AND ?
+            ORDER BY date_time
+        """,
+        "user_task_dates": """
+            SELECT DISTINCT date_time FROM tasks WHERE user_id = ? AND deleted_at IS NULL
+        """,
+        "task_counts_in_range": """
+            SELECT date_time, COUNT(*), SUM(is_complete) FROM tasks
+            WHERE user_id = ? AND deleted_at IS NULL AND date_time BETWEEN ? AND ?
+            GROUP BY date_time
+        """,
+        "user_habits": """
+            SELECT * FROM habits WHERE user_id = ? AND deleted_at IS NULL AND archive IN (0, ?)
+            ORDER BY priority DESC, title
+        """,
+        "habit_completion": """
+            SELECT habit_id, SUM(date >= ?), SUM(date >= ?), COUNT(*) FROM daily_habits
+            WHERE user_id = ? AND deleted_at IS NULL AND date >= ? AND date <= ? AND value > 0
+            GROUP BY habit_id
+        """,
+        "habit_values_in_range": """
+            SELECT habit_id, date, value FROM daily_habits
+            WHERE user_id = ? AND deleted_at IS NULL AND date BETWEEN ? AND ?
+        """,
+    }
+
+    # Process-wide state shared by every manager instance
+    _shared_instances = {}
+    _shared_lock = threading.Lock()
+    _bootstrapped_dbs = set()
+    _bootstrap_lock = threading.Lock()
+
+    def __init__(self, db_name="nazm_ara.db", persistent: bool = True,
+                 storage_profile: str = DEFAULT_STORAGE_PROFILE):
+        if storage_profile not in DatabaseManager.STORAGE_PROFILES:
+            raise ValueError(f"Unknown storage profile: {storage_profile}")
+
         self.db_name = db_name
+        self.persistent = persistent
+        self.storage_profile = storage_profile
+
+        # One connection per thread; sqlite3 connections must not be shared across threads
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+        # Write-behind buffer for task mutations, see enableWriteBehind()
+        self._pending_writes = {}
+        self._pending_lock = threading.Lock()
+        # Held from taking the buffer until its transaction ends, so flushes commit in order
+        # and a reader that flushes first also waits for a flush already under way
+        self._flush_lock = threading.Lock()
+        self._flush_attempts = {}
+        self.failed_writes = []
+        self._flusher = None
+        self._flush_wakeup = threading.Event()
+        self._flush_stop = threading.Event()
+        self.flush_interval = 0.5
+
+        # Callables notified with a table name after local edits, see addChangeListener()
+        self._change_listeners = []
+
         self.initDb()
 
 
+    @classmethod
+    def shared(cls, db_name="nazm_ara.db", storage_profile: str = DEFAULT_STORAGE_PROFILE) -> "DatabaseManager":
+        """
+        Returns the process-wide manager for db_name, creating it on first use.
+        storage_profile only applies to that first call.
+        """
+        with cls._shared_lock:
+            if db_name not in cls._shared_instances:
+                cls._shared_instances[db_name] = cls(db_name, storage_profile=storage_profile)
+            return cls._shared_instances[db_name]
+
+
+    def openConnection(self) -> sqlite3.Connection:
+        """Opens and configures a new SQLite connection."""
+        # check_same_thread is disabled only so close() can release connections
+        # owned by other threads at shutdown; each thread still uses its own.
+        conn = sqlite3.connect(self.db_name, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # Used by migrateToV8 and rebuildSearchIndex() to fill the full-text indexes
+        conn.create_function("nazm_normalize", 1, self.normalizeSearchText, deterministic=True)
+        self.applyStorageProfile(conn)
+        return conn
+
+
+    def applyStorageProfile(self, conn: sqlite3.Connection):
+        """Applies the PRAGMAs of the selected storage profile to a fresh connection."""
+        for pragma, value in DatabaseManager.STORAGE_PROFILES[self.storage_profile].items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+
+
+    def checkpoint(self, mode: str = "PASSIVE") -> Optional[tuple]:
+        """
+        Copies WAL content back into the main database file.
+        PASSIVE never waits on readers or writers, so it is safe to call from an idle timer.
+        Returns (busy, wal_frames, checkpointed_frames) or None on error.
+        """
+        mode = mode.upper()
+        if mode not in DatabaseManager.CHECKPOINT_MODES:
+            raise ValueError(f"Unknown checkpoint mode: {mode}")
+
+        try:
+            with self.getConnection() as conn:
+                row = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+                return tuple(row)
+        except sqlite3.Error as e:
+            print(f"Error checkpointing database: {e}")
+            return None
+
+
+    def findUnindexedQueries(self) -> List[Dict]:
+        """
+        Runs EXPLAIN QUERY PLAN over HOT_QUERIES and returns every plan step that
+        falls back to a SCAN. An empty list means every hot path is an index SEARCH.
+        """
+        slow_steps = []
+        with self.getConnection() as conn:
+            for name, sql in DatabaseManager.HOT_QUERIES.items():
+                params = (None,) * sql.count("?")
+                for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params):
+                    detail = row["detail"]
+                    if detail.startswith("SCAN"):
+                        slow_steps.append({"query": name, "detail": detail})
+        return slow_steps
+
+
+    def acquireConnection(self) -> sqlite3.Connection:
+        """Returns the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self.openConnection()
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+
+    def releaseConnection(self):
+        """Closes the calling thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._connections_lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+
     @contextmanager
     def getConnection(self):
-        conn = sqlite3.connect(self.db_name)
-        conn.row_factory = sqlite3.Row
+        """
+        Yields the thread's connection and commits when the block exits.
+        Inside a transaction() scope the commit is deferred to the outermost scope.
+        """
+        conn = self.acquireConnection()
+        if self._local.depth > 0:
+            yield conn
+            return
+
+        self._local.depth += 1
         try:
             yield conn
             conn.commit()
@@ -22,112 +289,405 @@ class DatabaseManager:
             conn.rollback()
             print(f"Database Error: {e}")
             raise
+        except BaseException:
+            # A persistent connection outlives this block, so never leave a half-done transaction on it
+            conn.rollback()
+            raise
         finally:
-            conn.close()
+            self._local.depth -= 1
+            if not self.persistent:
+                self.releaseConnection()
+
+
+    @contextmanager
+    def transaction(self, immediate: bool = False):
+        """
+        Groups several statements into a single transaction.
+        Everything inside the block is committed together or rolled back on error.
+        immediate=True takes the write lock up front instead of on the first write.
+        """
+        with self.getConnection() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+
+
+    def close(self):
+        """
+        Flushes buffered writes and closes every connection opened by this manager.
+        Call once on application shutdown.
+        """
+        self.disableWriteBehind()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error closing database connection: {e}")
+        self._local = threading.local()
+
 
     def initDb(self):
-        try:
-            with self.getConnection() as conn:
+        """Brings the schema up to date once per process and database file."""
+        with DatabaseManager._bootstrap_lock:
+            if self.db_name in DatabaseManager._bootstrapped_dbs:
+                return
+            try:
+                self.runMigrations()
+            except sqlite3.Error as e:
+                print(f"Error initializing database: {e}")
+                raise
+
+            # In-memory databases are private to their connection, so they always need a bootstrap
+            if self.db_name != ":memory:":
+                DatabaseManager._bootstrapped_dbs.add(self.db_name)
+
+
+    def runMigrations(self):
+        """
+        Applies every registered migration newer than PRAGMA user_version, in order.
+        Each step and its version bump run in one transaction, so an interrupted
+        upgrade resumes from the last completed step on the next launch.
+        """
+        with self.getConnection() as conn:
+            current_version = self.getSchemaVersion(conn.cursor())
+
+        # Fast path: an up-to-date database costs a single PRAGMA read
+        if current_version >= DatabaseManager.SCHEMA_VERSION:
+            if current_version > DatabaseManager.SCHEMA_VERSION:
+                print(f"Database schema v{current_version} is newer than this app (v{DatabaseManager.SCHEMA_VERSION}).")
+            return
+
+        for version, migration_name in DatabaseManager.MIGRATIONS:
+            if version <= current_version:
+                continue
+
+            with self.transaction(immediate=True) as conn:
                 cursor = conn.cursor()
+                # Another process may have applied this step while we waited for the write lock
+                if self.getSchemaVersion(cursor) >= version:
+                    continue
+                getattr(self, migration_name)(cursor)
+                cursor.execute(f"PRAGMA user_version = {version}")
 
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS users (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER,
-                        nickname TEXT,
-                        token TEXT,
-                        f_name TEXT,
-                        l_name TEXT,
-                        email TEXT
-                    )
-                """)
 
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS tags (
-                        local_id TEXT PRIMARY KEY NOT NULL,
-                        server_id INTEGER DEFAULT NULL,
-                        user_id INTEGER NOT NULL,
-                        name TEXT NOT NULL UNIQUE,
-                        needs_sync INTEGER DEFAULT 1 CHECK(needs_sync IN (0,1)),
-                        deleted_at TEXT DEFAULT NULL,
-                        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                        UNIQUE (user_id, name)
-                    )
-                """)
+    def getSchemaVersion(self, cursor: sqlite3.Cursor) -> int:
+        """Reads the schema version stored in the database header."""
+        cursor.execute("PRAGMA user_version")
+        return cursor.fetchone()[0]
 
-                cursor.execute("""
-                        CREATE TABLE IF NOT EXISTS tasks (
-                            local_id TEXT PRIMARY KEY NOT NULL,
-                            server_id INTEGER DEFAULT NULL,
-                            user_id INTEGER NOT NULL,
-                            title TEXT NOT NULL,
-                            is_complete INTEGER DEFAULT 0 CHECK(is_complete IN (0,1)),
-                            description TEXT,
-                            priority INTEGER DEFAULT 1 CHECK(priority IN (0,1,2)),
-                            date_time TEXT,
-                            tag_id TEXT DEFAULT NULL,
-                            needs_sync INTEGER DEFAULT 1 CHECK(needs_sync IN (0,1)),
-                            deleted_at TEXT DEFAULT NULL,
-                            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                            FOREIGN KEY (tag_id) REFERENCES tags(local_id) ON DELETE SET NULL,
-                            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-                        )
-                """)
-
-                # Indexes improve search speed for synchronization and date-based filtering
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_server_id ON tasks(server_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_sync ON tasks(needs_sync)")
+    # ==================== MIGRATIONS ====================
 
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS habits (
-                        local_id TEXT PRIMARY KEY NOT NULL,
-                        server_id INTEGER DEFAULT NULL,
-                        user_id INTEGER NOT NULL,
-                        title TEXT NOT NULL,
-                        question TEXT NOT NULL,
-                        unit INTEGER NOT NULL,
-                        tag_id TEXT DEFAULT NULL,
-                        description TEXT,
-                        priority INTEGER DEFAULT 1 CHECK(priority IN (0,1,2)),
-                        archive INTEGER DEFAULT 0 CHECK(archive IN (0,1)),
-                        color TEXT NOT NULL,
-                        needs_sync INTEGER DEFAULT 1 CHECK(needs_sync IN (0,1)),
-                        deleted_at TEXT DEFAULT NULL,
-                        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (tag_id) REFERENCES tags(local_id) ON DELETE SET NULL,
-                        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-                        )
-                """)
+    def migrateToV1(self, cursor: sqlite3.Cursor):
+        """Base schema: users, tags, tasks, habits and daily_habits."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER,
+                nickname TEXT,
+                token TEXT,
+                f_name TEXT,
+                l_name TEXT,
+                email TEXT
+            )
+        """)
 
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_habits_server_id ON habits(server_id)
-                """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tags (
+                local_id TEXT PRIMARY KEY NOT NULL,
+                server_id INTEGER DEFAULT NULL,
+                user_id INTEGER NOT NULL,
+                name TEXT NOT NULL UNIQUE,
+                needs_sync INTEGER DEFAULT 1 CHECK(needs_sync IN (0,1)),
+                deleted_at TEXT DEFAULT NULL,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+                UNIQUE (user_id, name)
+            )
+        """)
 
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS daily_habits (
-                        local_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        habit_id TEXT NOT NULL,
-                        user_id INTEGER NOT NULL,
-                        server_id INTEGER DEFAULT NULL,
-                        date TEXT NOT NULL,
-                        value INTEGER DEFAULT 0,
-                        needs_sync INTEGER DEFAULT 1 CHECK(needs_sync IN (0,1)),
-                        deleted_at TEXT DEFAULT NULL,
-                        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (habit_id) REFERENCES habits(local_id) ON DELETE CASCADE,
-                        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                        UNIQUE (user_id, habit_id, date)
-                    )
-                """)
-                
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_daily_habits_date ON daily_habits(date)
-                """)
-                
-        except sqlite3.Error as e:
-            print(f"Error initializing database: {e}")
-            raise
+        cursor.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    local_id TEXT PRIMARY KEY NOT NULL,
+                    server_id INTEGER DEFAULT NULL,
+                    user_id INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    is_complete INTEGER DEFAULT 0 CHECK(is_complete IN (0,1)),
+                    description TEXT,
+                    priority INTEGER DEFAULT 1 CHECK(priority IN (0,1,2)),
+                    date_time TEXT,
+                    tag_id TEXT DEFAULT NULL,
+                    needs_sync INTEGER DEFAULT 1 CHECK(needs_sync IN (0,1)),
+                    deleted_at TEXT DEFAULT NULL,
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (tag_id) REFERENCES tags(local_id) ON DELETE SET NULL,
+                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+                )
+        """)
+
+        # Indexes improve search speed for synchronization and date-based filtering
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_server_id ON tasks(server_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_sync ON tasks(needs_sync)")
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS habits (
+                local_id TEXT PRIMARY KEY NOT NULL,
+                server_id INTEGER DEFAULT NULL,
+                user_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                question TEXT NOT NULL,
+                unit INTEGER NOT NULL,
+                tag_id TEXT DEFAULT NULL,
+                description TEXT,
+                priority INTEGER DEFAULT 1 CHECK(priority IN (0,1,2)),
+                archive INTEGER DEFAULT 0 CHECK(archive IN (0,1)),
+                color TEXT NOT NULL,
+                needs_sync INTEGER DEFAULT 1 CHECK(needs_sync IN (0,1)),
+                deleted_at TEXT DEFAULT NULL,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (tag_id) REFERENCES tags(local_id) ON DELETE SET NULL,
+                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+                )
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_habits_server_id ON habits(server_id)
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS daily_habits (
+                local_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                habit_id TEXT NOT NULL,
+                user_id INTEGER NOT NULL,
+                server_id INTEGER DEFAULT NULL,
+                date TEXT NOT NULL,
+                value INTEGER DEFAULT 0,
+                needs_sync INTEGER DEFAULT 1 CHECK(needs_sync IN (0,1)),
+                deleted_at TEXT DEFAULT NULL,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (habit_id) REFERENCES habits(local_id) ON DELETE CASCADE,
+                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+                UNIQUE (user_id, habit_id, date)
+            )
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_daily_habits_date ON daily_habits(date)
+        """)
+
+
+    def migrateToV2(self, cursor: sqlite3.Cursor):
+        """Per-day task index for getTasksByDate and getUserTaskDates."""
+        # Partial index: soft-deleted rows are never read by the UI, so they are left out of it
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_user_date ON tasks(user_id, date_time)
+            WHERE deleted_at IS NULL
+        """)
+
+
+    def migrateToV3(self, cursor: sqlite3.Cursor):
+        """Dirty-row indexes for the sync engine and the per-user pull cursor."""
+        # tasks already has idx_tasks_sync; the partial indexes hold only rows waiting to be pushed
+        for table in ("tags", "habits", "daily_habits"):
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_sync ON {table}(needs_sync) WHERE needs_sync = 1")
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                user_id INTEGER PRIMARY KEY,
+                cursor TEXT DEFAULT NULL,
+                synced_at TEXT DEFAULT NULL,
+                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+        """)
+
+
+    def migrateToV4(self, cursor: sqlite3.Cursor):
+        """Tombstone indexes for compactTombstones()."""
+        # Only synced tombstones are indexed, so each compaction batch is a range read on deleted_at.
+        # The table list is frozen at this version; later sync tables get their index in their own migration.
+        for table in ("tags", "habits", "tasks", "daily_habits"):
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{table}_tombstones ON {table}(deleted_at)
+                WHERE deleted_at IS NOT NULL AND needs_sync = 0
+            """)
+
+    def migrateToV5(self, cursor: sqlite3.Cursor):
+        """Per-user indexes for the habit list and the habit grid's date-range reads."""
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_habits_user ON habits(user_id) WHERE deleted_at IS NULL
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_daily_habits_user_date ON daily_habits(user_id, date)
+            WHERE deleted_at IS NULL
+        """)
+
+    def migrateToV6(self, cursor: sqlite3.Cursor):
+        """Materialized per-habit statistics, filled from the existing daily_habits rows."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS habit_stats (
+                habit_id TEXT PRIMARY KEY NOT NULL,
+                user_id INTEGER NOT NULL,
+                total_value INTEGER DEFAULT 0,
+                done_days INTEGER DEFAULT 0,
+                best_streak INTEGER DEFAULT 0,
+                last_run_end TEXT DEFAULT NULL,
+                last_run_length INTEGER DEFAULT 0,
+                FOREIGN KEY (habit_id) REFERENCES habits(local_id) ON DELETE CASCADE,
+                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+        """)
+        # Fixed SQL rather than rebuildHabit(), so this migration never changes with the live code.
+        # Consecutive done days share julianday(date) - row number, which groups them into runs.
+        cursor.execute("""
+            WITH done AS (
+                SELECT user_id, habit_id, date,
+                       julianday(date) - ROW_NUMBER() OVER (PARTITION BY user_id, habit_id ORDER BY date) AS run
+                FROM daily_habits WHERE deleted_at IS NULL AND value > 0
+            ),
+            runs AS (
+                SELECT user_id, habit_id, COUNT(*) AS length, MAX(date) AS run_end
+                FROM done GROUP BY user_id, habit_id, run
+            ),
+            run_stats AS (
+                SELECT user_id, habit_id, SUM(length) AS done_days, MAX(length) AS best_streak,
+                       MAX(run_end) AS last_run_end
+                FROM runs GROUP BY user_id, habit_id
+            ),
+            totals AS (
+                SELECT user_id, habit_id, SUM(value) AS total_value
+                FROM daily_habits WHERE deleted_at IS NULL GROUP BY user_id, habit_id
+            )
+            INSERT OR REPLACE INTO habit_stats
+                (habit_id, user_id, total_value, done_days, best_streak, last_run_end, last_run_length)
+            SELECT habits.local_id, habits.user_id,
+                   COALESCE(totals.total_value, 0), COALESCE(run_stats.done_days, 0),
+                   COALESCE(run_stats.best_streak, 0), run_stats.last_run_end,
+                   COALESCE((SELECT runs.length FROM runs
+                             WHERE runs.user_id = habits.user_id AND runs.habit_id = habits.local_id
+                               AND runs.run_end = run_stats.last_run_end), 0)
+            FROM habits
+            LEFT JOIN totals ON totals.user_id = habits.user_id AND totals.habit_id = habits.local_id
+            LEFT JOIN run_stats ON run_stats.user_id = habits.user_id AND run_stats.habit_id = habits.local_id
+        """)
+
+    def migrateToV7(self, cursor: sqlite3.Cursor):
+        """Replaces idx_tasks_user_date with a covering index for the per-day task counts."""
+        # Not partial: SQLite only treats an index as covering when it holds every column the
+        # query reads, and "deleted_at IS NULL" is then served as an equality on the index.
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_user_day ON tasks(user_id, deleted_at, date_time, is_complete)
+        """)
+        cursor.execute("DROP INDEX IF EXISTS idx_tasks_user_date")
+
+    def migrateToV8(self, cursor: sqlite3.Cursor):
+        """Full-text indexes over task and habit text, maintained by triggers."""
+        # The indexes hold nazm_normalize()d copies of the text keyed by the source rowid
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                title, description, tokenize = 'unicode61 remove_diacritics 2'
+            )
+        """)
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS habits_fts USING fts5(
+                title, question, description, tokenize = 'unicode61 remove_diacritics 2'
+            )
+        """)
+
+        # Literal SQL rather than SEARCH_INDEXES/rebuildSearchIndex(), so this migration never
+        # changes with the live code
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts (rowid, title, description)
+                VALUES (new.rowid, nazm_normalize(new.title), nazm_normalize(new.description));
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+                DELETE FROM tasks_fts WHERE rowid = old.rowid;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+                DELETE FROM tasks_fts WHERE rowid = old.rowid;
+                INSERT INTO tasks_fts (rowid, title, description)
+                VALUES (new.rowid, nazm_normalize(new.title), nazm_normalize(new.description));
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS habits_fts_insert AFTER INSERT ON habits BEGIN
+                INSERT INTO habits_fts (rowid, title, question, description)
+                VALUES (new.rowid, nazm_normalize(new.title), nazm_normalize(new.question),
+                        nazm_normalize(new.description));
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS habits_fts_delete AFTER DELETE ON habits BEGIN
+                DELETE FROM habits_fts WHERE rowid = old.rowid;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS habits_fts_update AFTER UPDATE OF title, question, description ON habits BEGIN
+                DELETE FROM habits_fts WHERE rowid = old.rowid;
+                INSERT INTO habits_fts (rowid, title, question, description)
+                VALUES (new.rowid, nazm_normalize(new.title), nazm_normalize(new.question),
+                        nazm_normalize(new.description));
+            END
+        """)
+
+        cursor.execute("""
+            INSERT INTO tasks_fts (rowid, title, description)
+            SELECT rowid, nazm_normalize(title), nazm_normalize(description) FROM tasks
+        """)
+        cursor.execute("""
+            INSERT INTO habits_fts (rowid, title, question, description)
+            SELECT rowid, nazm_normalize(title), nazm_normalize(question), nazm_normalize(description) FROM habits
+        """)
+
+    def migrateToV9(self, cursor: sqlite3.Cursor):
+        """Queues changed rows for the full-text indexes instead of normalizing them in triggers."""
+        # The v8 triggers called nazm_normalize(), which only this app's connections define, so
+        # any other client failed every write to tasks and habits. The new triggers are plain SQL:
+        # they record which rows changed and refreshSearchIndex() normalizes them before a search.
+        # NOT EXISTS instead of INSERT OR IGNORE, which an outer upsert's conflict handling overrides.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS search_pending (
+                source TEXT NOT NULL,
+                source_rowid INTEGER NOT NULL,
+                PRIMARY KEY (source, source_rowid)
+            ) WITHOUT ROWID
+        """)
+        for trigger in ("tasks_fts_insert", "tasks_fts_update", "habits_fts_insert", "habits_fts_update"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS tasks_search_insert AFTER INSERT ON tasks BEGIN
+                INSERT INTO search_pending (source, source_rowid) SELECT 'tasks', new.rowid
+                WHERE NOT EXISTS (SELECT 1 FROM search_pending WHERE source = 'tasks' AND source_rowid = new.rowid);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS tasks_search_update AFTER UPDATE OF title, description ON tasks BEGIN
+                INSERT INTO search_pending (source, source_rowid) SELECT 'tasks', new.rowid
+                WHERE NOT EXISTS (SELECT 1 FROM search_pending WHERE source = 'tasks' AND source_rowid = new.rowid);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS habits_search_insert AFTER INSERT ON habits BEGIN
+                INSERT INTO search_pending (source, source_rowid) SELECT 'habits', new.rowid
+                WHERE NOT EXISTS (SELECT 1 FROM search_pending WHERE source = 'habits' AND source_rowid = new.rowid);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS habits_search_update AFTER UPDATE OF title, question, description ON habits BEGIN
+                INSERT INTO search_pending (source, source_rowid) SELECT 'habits', new.rowid
+                WHERE NOT EXISTS (SELECT 1 FROM search_pending WHERE source = 'habits' AND source_rowid = new.rowid);
+            END
+        """)
 
     # ==================== USERS ====================
 
@@ -160,6 +720,18 @@ class DatabaseManager:
             return False
 
 
+    def hasUsers(self) -> bool:
+        """True if at least one local account exists; stops at the first row instead of reading them all."""
+        try:
+            with self.getConnection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT EXISTS (SELECT 1 FROM users)")
+                return bool(cursor.fetchone()[0])
+        except sqlite3.Error as e:
+            print(f"Error checking for users: {e}")
+            return False
+
+
     def getListOfUsers(self) -> List[Dict]:
         try:
             with self.getConnection() as conn:
@@ -184,7 +756,8 @@ class DatabaseManager:
                     INSERT INTO tasks (local_id, title, description, priority, date_time, tag_id, user_id)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
                 """, (local_id, title, description, priority, date_time, tag_id, user_id))
-                return local_id
+            self.notifyChange("tasks")
+            return local_id
         except sqlite3.Error as e:
             print(f"Error adding task: {e}")
             return None
@@ -192,12 +765,11 @@ class DatabaseManager:
 
     def getTasksByDate(self, date: str, user_id: int) -> List[Dict]:
         """Retrieves tasks for a specific date, excluding those marked for deletion."""
+        self.flushPendingWrites()
         try:
             with self.getConnection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT * FROM tasks WHERE date_time = ? AND deleted_at IS NULL AND user_id = ?
-                """, (date, user_id))
+                cursor.execute(DatabaseManager.HOT_QUERIES["tasks_by_date"], (date, user_id))
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows]
         except sqlite3.Error as e:
@@ -205,12 +777,50 @@ class DatabaseManager:
             return []
 
 
+    def getTasksInRange(self, user_id: int, start: str, end: str) -> List[Dict]:
+        """Retrieves active tasks dated between start and end (inclusive ISO dates), ordered by date."""
+        self.flushPendingWrites()
+        try:
+            with self.getConnection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(DatabaseManager.HOT_QUERIES["tasks_in_range"], (user_id, start, end))
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+        except sqlite3.Error as e:
+            print(f"Error fetching tasks in range: {e}")
+            return []
+
+
+    def getTaskCountsByDate(self, user_id: int, start: str, end: str) -> Dict[str, tuple]:
+        """
+        Returns {ISO date: (total, completed)} active task counts for the days between
+        start and end that have tasks. Answered from the covering idx_tasks_user_day index
+        alone, so the cost depends on the range, not on how many tasks the user has.
+        """
+        self.flushPendingWrites()
+        try:
+            with self.getConnection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(DatabaseManager.HOT_QUERIES["task_counts_in_range"], (user_id, start, end))
+                return {date: (total, completed) for date, total, completed in cursor.fetchall()}
+        except sqlite3.Error as e:
+            print(f"Error counting tasks by date: {e}")
+            return {}
+
+
     def toggleTask(self, task_id: str, value: bool) -> bool:
+        now = self.timestamp()
+        if self.isWriteBehindEnabled():
+            self.queueTaskWrite(task_id, {"is_complete": int(value), "updated_at": now, "needs_sync": 1})
+            return True
+
         try:
             with self.getConnection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f"UPDATE tasks SET is_complete = ? WHERE local_id = ?", (value, task_id))
-                return True
+                cursor.execute("UPDATE tasks SET is_complete = ?, updated_at = ?, needs_sync = 1 WHERE local_id = ?",
+                               (value, now, task_id))
+            self.notifyChange("tasks")
+            return True
         except sqlite3.Error as e:
             print(f"Error updating specified task: {e}")
             return False
@@ -218,10 +828,11 @@ class DatabaseManager:
 
     def getUserTaskDates(self, user_id: str) ->  Optional[list]:
         """Returns a unique list of dates where the user has active tasks."""
+        self.flushPendingWrites()
         try:
             with self.getConnection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f"SELECT DISTINCT date_time FROM tasks WHERE user_id = ? AND deleted_at IS NULL", (user_id,))
+                cursor.execute(DatabaseManager.HOT_QUERIES["user_task_dates"], (user_id,))
                 rows = cursor.fetchall()
                 return [str(row[0]) for row in rows]
         except sqlite3.Error as e:
@@ -231,14 +842,20 @@ class DatabaseManager:
 
     def deleteTask(self, local_id: str) -> bool:
         """Performs a soft delete by setting deleted_at."""
+        now = self.timestamp()
+        if self.isWriteBehindEnabled():
+            self.queueTaskWrite(local_id, {"deleted_at": now, "updated_at": now, "needs_sync": 1})
+            return True
+
         try:
             with self.getConnection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
-                    UPDATE tasks SET deleted_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP, needs_sync = 1
+                    UPDATE tasks SET deleted_at = ?, updated_at = ?, needs_sync = 1
                     WHERE local_id = ?
-                """, (local_id,))
-                return True
+                """, (now, now, local_id))
+            self.notifyChange("tasks")
+            return True
         except sqlite3.Error as e:
             print(f"Error deleting task: {e}")
             return False
@@ -246,22 +863,970 @@ class DatabaseManager:
 
     def updateTask(self, local_id: str, **kwargs) -> bool:
         """Updates specific fields and flags the row for synchronization."""
+        return self.updateTaskFields(local_id, **kwargs) is not None
+
+
+    def updateTaskFields(self, local_id: str, **kwargs) -> Optional[Dict]:
+        """
+        Like updateTask, but returns the columns actually written: the allowed fields of
+        kwargs plus updated_at and needs_sync. Returns None if nothing was written.
+        """
         allowed_fields = {'title', 'description', 'priority'}
         update_fields = {k: v for k, v in kwargs.items() if k in allowed_fields}
         
+        if not update_fields:
+            return None
+
+        update_fields['updated_at'] = self.timestamp()
+        update_fields['needs_sync'] = 1
+
+        if self.isWriteBehindEnabled():
+            self.queueTaskWrite(local_id, update_fields)
+            return update_fields
+
+        try:
+            with self.getConnection() as conn:
+                cursor = conn.cursor()
+                set_clause = ", ".join([f"{k} = ?" for k in update_fields.keys()])
+                values = list(update_fields.values()) + [local_id]
+                cursor.execute(f"UPDATE tasks SET {set_clause} WHERE local_id = ?", values)
+            self.notifyChange("tasks")
+            return update_fields
+        except sqlite3.Error as e:
+            print(f"Error updating task: {e}")
+            return None
+
+    # ==================== HABITS ====================
+
+    def addHabit(self, user_id: int, title: str, question: str, unit: int, color: str,
+                 description: str = None, priority: int = 1, tag_id: str = None) -> Optional[str]:
+        """Saves a new habit and returns its UUID."""
+        local_id = str(uuid.uuid4())
+        try:
+            with self.getConnection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO habits (local_id, user_id, title, question, unit, color, description, priority, tag_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (local_id, user_id, title, question, unit, color, description, priority, tag_id))
+                cursor.execute("INSERT INTO habit_stats (habit_id, user_id) VALUES (?, ?)", (local_id, user_id))
+            self.notifyChange("habits")
+            return local_id
+        except sqlite3.Error as e:
+            print(f"Error adding habit: {e}")
+            return None
+
+
+    def getHabits(self, user_id: int, include_archived: bool = False) -> List[Dict]:
+        """Returns the user's habits, highest priority first, leaving out archived ones unless asked."""
+        try:
+            with self.getConnection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(DatabaseManager.HOT_QUERIES["user_habits"], (user_id, int(include_archived)))
+                return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error fetching habits: {e}")
+            return []
+
+
+    def updateHabit(self, local_id: str, **kwargs) -> bool:
+        """Updates specific fields and flags the habit for synchronization."""
+        allowed_fields = {'title', 'question', 'unit', 'color', 'description', 'priority', 'tag_id', 'archive'}
+        update_fields = {k: v for k, v in kwargs.items() if k in allowed_fields}
+
         if not update_fields:
             return False
 
         try:
             with self.getConnection() as conn:
                 cursor = conn.cursor()
-                update_fields['updated_at'] = datetime.now().isoformat()
+                update_fields['updated_at'] = self.timestamp()
                 update_fields['needs_sync'] = 1
-                
+
                 set_clause = ", ".join([f"{k} = ?" for k in update_fields.keys()])
                 values = list(update_fields.values()) + [local_id]
-                cursor.execute(f"UPDATE tasks SET {set_clause} WHERE local_id = ?", values)
+                cursor.execute(f"UPDATE habits SET {set_clause} WHERE local_id = ?", values)
+            self.notifyChange("habits")
+            return True
+        except sqlite3.Error as e:
+            print(f"Error updating habit: {e}")
+            return False
+
+
+    def archiveHabit(self, local_id: str, archived: bool = True) -> bool:
+        """Hides a habit from the grid without losing its history."""
+        return self.updateHabit(local_id, archive=int(archived))
+
+
+    def deleteHabit(self, local_id: str) -> bool:
+        """Performs a soft delete by setting deleted_at."""
+        now = self.timestamp()
+        try:
+            with self.getConnection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE habits SET deleted_at = ?, updated_at = ?, needs_sync = 1
+                    WHERE local_id = ?
+                """, (now, now, local_id))
+            self.notifyChange("habits")
+            return True
+        except sqlite3.Error as e:
+            print(f"Error deleting habit: {e}")
+            return False
+
+
+    def setHabitValues(self, user_id: int, values: Iterable[tuple]) -> bool:
+        """
+        Saves many daily habit values at once. values holds (habit_id, date, value) tuples;
+        existing days are overwritten through the (user_id, habit_id, date) unique key.
+        All rows are written in one transaction with a single executemany, together with
+        the incremental habit_stats update.
+        """
+        now = self.timestamp()
+        # The last value given for a day wins
+        values = {(habit_id, date): int(value) for habit_id, date, value in values}
+        try:
+            with self.transaction() as conn:
+                # (habit_id, date) -> (old value, new value) for habit_stats
+                changes = {}
+                for (habit_id, date), value in values.items():
+                    row = conn.execute("""
+                        SELECT value FROM daily_habits
+                        WHERE user_id = ? AND habit_id = ? AND date = ? AND deleted_at IS NULL
+                    """, (user_id, habit_id, date)).fetchone()
+                    old_value = row[0] if row else 0
+                    if old_value != value:
+                        changes[(habit_id, date)] = (old_value, value)
+
+                conn.executemany("""
+                    INSERT INTO daily_habits (user_id, habit_id, date, value, updated_at, needs_sync)
+                    VALUES (?, ?, ?, ?, ?, 1)
+                    ON CONFLICT (user_id, habit_id, date) DO UPDATE SET
+                        value = excluded.value,
+                        updated_at = excluded.updated_at,
+                        needs_sync = 1,
+                        deleted_at = NULL
+                """, ((user_id, habit_id, date, value, now) for (habit_id, date), value in values.items()))
+
+                if changes:
+                    self.updateHabitStats(conn, user_id, changes)
+            self.notifyChange("daily_habits")
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving habit values: {e}")
+            return False
+
+
+    def getHabitValues(self, user_id: int, start: str, end: str) -> Dict[str, Dict[str, int]]:
+        """
+        Reads every habit value of a user between start and end (inclusive ISO dates)
+        in one query. Returns {habit_id: {date: value}}; days without a value are absent.
+        """
+        try:
+            with self.getConnection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(DatabaseManager.HOT_QUERIES["habit_values_in_range"], (user_id, start, end))
+                grid = {}
+                for habit_id, date, value in cursor.fetchall():
+                    grid.setdefault(habit_id, {})[date] = value
+                return grid
+        except sqlite3.Error as e:
+            print(f"Error fetching habit values: {e}")
+            return {}
+
+    # ==================== HABIT STATS ====================
+
+    def getHabitStats(self, user_id: int) -> Dict[str, Dict]:
+        """
+        Returns {habit_id: stats} for the user's habits, where stats holds current_streak,
+        best_streak, total_value and completion_7/_30/_365 (share of those last days done).
+        Streaks and totals come from habit_stats; completion is one bounded range read.
+        """
+        today = datetime.now().date()
+        starts = [(today - timedelta(days=days - 1)).isoformat() for days in DatabaseManager.COMPLETION_WINDOWS]
+        yesterday = (today - timedelta(days=1)).isoformat()
+
+        try:
+            with self.getConnection() as conn:
+                stats = {}
+                for row in conn.execute("""
+                    SELECT s.* FROM habit_stats s JOIN habits h ON h.local_id = s.habit_id
+                    WHERE s.user_id = ? AND h.deleted_at IS NULL
+                """, (user_id,)):
+                    # A streak is still current if its last day is today or yesterday
+                    is_current = row["last_run_end"] is not None and row["last_run_end"] >= yesterday
+                    stats[row["habit_id"]] = {
+                        "current_streak": row["last_run_length"] if is_current else 0,
+                        "best_streak": row["best_streak"],
+                        "total_value": row["total_value"],
+                    }
+                    for days in DatabaseManager.COMPLETION_WINDOWS:
+                        stats[row["habit_id"]][f"completion_{days}"] = 0.0
+
+                completion = conn.execute(DatabaseManager.HOT_QUERIES["habit_completion"],
+                                          (starts[0], starts[1], user_id, starts[2], today.isoformat()))
+                for habit_id, *done_counts in completion:
+                    if habit_id in stats:
+                        for days, done in zip(DatabaseManager.COMPLETION_WINDOWS, done_counts):
+                            stats[habit_id][f"completion_{days}"] = done / days
+                return stats
+        except sqlite3.Error as e:
+            print(f"Error fetching habit stats: {e}")
+            return {}
+
+
+    def rebuildHabitStats(self, user_id: int = None) -> Optional[Dict]:
+        """
+        Recomputes habit_stats from daily_habits for one user (or everyone) and reports
+        which habits had drifted from the incremental updates.
+        Returns {"rebuilt": count, "mismatched": [habit_id, ...]}, or None on error.
+        """
+        try:
+            with self.transaction() as conn:
+                if user_id is None:
+                    habits = conn.execute("SELECT user_id, local_id FROM habits").fetchall()
+                else:
+                    habits = conn.execute("SELECT user_id, local_id FROM habits WHERE user_id = ?",
+                                          (user_id,)).fetchall()
+
+                mismatched = []
+                for habit_user_id, habit_id in habits:
+                    stored = conn.execute("""
+                        SELECT total_value, done_days, best_streak, last_run_end, last_run_length
+                        FROM habit_stats WHERE habit_id = ?
+                    """, (habit_id,)).fetchone()
+                    rebuilt = self.rebuildHabit(conn, habit_user_id, habit_id)
+                    if stored is None or tuple(stored) != rebuilt:
+                        mismatched.append(habit_id)
+                return {"rebuilt": len(habits), "mismatched": mismatched}
+        except sqlite3.Error as e:
+            print(f"Error rebuilding habit stats: {e}")
+            return None
+
+
+    def updateHabitStats(self, conn: sqlite3.Connection, user_id: int, changes: Dict[tuple, tuple]):
+        """
+        Applies a batch of daily value changes to habit_stats inside the caller's transaction.
+        changes maps (habit_id, date) -> (old value, new value); the new values must already
+        be written. Totals and done-day counts move by deltas and streaks are measured by
+        walking outward from the changed days, so the cost follows the length of the touched
+        streaks, not the habit's history. Only unchecking a day of the best streak rescans
+        that habit.
+        """
+        by_habit = {}
+        for (habit_id, date), values in changes.items():
+            by_habit.setdefault(habit_id, {})[date] = values
+
+        for habit_id, days in by_habit.items():
+            stats = conn.execute("SELECT * FROM habit_stats WHERE habit_id = ?", (habit_id,)).fetchone()
+            if stats is None:
+                self.rebuildHabit(conn, user_id, habit_id)
+                continue
+
+            total_value = stats["total_value"] + sum(new - old for old, new in days.values())
+            done_days = stats["done_days"]
+            best_streak = stats["best_streak"]
+            # How the changed days looked before this batch, for measuring the streaks it broke
+            old_state = {date: old > 0 for date, (old, new) in days.items()}
+            best_broken = False
+
+            for date, (old, new) in days.items():
+                if (old > 0) == (new > 0):
+                    continue
+                if new > 0:
+                    done_days += 1
+                    streak = (1 + self.streakLength(conn, user_id, habit_id, date, -1)
+                              + self.streakLength(conn, user_id, habit_id, date, 1))
+                    best_streak = max(best_streak, streak)
+                else:
+                    done_days -= 1
+                    broken = (1 + self.streakLength(conn, user_id, habit_id, date, -1, old_state)
+                              + self.streakLength(conn, user_id, habit_id, date, 1, old_state))
+                    best_broken = best_broken or broken >= best_streak
+
+            if best_broken:
+                dates = [row[0] for row in conn.execute("""
+                    SELECT date FROM daily_habits
+                    WHERE user_id = ? AND habit_id = ? AND value > 0 AND deleted_at IS NULL ORDER BY date
+                """, (user_id, habit_id))]
+                best_streak = self.longestStreak(dates)
+
+            last_run_end, last_run_length = self.lastStreak(conn, user_id, habit_id)
+            conn.execute("""
+                UPDATE habit_stats SET total_value = ?, done_days = ?, best_streak = ?,
+                    last_run_end = ?, last_run_length = ?
+                WHERE habit_id = ?
+            """, (total_value, done_days, best_streak, last_run_end, last_run_length, habit_id))
+
+
+    def rebuildHabit(self, conn: sqlite3.Connection, user_id: int, habit_id: str) -> tuple:
+        """
+        Recomputes one habit's stats with a full read of its rows and stores them.
+        Returns (total_value, done_days, best_streak, last_run_end, last_run_length).
+        """
+        rows = conn.execute("""
+            SELECT date, value FROM daily_habits
+            WHERE user_id = ? AND habit_id = ? AND deleted_at IS NULL ORDER BY date
+        """, (user_id, habit_id)).fetchall()
+        done_dates = [date for date, value in rows if value > 0]
+
+        last_run_end, last_run_length = None, 0
+        if done_dates:
+            last_run_end = done_dates[-1]
+            last_run_length = self.trailingStreak(done_dates)
+
+        stats = (sum(value for _, value in rows), len(done_dates), self.longestStreak(done_dates),
+                 last_run_end, last_run_length)
+        conn.execute("""
+            INSERT OR REPLACE INTO habit_stats
+                (habit_id, user_id, total_value, done_days, best_streak, last_run_end, last_run_length)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (habit_id, user_id) + stats)
+        return stats
+
+
+    def streakLength(self, conn: sqlite3.Connection, user_id: int, habit_id: str, date: str,
+                     step: int, overrides: Dict[str, bool] = None) -> int:
+        """
+        Counts the consecutive done days next to date (not including it), walking back
+        (step=-1) or forward (step=1). Days are read STREAK_WINDOW_DAYS at a time.
+        overrides maps ISO dates to a done flag that replaces the stored value.
+        """
+        overrides = overrides or {}
+        day = datetime.strptime(date, "%Y-%m-%d").date()
+        window = DatabaseManager.STREAK_WINDOW_DAYS
+        length = 0
+        while True:
+            bounds = sorted(((day + timedelta(days=step)).isoformat(), (day + timedelta(days=step * window)).isoformat()))
+            done = {row[0] for row in conn.execute("""
+                SELECT date FROM daily_habits
+                WHERE user_id = ? AND habit_id = ? AND date BETWEEN ? AND ? AND value > 0 AND deleted_at IS NULL
+            """, (user_id, habit_id, *bounds))}
+
+            for _ in range(window):
+                day += timedelta(days=step)
+                key = day.isoformat()
+                if not overrides.get(key, key in done):
+                    return length
+                length += 1
+
+
+    def lastStreak(self, conn: sqlite3.Connection, user_id: int, habit_id: str) -> tuple:
+        """Returns (last done date, length of the streak ending there), or (None, 0)."""
+        last_date = conn.execute("""
+            SELECT MAX(date) FROM daily_habits
+            WHERE user_id = ? AND habit_id = ? AND value > 0 AND deleted_at IS NULL
+        """, (user_id, habit_id)).fetchone()[0]
+        if last_date is None:
+            return None, 0
+        return last_date, 1 + self.streakLength(conn, user_id, habit_id, last_date, -1)
+
+
+    @staticmethod
+    def longestStreak(dates: List[str]) -> int:
+        """Longest run of consecutive days in a sorted list of ISO dates."""
+        best = streak = 0
+        previous = None
+        for date in dates:
+            day = datetime.strptime(date, "%Y-%m-%d").date()
+            streak = streak + 1 if previous is not None and (day - previous).days == 1 else 1
+            best = max(best, streak)
+            previous = day
+        return best
+
+
+    @staticmethod
+    def trailingStreak(dates: List[str]) -> int:
+        """Length of the run of consecutive days at the end of a sorted list of ISO dates."""
+        length = 1
+        for index in range(len(dates) - 1, 0, -1):
+            later = datetime.strptime(dates[index], "%Y-%m-%d").date()
+            earlier = datetime.strptime(dates[index - 1], "%Y-%m-%d").date()
+            if (later - earlier).days != 1:
+                break
+            length += 1
+        return length
+
+    # ==================== SEARCH ====================
+
+    def searchTasks(self, user_id: int, query: str, limit: int = SEARCH_PAGE_SIZE, offset: int = 0) -> List[Dict]:
+        """
+        Finds the user's active tasks whose title or description contain every word of query,
+        the last one as a prefix so results follow typing. Title matches rank higher.
+        Returns one page of rows, best match first.
+        """
+        match = self.buildMatchQuery(query)
+        if not match:
+            return []
+
+        self.flushPendingWrites()
+        try:
+            self.refreshSearchIndex()
+            with self.getConnection() as conn:
+                cursor = conn.cursor()
+                # CROSS JOIN keeps the full-text match as the outer loop; otherwise the planner may walk
+                # every task of the user through idx_tasks_user_day and probe the index once per row
+                cursor.execute("""
+                    SELECT tasks.* FROM tasks_fts CROSS JOIN tasks ON tasks.rowid = tasks_fts.rowid
+                    WHERE tasks_fts MATCH ? AND tasks.user_id = ? AND tasks.deleted_at IS NULL
+                    ORDER BY bm25(tasks_fts, 10.0, 1.0), tasks.date_time DESC
+                    LIMIT ? OFFSET ?
+                """, (match, user_id, limit, offset))
+                return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error searching tasks: {e}")
+            return []
+
+
+    def searchHabits(self, user_id: int, query: str, limit: int = SEARCH_PAGE_SIZE, offset: int = 0) -> List[Dict]:
+        """Like searchTasks, over habit titles, questions and descriptions."""
+        match = self.buildMatchQuery(query)
+        if not match:
+            return []
+
+        try:
+            self.refreshSearchIndex()
+            with self.getConnection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT habits.* FROM habits_fts CROSS JOIN habits ON habits.rowid = habits_fts.rowid
+                    WHERE habits_fts MATCH ? AND habits.user_id = ? AND habits.deleted_at IS NULL
+                    ORDER BY bm25(habits_fts, 10.0, 3.0, 1.0)
+                    LIMIT ? OFFSET ?
+                """, (match, user_id, limit, offset))
+                return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error searching habits: {e}")
+            return []
+
+
+    def buildMatchQuery(self, query: str) -> str:
+        """
+        Turns free text into an FTS5 query: every normalized word quoted (so operators and
+        punctuation are taken literally) and the last one matched as a prefix.
+        """
+        words = self.normalizeSearchText(query).split()
+        if not words:
+            return ""
+        terms = ['"' + word.replace('"', '""') + '"' for word in words]
+        terms[-1] += "*"
+        return " ".join(terms)
+
+
+    def refreshSearchIndex(self):
+        """
+        Re-indexes the rows queued in search_pending by the insert and update triggers.
+        Runs before every search, so it usually has a handful of rows to do, if any.
+        Rows deleted since they were queued are only dropped from the queue.
+        """
+        with self.getConnection() as conn:
+            if conn.execute("SELECT 1 FROM search_pending LIMIT 1").fetchone() is None:
+                return
+
+        with self.transaction(immediate=True) as conn:
+            for table, columns in DatabaseManager.SEARCH_INDEXES.items():
+                rowids = [row[0] for row in conn.execute(
+                    "SELECT source_rowid FROM search_pending WHERE source = ?", (table,))]
+                for start in range(0, len(rowids), DatabaseManager.BULK_CHUNK_SIZE):
+                    chunk = rowids[start:start + DatabaseManager.BULK_CHUNK_SIZE]
+                    conn.executemany(f"DELETE FROM {table}_fts WHERE rowid = ?", ((rowid,) for rowid in chunk))
+                    rows = conn.execute(f"""
+                        SELECT rowid, {", ".join(columns)} FROM {table}
+                        WHERE rowid IN ({", ".join("?" for _ in chunk)})
+                    """, chunk).fetchall()
+                    conn.executemany(f"""
+                        INSERT INTO {table}_fts (rowid, {", ".join(columns)})
+                        VALUES ({", ".join("?" for _ in range(len(columns) + 1))})
+                    """, ([row[0]] + [self.normalizeSearchText(value) for value in row[1:]] for row in rows))
+            conn.execute("DELETE FROM search_pending")
+
+
+    def rebuildSearchIndex(self, conn: sqlite3.Connection):
+        """
+        Refills every full-text index from its source table. Needed after a full VACUUM,
+        which may renumber the rowids the indexes and search_pending are keyed by.
+        """
+        for table, columns in DatabaseManager.SEARCH_INDEXES.items():
+            conn.execute(f"DELETE FROM {table}_fts")
+            conn.execute(f"""
+                INSERT INTO {table}_fts (rowid, {", ".join(columns)})
+                SELECT rowid, {", ".join(f"nazm_normalize({column})" for column in columns)} FROM {table}
+            """)
+        conn.execute("DELETE FROM search_pending")
+
+
+    @staticmethod
+    def normalizeSearchText(text: Optional[str]) -> Optional[str]:
+        """Applies SEARCH_NORMALIZATION to indexed text and to search queries alike."""
+        if text is None:
+            return None
+        return text.translate(DatabaseManager.SEARCH_NORMALIZATION)
+
+    # ==================== BULK ====================
+
+    def addTasksBulk(self, user_id: int, tasks: Iterable[Dict]) -> int:
+        """
+        Inserts many tasks in one transaction, streaming them through executemany in chunks
+        so memory stays constant for any input size. Each task dict may carry title,
+        description, priority, is_complete, date_time and local_id; a missing local_id gets
+        a fresh UUID, and rows whose local_id already exists are skipped.
+        Returns the number of inserted rows, or 0 if the import was rolled back.
+        """
+        tasks = iter(tasks)
+        try:
+            with self.transaction() as conn:
+                # Counted per statement: total_changes would also count the rows the full-text
+                # index triggers write
+                inserted = 0
+                while True:
+                    chunk = list(islice(tasks, DatabaseManager.BULK_CHUNK_SIZE))
+                    if not chunk:
+                        break
+
+                    local_ids = self.generateUuids(len(chunk))
+                    cursor = conn.executemany("""
+                        INSERT OR IGNORE INTO tasks
+                            (local_id, title, description, priority, is_complete, date_time, user_id)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, (
+                        (task.get("local_id") or local_id, task.get("title"), task.get("description"),
+                         task.get("priority", 1), task.get("is_complete", 0), task.get("date_time"), user_id)
+                        for task, local_id in zip(chunk, local_ids)
+                    ))
+                    inserted += cursor.rowcount
+            if inserted:
+                self.notifyChange("tasks")
+            return inserted
+        except sqlite3.Error as e:
+            print(f"Error importing tasks: {e}")
+            return 0
+
+
+    def iterTasks(self, user_id: int, start: str = None, end: str = None,
+                  include_deleted: bool = False) -> Iterator[Dict]:
+        """
+        Yields a user's tasks ordered by date, fetching BULK_CHUNK_SIZE rows at a time
+        instead of materializing the whole table. start/end optionally bound date_time.
+        """
+        self.flushPendingWrites()
+
+        conditions = ["user_id = ?"]
+        params = [user_id]
+        if not include_deleted:
+            conditions.append("deleted_at IS NULL")
+        if start is not None:
+            conditions.append("date_time >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("date_time <= ?")
+            params.append(end)
+
+        # Read-only, so the cursor is used directly rather than inside getConnection(): a
+        # suspended generator must not hold back the commits of other code on this thread.
+        cursor = self.acquireConnection().cursor()
+        try:
+            cursor.execute(f"SELECT * FROM tasks WHERE {' AND '.join(conditions)} ORDER BY date_time, rowid",
+                           params)
+            while True:
+                rows = cursor.fetchmany(DatabaseManager.BULK_CHUNK_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        except sqlite3.Error as e:
+            print(f"Error exporting tasks: {e}")
+        finally:
+            cursor.close()
+
+
+    @staticmethod
+    def generateUuids(count: int) -> List[str]:
+        """Generates count random (version 4) UUID strings from a single os.urandom call."""
+        random_bytes = os.urandom(16 * count)
+        return [str(uuid.UUID(bytes=random_bytes[i:i + 16], version=4)) for i in range(0, 16 * count, 16)]
+
+    @staticmethod
+    def timestamp() -> str:
+        """
+        Current UTC time in CURRENT_TIMESTAMP's format plus milliseconds, so locally written
+        and SQLite-defaulted updated_at values order correctly for last-writer-wins sync.
+        """
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+    # ==================== SYNC ====================
+
+    def addChangeListener(self, listener):
+        """
+        Registers listener(table) to be called after every local edit that needs syncing.
+        Listeners run on the thread that made the edit and must return quickly.
+        Changes applied by applyRemoteChanges() are not reported.
+        """
+        with self._connections_lock:
+            self._change_listeners.append(listener)
+
+
+    def removeChangeListener(self, listener):
+        with self._connections_lock:
+            if listener in self._change_listeners:
+                self._change_listeners.remove(listener)
+
+
+    def notifyChange(self, table: str):
+        with self._connections_lock:
+            listeners = list(self._change_listeners)
+        for listener in listeners:
+            listener(table)
+
+
+    def getDirtyRows(self, table: str, user_id: int, after_rowid: int = 0, limit: int = 200) -> List[Dict]:
+        """
+        Returns one page of a user's rows flagged needs_sync, in rowid order.
+        Each row carries its rowid as sync_rowid; pass the last one as after_rowid for the next page.
+        """
+        if table not in DatabaseManager.SYNC_TABLES:
+            raise ValueError(f"Unknown sync table: {table}")
+
+        self.flushPendingWrites()
+        try:
+            with self.getConnection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT rowid AS sync_rowid, * FROM {table}
+                    WHERE needs_sync = 1 AND user_id = ? AND rowid > ?
+                    ORDER BY rowid LIMIT ?
+                """, (user_id, after_rowid, limit))
+                return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error fetching unsynced {table}: {e}")
+            return []
+
+
+    def markSynced(self, table: str, acks: List[Dict]) -> int:
+        """
+        Clears needs_sync for acknowledged rows and records their server_id, in one transaction.
+        Each ack holds local_id, server_id and the updated_at that was pushed; a row edited
+        since then no longer matches and stays dirty for the next sync.
+        Returns the number of rows cleared.
+        """
+        if table not in DatabaseManager.SYNC_TABLES:
+            raise ValueError(f"Unknown sync table: {table}")
+
+        try:
+            with self.transaction() as conn:
+                cursor = conn.executemany(f"""
+                    UPDATE {table} SET needs_sync = 0, server_id = COALESCE(?, server_id)
+                    WHERE local_id = ? AND updated_at IS ?
+                """, ((ack.get("server_id"), ack.get("local_id"), ack.get("updated_at")) for ack in acks))
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"Error marking {table} as synced: {e}")
+            return 0
+
+
+    def applyRemoteChanges(self, table: str, user_id: int, rows: List[Dict]) -> Optional[int]:
+        """
+        Upserts rows received from the server with last-writer-wins on updated_at:
+        a local row is only overwritten if the server copy is strictly newer.
+        Applied rows are stored with needs_sync = 0. Returns the number of rows written,
+        or None if the batch was rolled back.
+        """
+        conflict_columns = DatabaseManager.SYNC_TABLES.get(table)
+        if conflict_columns is None:
+            raise ValueError(f"Unknown sync table: {table}")
+
+        try:
+            with self.transaction() as conn:
+                known_columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                # daily_habits rows are matched on (user_id, habit_id, date); their integer
+                # local_id is private to this database
+                known_columns.discard("needs_sync")
+                if "local_id" not in conflict_columns:
+                    known_columns.discard("local_id")
+
+                # Rows carrying the same columns share one parameterized statement
+                groups = {}
+                for row in rows:
+                    fields = {k: v for k, v in row.items() if k in known_columns}
+                    fields["user_id"] = user_id
+                    columns = tuple(sorted(fields))
+                    groups.setdefault(columns, []).append([fields[column] for column in columns])
+
+                # Counted per statement, as in addTasksBulk()
+                written = 0
+                for columns, values in groups.items():
+                    updates = ", ".join(f"{column} = excluded.{column}" for column in columns
+                                        if column not in conflict_columns)
+                    cursor = conn.executemany(f"""
+                        INSERT INTO {table} ({", ".join(columns)}, needs_sync)
+                        VALUES ({", ".join("?" for _ in columns)}, 0)
+                        ON CONFLICT ({", ".join(conflict_columns)}) DO UPDATE SET {updates}, needs_sync = 0
+                        WHERE {table}.updated_at IS NULL
+                           OR julianday(excluded.updated_at) > julianday({table}.updated_at)
+                    """, values)
+                    written += cursor.rowcount
+
+                # Server rows bypass addHabit and setHabitValues, so their habits' stats are
+                # created or recomputed here
+                if table == "habits" and written:
+                    for habit_id in {row.get("local_id") for row in rows}:
+                        self.rebuildHabit(conn, user_id, habit_id)
+                elif table == "daily_habits" and written:
+                    for habit_id in {row.get("habit_id") for row in rows}:
+                        self.rebuildHabit(conn, user_id, habit_id)
+                return written
+        except sqlite3.Error as e:
+            print(f"Error applying server changes to {table}: {e}")
+            return None
+
+
+    def getSyncCursor(self, user_id: int) -> Optional[str]:
+        """Returns the server cursor of the user's last completed pull, or None before the first one."""
+        try:
+            with self.getConnection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT cursor FROM sync_state WHERE user_id = ?", (user_id,))
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except sqlite3.Error as e:
+            print(f"Error fetching sync cursor: {e}")
+            return None
+
+
+    def setSyncCursor(self, user_id: int, sync_cursor: str) -> bool:
+        try:
+            with self.getConnection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO sync_state (user_id, cursor, synced_at) VALUES (?, ?, ?)
+                    ON CONFLICT (user_id) DO UPDATE SET cursor = excluded.cursor, synced_at = excluded.synced_at
+                """, (user_id, sync_cursor, self.timestamp()))
                 return True
         except sqlite3.Error as e:
-            print(f"Error updating task: {e}")
+            print(f"Error saving sync cursor: {e}")
             return False
+
+    # ==================== MAINTENANCE ====================
+
+    def compactTombstones(self, retention_days: int = TOMBSTONE_RETENTION_DAYS,
+                          batch_size: int = COMPACTION_BATCH_SIZE, vacuum: bool = False,
+                          full_vacuum: bool = False) -> Optional[Dict]:
+        """
+        Hard-deletes soft-deleted rows that the server already has (needs_sync = 0) and
+        that were deleted more than retention_days ago. Each batch of batch_size rows is
+        its own short transaction, so UI writes can interleave between batches.
+
+        With vacuum=True the freed pages are returned to the file system afterwards with
+        incremental_vacuum; databases not in auto_vacuum=INCREMENTAL mode keep them on the
+        freelist for reuse. full_vacuum=True converts such a database with a one-time full
+        VACUUM, which rewrites the whole file and should not run on a thread the UI waits on.
+
+        Returns {"rows": {table: deleted}, "pages_reclaimed": n, "free_pages": n}, or None on error.
+        """
+        self.flushPendingWrites()
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=retention_days)).strftime("%Y-%m-%d %H:%M:%S")
+        report = {"rows": {}, "pages_reclaimed": 0, "free_pages": 0}
+
+        try:
+            with self.getConnection() as conn:
+                pages_before, _ = self.pageCounts(conn)
+
+            # Children first, so cascades never have to run inside a parent's batch
+            for table in reversed(DatabaseManager.SYNC_TABLES):
+                deleted = 0
+                while True:
+                    with self.transaction(immediate=True) as conn:
+                        cursor = conn.execute(f"""
+                            DELETE FROM {table} WHERE rowid IN (
+                                SELECT rowid FROM {table} INDEXED BY idx_{table}_tombstones
+                                WHERE deleted_at IS NOT NULL AND needs_sync = 0 AND deleted_at < ?
+                                LIMIT ?
+                            )
+                        """, (cutoff, batch_size))
+                        batch_deleted = cursor.rowcount
+                    deleted += batch_deleted
+                    if batch_deleted < batch_size:
+                        break
+                report["rows"][table] = deleted
+
+            if vacuum or full_vacuum:
+                self.vacuum(full=full_vacuum)
+
+            with self.getConnection() as conn:
+                pages_after, free_pages = self.pageCounts(conn)
+            # Switching to auto_vacuum=INCREMENTAL adds pointer-map pages, so the first
+            # full VACUUM can leave the file a page or two larger than it was
+            report["pages_reclaimed"] = max(0, pages_before - pages_after)
+            report["free_pages"] = free_pages
+            return report
+        except sqlite3.Error as e:
+            print(f"Error compacting deleted rows: {e}")
+            return None
+
+
+    @staticmethod
+    def pageCounts(conn: sqlite3.Connection) -> tuple:
+        """Returns (page_count, freelist_count) of the database file."""
+        return (conn.execute("PRAGMA page_count").fetchone()[0],
+                conn.execute("PRAGMA freelist_count").fetchone()[0])
+
+
+    def vacuum(self, max_pages: int = 0, full: bool = False) -> bool:
+        """
+        Releases free pages to the file system with incremental_vacuum (max_pages at a time,
+        0 for all) when auto_vacuum is INCREMENTAL. Otherwise nothing is released unless full
+        is set, which rebuilds the file with VACUUM and switches it to incremental mode.
+        Returns True if pages could be released.
+        """
+        with self.getConnection() as conn:
+            incremental = conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+            if incremental:
+                # execute() steps the pragma only once, freeing a single page; a script runs it to completion
+                conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)});")
+                return True
+            if not full:
+                return False
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            self.rebuildSearchIndex(conn)
+            return True
+
+    # ==================== WRITE-BEHIND ====================
+
+    def enableWriteBehind(self, flush_interval: float = 0.5):
+        """
+        Buffers toggleTask/updateTask/deleteTask in memory instead of committing each one.
+        Writes to the same task are coalesced (last write wins per column) and the buffer is
+        flushed by a background thread flush_interval seconds after the first buffered write,
+        before any task read, and on close().
+
+        Crash safety: buffered writes exist only in memory until flushed, so a crash or power
+        loss can drop at most the last flush_interval seconds of task edits. Each flush is a
+        single transaction, so a flush is either applied completely or not at all. Flushes
+        commit in the order the writes were buffered. A flush that fails keeps its writes
+        buffered for the next attempt, except writes that violate a constraint or keep failing
+        MAX_FLUSH_ATTEMPTS times, which are moved to failed_writes instead.
+        """
+        if self._flusher is not None:
+            return
+
+        self.flush_interval = flush_interval
+        self._flush_stop.clear()
+        self._flusher = threading.Thread(target=self.runFlusher, name="DatabaseFlusher", daemon=True)
+        self._flusher.start()
+
+
+    def disableWriteBehind(self):
+        """Stops the flush thread and writes out everything still buffered."""
+        if self._flusher is not None:
+            self._flush_stop.set()
+            self._flush_wakeup.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flushPendingWrites()
+
+
+    def isWriteBehindEnabled(self) -> bool:
+        return self._flusher is not None
+
+
+    def hasPendingWrites(self) -> bool:
+        with self._pending_lock:
+            return bool(self._pending_writes)
+
+
+    def queueTaskWrite(self, local_id: str, fields: dict):
+        """Merges column updates for one task into the write-behind buffer."""
+        with self._pending_lock:
+            self._pending_writes.setdefault(local_id, {}).update(fields)
+        self._flush_wakeup.set()
+        self.notifyChange("tasks")
+
+
+    def runFlusher(self):
+        """Body of the flush thread: waits for a buffered write, lets more coalesce, then flushes."""
+        while not self._flush_stop.is_set():
+            self._flush_wakeup.wait()
+            # Writes arriving during this wait join the same flush
+            self._flush_stop.wait(self.flush_interval)
+            self._flush_wakeup.clear()
+            self.flushPendingWrites()
+        self.releaseConnection()
+
+
+    def flushPendingWrites(self) -> int:
+        """
+        Writes every buffered task mutation in one transaction, one executemany per
+        distinct set of columns. Returns the number of tasks written. Blocks while
+        another thread's flush is committing.
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                if not self._pending_writes:
+                    return 0
+                pending, self._pending_writes = self._pending_writes, {}
+
+            try:
+                self.writeTaskFields(pending)
+            except sqlite3.IntegrityError as e:
+                # Retrying the batch would fail the same way; write tasks one by one to isolate the bad ones
+                print(f"Error flushing buffered task writes: {e}")
+                return self.flushWritesIndividually(pending)
+            except sqlite3.Error as e:
+                print(f"Error flushing buffered task writes: {e}")
+                self.requeueWrites(pending, e)
+                return 0
+
+            for local_id in pending:
+                self._flush_attempts.pop(local_id, None)
+            return len(pending)
+
+
+    def writeTaskFields(self, pending: dict):
+        """Applies {local_id: {column: value}} in one transaction."""
+        # Tasks touching the same columns share one parameterized statement
+        groups = {}
+        for local_id, fields in pending.items():
+            columns = tuple(sorted(fields))
+            groups.setdefault(columns, []).append([fields[column] for column in columns] + [local_id])
+
+        with self.transaction() as conn:
+            for columns, rows in groups.items():
+                set_clause = ", ".join(f"{column} = ?" for column in columns)
+                conn.executemany(f"UPDATE tasks SET {set_clause} WHERE local_id = ?", rows)
+
+
+    def flushWritesIndividually(self, pending: dict) -> int:
+        """Writes each task in its own transaction, quarantining those that violate a constraint."""
+        written = 0
+        for local_id, fields in pending.items():
+            try:
+                self.writeTaskFields({local_id: fields})
+                self._flush_attempts.pop(local_id, None)
+                written += 1
+            except sqlite3.IntegrityError as e:
+                self.quarantineWrite(local_id, fields, e)
+            except sqlite3.Error as e:
+                self.requeueWrites({local_id: fields}, e)
+        return written
+
+
+    def requeueWrites(self, pending: dict, error: Exception):
+        """Puts failed writes back without overriding anything buffered since, up to MAX_FLUSH_ATTEMPTS times."""
+        with self._pending_lock:
+            for local_id, fields in pending.items():
+                attempts = self._flush_attempts.get(local_id, 0) + 1
+                if attempts >= DatabaseManager.MAX_FLUSH_ATTEMPTS:
+                    self._flush_attempts.pop(local_id, None)
+                    self.failed_writes.append({"local_id": local_id, "fields": fields, "error": str(error)})
+                    print(f"Dropping buffered write for task {local_id} after {attempts} failed flushes: {error}")
+                    continue
+                self._flush_attempts[local_id] = attempts
+                self._pending_writes[local_id] = {**fields, **self._pending_writes.get(local_id, {})}
+
+
+    def quarantineWrite(self, local_id: str, fields: dict, error: Exception):
+        """Keeps a write that can never succeed out of the buffer so it cannot block later flushes."""
+        self._flush_attempts.pop(local_id, None)
+        with self._pending_lock:
+            self.failed_writes.append({"local_id": local_id, "fields": fields, "error": str(error)})
+        print(f"Dropping buffered write for task {local_id}: {error}")
@@ -0,0 +1,104 @@
+from PySide6.QtCore import (
+    QObject,
+    QThread,
+    Signal,
+    Slot,
+)
+
+
+class DatabaseRequest(QObject):
+    """
+    Handle for one queued database call.
+    Exactly one of its signals is emitted, always on the GUI thread.
+    """
+    finished = Signal(object)   # return value of the call
+    failed = Signal(str)        # message of an unexpected exception
+
+    def __init__(self, op, args: tuple, kwargs: dict):
+        super().__init__()
+        self.op = op
+        self.args = args
+        self.kwargs = kwargs
+
+
+class DatabaseExecutor(QObject):
+    """Runs requests on the worker thread; lives there after moveToThread()."""
+    completed = Signal(object, object, object)   # request, result, error message
+
+    @Slot(object)
+    def execute(self, request):
+        # None is the shutdown sentinel; everything queued before it has already run
+        if request is None:
+            QThread.currentThread().quit()
+            return
+
+        try:
+            result = request.op(*request.args, **request.kwargs)
+        except Exception as e:
+            print(f"Error in database worker: {e}")
+            self.completed.emit(request, None, str(e))
+            return
+        self.completed.emit(request, result, None)
+
+
+class DatabaseWorker(QObject):
+    """
+    Runs database calls on a dedicated QThread so SQL never blocks the GUI thread.
+    Calls execute one at a time in submission order, which keeps writes serialized.
+
+    Usage:
+        request = worker.submit(database.toggleTask, task_id, True)
+        request.finished.connect(onToggled)
+    """
+    request_posted = Signal(object)
+
+    _shared_instance = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Keeps requests alive until their result has been delivered
+        self.pending_requests = set()
+
+        self.worker_thread = QThread(self)
+        self.worker_thread.setObjectName("DatabaseWorker")
+        self.executor = DatabaseExecutor()
+        self.executor.moveToThread(self.worker_thread)
+
+        # Both connections cross threads, so Qt queues them and preserves their order
+        self.request_posted.connect(self.executor.execute)
+        self.executor.completed.connect(self.onCompleted)
+        self.worker_thread.finished.connect(self.executor.deleteLater)
+        self.worker_thread.start()
+
+
+    @classmethod
+    def shared(cls) -> "DatabaseWorker":
+        """Returns the process-wide worker, creating it on first use."""
+        if cls._shared_instance is None:
+            cls._shared_instance = cls()
+        return cls._shared_instance
+
+
+    def submit(self, op, *args, **kwargs) -> DatabaseRequest:
+        """Queues op(*args, **kwargs) on the worker thread and returns its request handle."""
+        request = DatabaseRequest(op, args, kwargs)
+        self.pending_requests.add(request)
+        self.request_posted.emit(request)
+        return request
+
+
+    def onCompleted(self, request: DatabaseRequest, result, error):
+        """Delivers a finished request's outcome on the GUI thread."""
+        self.pending_requests.discard(request)
+        if error is None:
+            request.finished.emit(result)
+        else:
+            request.failed.emit(error)
+
+
+    def stop(self):
+        """Runs every request already queued, then stops the thread. Blocks until it has exited."""
+        if not self.worker_thread.isRunning():
+            return
+        self.request_posted.emit(None)
+        self.worker_thread.wait()
@@ -1,12 +1,81 @@
-from email_validator import validate_email, EmailNotValidError
-from zxcvbn import zxcvbn
 import re
 
+from password_strength import PasswordStrength
+
 from PySide6.QtWidgets import QWidget
 
 
+class ValidationResult:
+    """
+    Outcome of validating a form in one pass: the error messages, the widgets they
+    belong to, and the cleaned value of every field (None for invalid ones).
+    """
+    def __init__(self):
+        self.errors = []
+        self.invalid_widgets = []
+        self.data = {}
+
+
+    def isValid(self) -> bool:
+        return not self.errors
+
+
+    def addError(self, widget: QWidget, message: str):
+        self.errors.append(message)
+        self.invalid_widgets.append(widget)
+
+
+class FieldRule:
+    """
+    The checks for one form field, compiled from an entry of FormProcessor.FIELD_SCHEMA.
+    Checks run in order (choices, length, pattern, then the named FormProcessor check)
+    and stop at the first failure.
+    """
+    def __init__(self, name: str, length: tuple = None, pattern: str = None, format_error: str = None,
+                 collapse_spaces: bool = False, check: str = None, choices: tuple = None):
+        self.label = name.replace("_", " ")
+        self.length = length
+        self.pattern = re.compile(pattern) if pattern else None
+        self.format_error = (format_error or "{label} format is invalid").format(label=self.label)
+        self.collapse_spaces = collapse_spaces
+        self.check = check
+        self.choices = choices
+
+
 class FormProcessor:
     """Handles data extraction and validation logic for all forms within the application."""
+    # English and Arabic/Persian scripts
+    NAME_PATTERN = r"^[a-zA-Z\u0600-\u06FF\s]+$"
+    NICKNAME_PATTERN = r"^[a-zA-Z\u0600-\u06FF0-9_]+$"
+    TASK_TEXT_PATTERN = r"^[a-zA-Z\d\u0600-\u06FF\s]+$"
+    PRIORITIES = ("Low", "Medium", "High")
+    MIN_PASSWORD_SCORE = 3
+
+    # Field name -> FieldRule arguments; fields not listed are passed through stripped
+    FIELD_SCHEMA = {
+        "first_name": {"length": (3, 50), "pattern": NAME_PATTERN, "collapse_spaces": True,
+                       "format_error": "{label} format is invalid. Please use only English or Persian letters"},
+        "last_name": {"length": (3, 50), "pattern": NAME_PATTERN, "collapse_spaces": True,
+                      "format_error": "{label} format is invalid. Please use only English or Persian letters"},
+        "nickname": {"length": (3, 255), "pattern": NICKNAME_PATTERN,
+                     "format_error": "{label} format is invalid, Please use only English or Persian letters"},
+        "email": {"check": "normalizeEmail", "format_error": "{label} format is invalid"},
+        "password": {"length": (8, 50), "check": "checkPasswordStrength"},
+        "title": {"length": (3, 50), "pattern": TASK_TEXT_PATTERN, "collapse_spaces": True},
+        "description": {"length": (3, 50), "pattern": TASK_TEXT_PATTERN, "collapse_spaces": True},
+        # Stored as the index into PRIORITIES
+        "priority": {"choices": PRIORITIES},
+    }
+
+    _compiled_schema = None
+
+    @classmethod
+    def compiledSchema(cls) -> dict:
+        """FieldRules of FIELD_SCHEMA, compiled on first use and shared by every form."""
+        if cls._compiled_schema is None:
+            cls._compiled_schema = {name: FieldRule(name, **rules) for name, rules in cls.FIELD_SCHEMA.items()}
+        return cls._compiled_schema
+
 
     def findEmptyAndFilledFields(self, fields: list):
         """Categorizes widgets into empty and filled lists for UI feedback."""
@@ -27,174 +96,66 @@ class FormProcessor:
         return field.text().strip() if hasattr(field, "text") else str(field).strip()
 
 
-    def validateName(self, name_field: QWidget):
-        """Validates first/last names allowing Latin and Persian characters."""
-        name = self.getFieldText(name_field)
-        # Normalize whitespace
-        clean_name = " ".join(name.split())
-
-        # Regex for English and Arabic/Persian scripts
-        pattern = r"^[a-zA-Z\u0600-\u06FF\s]+$"
-        if not re.match(pattern, clean_name):
-            return False
-
-        return clean_name
-
-
-    def validateNickname(self, nickname_field: QWidget):
-        """Validates nicknames allowing alphanumeric characters, Persian, and underscores."""
-        nickname = self.getFieldText(nickname_field)
-
-        pattern = r"^[a-zA-Z\u0600-\u06FF0-9_]+$"
-        if not re.match(pattern, nickname):
-            return False
-
-        return nickname
-
-
-    def validatePassword(self, password_field: QWidget):
-        """Assesses password strength using the zxcvbn library."""
-        password = self.getFieldText(password_field)
-        results = zxcvbn(password)
-
-        if results.get("score") < 3:
-            reason = results.get('feedback').get("warning") or "Password is too guessable."
-            return False, reason
-
-        return True, "Strong password."
-
-
-    def validateEmailField(self, email_field):
-        """Validates email syntax and returns the normalized email string."""
-        email_text = self.getFieldText(email_field)
-        try:
-            emailinfo = validate_email(email_text, check_deliverability=False)
-            return emailinfo.normalized
-        except EmailNotValidError:
-            return False
-
-
-    def checkLength(self, field, min_len: int = 0, max_len: int = 255):
-        """Checks if the field text length is within the specified bounds."""
-        field_length = len(self.getFieldText(field))
-        return min_len <= field_length <= max_len
-
-
-    def getValidationErrors(self, field_map: dict, is_signup: bool = False):
+    def validate(self, field_map: dict, check_strength: bool = False) -> ValidationResult:
         """
-        Performs validation for authentication forms (Login/Signup).
-        Returns a tuple of (is_valid, error_dictionary).
+        Validates every field of field_map ({name: widget}) against FIELD_SCHEMA in one pass
+        and collects the cleaned values, so no check has to run again to extract them.
+        check_strength adds the zxcvbn password check used on signup.
         """
-        errors = []
-        invalid_widgets = []
+        result = ValidationResult()
+        schema = self.compiledSchema()
 
         for name, widget in field_map.items():
-            # Validation for First and Last Names
-            if name in ["first_name", "last_name"]:
-                if not self.checkLength(widget, min_len=3, max_len=50):
-                    errors.append(f"{name.replace('_', ' ')} must be at least 3 characters")
-                    invalid_widgets.append(widget)
-                elif not self.validateName(widget):
-                    errors.append(f"{name.replace('_', ' ')} format is invalid. Please use only English or Persian letters")
-                    invalid_widgets.append(widget)
-
-            # Validation for Nicknames
-            if name == "nickname":
-                if not self.checkLength(widget, min_len=3, max_len=255):
-                    errors.append("nickname must be at least 3 characters")
-                    invalid_widgets.append(field_map.get("nickname"))
-                elif not self.validateNickname(widget):
-                    errors.append("nickname format is invalid, Please use only English or Persian letters")
-                    invalid_widgets.append(widget)
-
-            # Validation for Passwords
-            elif name == "email":
-                if self.validateEmailField(widget) is False:
-                    errors.append("email format is invalid")
-                    invalid_widgets.append(widget)
-
-            # Validation for Passwords
-            elif name == "password":
-                if not self.checkLength(widget, min_len=8, max_len=50):
-                    errors.append("password must be at least 8 characters")
-                    invalid_widgets.append(widget)
-                elif is_signup:
-                    valid, reason = self.validatePassword(widget)
-                    if not valid:
-                        errors.append(reason)
-                        invalid_widgets.append(widget)
-
-        if errors:
-            return False, {"errors": errors, "invalid_widgets": invalid_widgets}
-        return True, None
-
-
-    def getValidatedData(self, field_map: dict):
-        """Retrieves and cleans data from fields after successful validation."""
-        validated = {}
-        for name, widget in field_map.items():
-            if name == "email":
-                validated[name] = self.validateEmailField(widget)
-            elif name in ["first_name", "last_name"]:
-                validated[name] = self.validateName(widget)
-            elif name == "nickname":
-                validated[name] = self.validateNickname(widget)
-            elif name == "password":
-                validated[name] = self.getFieldText(widget)
-            else:
-                validated[name] = self.getFieldText(widget)
-        return validated
+            rule = schema.get(name)
+            if rule is None:
+                result.data[name] = self.getFieldText(widget)
+                continue
 
+            value, error = self.applyRule(rule, widget, check_strength)
+            result.data[name] = value
+            if error:
+                result.addError(widget, error)
 
-    def validateTaskFields(self, task_name_field: QWidget):
-        """Validates task titles and descriptions allowing alphanumeric and Persian characters."""
-        task_name = self.getFieldText(task_name_field)
-        clean_task_name = " ".join(task_name.split())
+        return result
 
-        pattern = r"^[a-zA-Z\d\u0600-\u06FF\s]+$"
-        if not re.match(pattern, clean_task_name):
-            return False
 
-        return clean_task_name
+    def applyRule(self, rule: FieldRule, widget: QWidget, check_strength: bool):
+        """Returns (cleaned value, error message or None) for one field."""
+        if rule.choices is not None:
+            choice = widget.currentText()
+            if choice not in rule.choices:
+                return None, rule.format_error
+            return rule.choices.index(choice), None
 
+        text = self.getFieldText(widget)
+        if rule.length is not None:
+            min_len, max_len = rule.length
+            if not min_len <= len(text) <= max_len:
+                return None, f"{rule.label} must be at least {min_len} characters"
 
-    def validatePriority(self, priority_field: QWidget):
-        """Maps priority string to its corresponding integer index."""
-        priority = priority_field.currentText()
-        valid_priorities = ["Low", "Medium", "High"]
-        if priority not in valid_priorities:
-            return False
+        value = " ".join(text.split()) if rule.collapse_spaces else text
+        if rule.pattern is not None and not rule.pattern.match(value):
+            return None, rule.format_error
 
-        return valid_priorities.index(priority)
+        if rule.check is not None:
+            return getattr(self, rule.check)(rule, value, check_strength)
+        return value, None
 
 
-    def getValidatedTaskData(self, field_map: dict):
-        """Retrieves and cleans data from fields after successful validation."""
-        validated = {}
-        for name, widget in field_map.items():
-            if name in ["title", "description"]:
-                validated[name] = self.validateTaskFields(widget)
-            elif name == "priority":
-                validated[name] = self.validatePriority(widget)
-            else:
-                validated[name] = self.getFieldText(widget)
-        return validated
+    def normalizeEmail(self, rule: FieldRule, email: str, check_strength: bool):
+        """Validates email syntax and returns the normalized address."""
+        from email_validator import validate_email, EmailNotValidError
 
+        try:
+            return validate_email(email, check_deliverability=False).normalized, None
+        except EmailNotValidError:
+            return None, rule.format_error
 
-    def getTaskModalsValidationErrors(self, field_map: dict):
-        """Validates inputs for task-related modal windows."""
-        errors = []
-        invalid_widgets = []
 
-        for name, widget in field_map.items():
-            if name in ["title", "description"]:
-                if not self.checkLength(widget, min_len=3, max_len=50):
-                    errors.append(f"{name} must be at least 3 characters")
-                    invalid_widgets.append(widget)
-                elif not self.validateTaskFields(widget):
-                    errors.append(f"{name} format is invalid")
-                    invalid_widgets.append(widget)
-
-        if errors:
-            return False, {"errors": errors, "invalid_widgets": invalid_widgets}
-        return True, None
+    def checkPasswordStrength(self, rule: FieldRule, password: str, check_strength: bool):
+        """Rejects guessable passwords on signup, reusing the score the strength meter already computed."""
+        if check_strength:
+            results = PasswordStrength.shared().evaluate(password)
+            if results.get("score") < FormProcessor.MIN_PASSWORD_SCORE:
+                return password, results.get("warning") or "Password is too guessable."
+        return password, None
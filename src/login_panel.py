@@ -122,14 +122,14 @@ class LoginPanel(QFrame, FieldStyleManager):
 
     def handleFormatValidation(self, field_map: dict):
         """Checks formatting and displays notifications for invalid input."""
-        is_valid, result = self.form_processor.getValidationErrors(field_map)
+        result = self.form_processor.validate(field_map)
         
-        if not is_valid:
+        if not result.isValid():
             form_fields = list(field_map.values())
-            self.updateInvalidFieldStyle(result.get("invalid_widgets"), form_fields)
+            self.updateInvalidFieldStyle(result.invalid_widgets, form_fields)
             
             # Show a toast notification with the specific error reasons
-            errors = "\n".join(result.get("errors"))
+            errors = "\n".join(result.errors)
             duration = max(4000, len(errors) * 50)
             
             self.notification_handler.showToast(
@@ -138,8 +138,7 @@ class LoginPanel(QFrame, FieldStyleManager):
             )
             return False, None
             
-        data = self.form_processor.getValidatedData(field_map)
-        return True, data
+        return True, result.data
 
 
     def handleEmptyValidation(self, field_map: dict):
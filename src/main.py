@@ -1,14 +1,13 @@
+from startup_timeline import StartupTimeline
+timeline = StartupTimeline()
+
+import os
 import sys
 from utils import loadFont
 from widgets import NoTabApplication
-from login_panel import LoginPanel
-from nazm_ara_panel import NazmAra
-from signup_panel import SignupPanel
 from database_manager import DatabaseManager
-from select_acc_panel import SelectAccountPanel
-from offline_user_panel import OfflineUserPanel
+from database_worker import DatabaseWorker
 from style_sheet_handler import StyleSheetHandler
-from forgot_password_panel import ForgotPasswordPanel
 from notification_handler import NotificationHandler
 
 from PySide6.QtWidgets import (
@@ -17,10 +16,21 @@ from PySide6.QtWidgets import (
     QMainWindow,
     QHBoxLayout,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 import resources_rc
+timeline.mark("imports")
 
 class MainWindow(QMainWindow):
+    CHECKPOINT_INTERVAL_MS = 5 * 60 * 1000
+    # Old synced tombstones are purged once per launch, after startup has settled. Only an
+    # incremental vacuum runs here: a full VACUUM would hold up every read queued on the worker
+    COMPACTION_DELAY_MS = 60 * 1000
+    # Setting this (to anything but "0") opts in to write-behind: task edits are coalesced and
+    # committed at most WRITE_BEHIND_INTERVAL seconds after they happen. A buffered write that
+    # fails later only lands in DatabaseManager.failed_writes, so the UI never rolls it back.
+    WRITE_BEHIND_VARIABLE = "NAZM_ARA_WRITE_BEHIND"
+    WRITE_BEHIND_INTERVAL = 0.5
+
     def __init__(self):
         super().__init__()
         self.setObjectName("MainWindow")
@@ -28,10 +38,22 @@ class MainWindow(QMainWindow):
         self.latin_font_family = loadFont(":fonts/Nunito.ttf")
         self.persian_font_family = loadFont(":fonts/Vazirmatn.ttf")
 
-        self.database = DatabaseManager()
+        self.database = DatabaseManager.shared()
+        timeline.mark("database_open")
+        if os.environ.get(MainWindow.WRITE_BEHIND_VARIABLE, "0") not in ("", "0"):
+            self.database.enableWriteBehind(MainWindow.WRITE_BEHIND_INTERVAL)
+        self.database_worker = DatabaseWorker.shared()
         self.style_sheet_handler = StyleSheetHandler(self)
         self.notification_handler = NotificationHandler(self)
 
+        # Periodically fold the WAL back into the database file; a PASSIVE checkpoint never waits on locks
+        self.checkpoint_timer = QTimer(self)
+        self.checkpoint_timer.setInterval(MainWindow.CHECKPOINT_INTERVAL_MS)
+        self.checkpoint_timer.timeout.connect(lambda: self.database_worker.submit(self.database.checkpoint))
+        self.checkpoint_timer.start()
+        QTimer.singleShot(MainWindow.COMPACTION_DELAY_MS,
+                          lambda: self.database_worker.submit(self.database.compactTombstones, vacuum=True))
+
         self.setMinimumSize(1024, 768)
         self.resize(1280, 720)
 
@@ -43,13 +65,16 @@ class MainWindow(QMainWindow):
         self.layout.addWidget(self.stack)
 
         # If users exist in DB, show account selector; otherwise, go to Login
-        if self.database.getListOfUsers():
+        if self.database.hasUsers():
             self.showSelectAccountPage()
         else:
             self.showLoginPage()
+        timeline.mark("window_built")
 
 
     def showLoginPage(self):
+        from login_panel import LoginPanel
+
         self.style_sheet_handler.setResourceQssPath(":/styles/login_panel.qss")
         self.login_panel = self.loadPage(LoginPanel)
         self.login_panel.forgot_password_clicked.connect(self.showForgotPasswordPage)
@@ -63,8 +88,10 @@ class MainWindow(QMainWindow):
 
     def showSelectAccountPage(self):
         """Displays page to pick an existing local account."""
+        from select_acc_panel import SelectAccountPanel
+
         self.style_sheet_handler.setResourceQssPath(":/styles/select_acc_panel.qss")
-        self.select_account_panel = self.loadPage(SelectAccountPanel)
+        self.select_account_panel = self.loadPage(SelectAccountPanel, self.database, self.database_worker)
         self.select_account_panel.add_account_clicked.connect(self.showLoginPage)
         self.select_account_panel.account_selected.connect(self.openMainApp)
         self.shrinkPage()
@@ -73,6 +100,8 @@ class MainWindow(QMainWindow):
 
     def showOfflineAccountPage(self):
         """Displays page for creating a local-only user."""
+        from offline_user_panel import OfflineUserPanel
+
         self.style_sheet_handler.setResourceQssPath(":/styles/offline_acc_panel.qss")
         self.offline_account_panel = self.loadPage(OfflineUserPanel)
         self.offline_account_panel.back_to_login_clicked.connect(self.showLoginPage)
@@ -81,14 +110,18 @@ class MainWindow(QMainWindow):
 
     def openMainApp(self, account_details: dict):
         """Transitions from Auth/Selection pages to the actual application dashboard."""
+        from nazm_ara_panel import NazmAra
+
         self.style_sheet_handler.setResourceQssPath(":/styles/nazm_ara_panel.qss")
-        self.loadPage(NazmAra, account_details)
+        self.loadPage(NazmAra, account_details, self.database, self.database_worker)
         # Expand the UI to fill the whole window for the main app
         self.resetShrinkPage()
         self.removeSpacing()
 
 
     def showForgotPasswordPage(self):
+        from forgot_password_panel import ForgotPasswordPanel
+
         self.style_sheet_handler.setResourceQssPath(":/styles/forgot_pass_panel.qss")
         self.forgot_pass_panel = self.loadPage(ForgotPasswordPanel)
         self.forgot_pass_panel.back_to_login_clicked.connect(self.showLoginPage)
@@ -97,6 +130,8 @@ class MainWindow(QMainWindow):
 
 
     def showSignupPage(self):
+        from signup_panel import SignupPanel
+
         self.style_sheet_handler.setResourceQssPath(":/styles/signup_panel.qss")
         self.signup_panel = self.loadPage(SignupPanel)
         self.signup_panel.already_have_account_clicked.connect(self.showLoginPage)
@@ -122,14 +157,31 @@ class MainWindow(QMainWindow):
         return new_widget
 
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # Children paint after the window in the same frame; the queued call runs once the frame is done
+        if not timeline.finished:
+            QTimer.singleShot(0, timeline.finish)
+
+
     def resizeEvent(self, event):
-        """Triggers UI adjustments and CSS refreshes when the window is resized."""
+        """Triggers UI adjustments and a debounced CSS refresh when the window is resized."""
         self.shrinkPage()
-        self.style_sheet_handler.updateStylesheet()
+        self.style_sheet_handler.scheduleUpdate()
 
         super().resizeEvent(event)
 
 
+    def closeEvent(self, event):
+        """Finishes queued database work and releases the connections before the window closes."""
+        self.checkpoint_timer.stop()
+        if self.stack.currentWidget().objectName() == "NazmAra":
+            self.stack.currentWidget().shutdown()
+        self.database_worker.stop()
+        self.database.close()
+        super().closeEvent(event)
+
+
     def shrinkPage(self):
         """Limits the width of Auth panels to look centered."""
         if not self.stack.currentWidget().objectName() == "NazmAra":
@@ -161,15 +213,22 @@ class MainWindow(QMainWindow):
 
 
     def createOfflineUser(self, user_info: dict):
-        """Handles the logic of saving a new local user to database."""
-        if self.database.addOfflineUser(user_info.get("nickname"), user_info.get("first_name"), user_info.get("last_name")):
+        """Saves a new local user to the database in the background."""
+        request = self.database_worker.submit(self.database.addOfflineUser, user_info.get("nickname"),
+                                              user_info.get("first_name"), user_info.get("last_name"))
+        request.finished.connect(self.onOfflineUserCreated)
+        request.failed.connect(lambda _: self.onOfflineUserCreated(False))
+
+
+    def onOfflineUserCreated(self, status: bool):
+        if status:
             self.notification_handler.showToast(
                 "bottom_right", "Welcome!",
                 "Your account has been successfully created.", "success", duration=4000
             )
             # Retrieve the newly created user and log them in 
-            user_info = self.database.getListOfUsers()[-1]
-            self.openMainApp(user_info)
+            request = self.database_worker.submit(self.database.getListOfUsers)
+            request.finished.connect(lambda users: self.openMainApp(users[-1]))
         else:
             self.notification_handler.showToast(
                 "bottom_right", "Couldn't Create Account",
@@ -21,7 +21,7 @@ class AddTaskModal(QFrame, FieldStyleManager):
     STRETCH_SIZE = 1
     MEDIUM_INDEX = 1
 
-    def __init__(self, parent: QWidget, task_object: QWidget, task_details: dict = None):
+    def __init__(self, parent: QWidget, task_object: object, task_details: dict = None):
         # The 'shield' acts as a semi-transparent overlay covering the parent window
         # to block interactions and serve as a background for the modal.
         self.main_win = parent.window()
@@ -193,14 +193,14 @@ class AddTaskModal(QFrame, FieldStyleManager):
 
     def handleFormatValidation(self, field_map: dict):
         """Checks formatting and displays notifications for invalid input."""
-        is_valid, result = self.form_processor.getTaskModalsValidationErrors(field_map)
+        result = self.form_processor.validate(field_map)
         
-        if not is_valid:
+        if not result.isValid():
             form_fields = list(field_map.values())
-            self.updateInvalidFieldStyle(result.get("invalid_widgets"), form_fields)
+            self.updateInvalidFieldStyle(result.invalid_widgets, form_fields)
             
             # Show a toast notification with the specific error reasons
-            errors = "\n".join(result.get("errors"))
+            errors = "\n".join(result.errors)
             duration = max(4000, len(errors) * 50)
             
             self.notification_handler.showToast(
@@ -209,5 +209,4 @@ class AddTaskModal(QFrame, FieldStyleManager):
             )
             return False, None
             
-        data = self.form_processor.getValidatedTaskData(field_map)
-        return True, data
+        return True, result.data
@@ -1,13 +1,26 @@
-from widgets import PushButton, RadioButton, TaskListItemWidget, TaskCalendar
+import os
+from widgets import (
+    PushButton,
+    RadioButton,
+    TaskCalendar,
+    TaskListModel,
+    TaskItemDelegate,
+    HabitTableModel,
+    HabitItemDelegate,
+)
 from modals import AddTaskModal
 from notification_handler import NotificationHandler
 from database_manager import DatabaseManager
+from database_worker import DatabaseWorker
+from task_cache import TaskCache
 
 from PySide6.QtCore import (
     Qt,
     QMargins,
     QDate,
-    QPoint
+    QPoint,
+    QPersistentModelIndex,
+    QTimer,
 )
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
@@ -16,21 +29,27 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QWidget,
     QLabel,
+    QLineEdit,
     QStackedWidget,
-    QListWidget,
+    QListView,
+    QTableView,
+    QHeaderView,
     QAbstractItemView,
-    QListWidgetItem
 )
 
 class NazmAra(QWidget):
     """The primary application container after login."""
     SPACING_SIZE = 1
     CONTENTS_MARGINS_SIZE = QMargins(0, 0, 0, 0)
+    SYNC_URL_VARIABLE = "NAZM_ARA_SYNC_URL"
 
-    def __init__(self, parent, account_details: dict):
+    def __init__(self, parent, account_details: dict, database: DatabaseManager = None,
+                 database_worker: DatabaseWorker = None):
         super().__init__(parent)
         self.setObjectName("NazmAra")
         self.account_details = account_details
+        self.database = database or DatabaseManager.shared()
+        self.database_worker = database_worker or DatabaseWorker.shared()
         
         # Horizontal layout to place Sidebar next to Content
         self.main_layout = QHBoxLayout(self)
@@ -39,12 +58,62 @@ class NazmAra(QWidget):
 
         # Component Initialization
         self.sidebar = UserControlSidebar()
-        self.content_area = MainSection(self, self.account_details)
+        self.content_area = MainSection(self, self.account_details, self.database, self.database_worker)
         self.content_area.setObjectName("MainSection")
 
         self.main_layout.addWidget(self.sidebar)
         self.main_layout.addWidget(self.content_area, NazmAra.SPACING_SIZE)
 
+        # Online accounts sync in the background; the sidebar button forces a sync
+        self.notification_handler = NotificationHandler(self)
+        self.sync_scheduler = self.createSyncScheduler()
+        self.sidebar.save_button.clicked.connect(self.syncNow)
+
+
+    def createSyncScheduler(self):
+        """Starts background sync for online accounts when NAZM_ARA_SYNC_URL is set, otherwise returns None."""
+        url = os.environ.get(NazmAra.SYNC_URL_VARIABLE)
+        token = self.account_details.get("token")
+        if not url or not token:
+            return None
+
+        # Offline accounts never sync, so they never pay for importing urllib and the engine
+        from sync_engine import SyncEngine, HttpTransport
+        from sync_scheduler import SyncScheduler
+
+        engine = SyncEngine(self.database, HttpTransport(url, token), self.account_details.get("id"))
+        scheduler = SyncScheduler(engine, self.database, self.notification_handler, self)
+        scheduler.state_changed.connect(self.sidebar.showSyncState)
+        scheduler.synced.connect(self.onSynced)
+        scheduler.start()
+        return scheduler
+
+
+    def syncNow(self):
+        if self.sync_scheduler is None:
+            self.notification_handler.showToast(
+                "bottom_right", "Sync Unavailable",
+                "Sign in with an online account to back up your data.", "info"
+            )
+            return
+        self.sync_scheduler.syncNow()
+
+
+    def onSynced(self, report: dict):
+        task_page = self.content_area.builtPage(MainSection.TODO_PAGE)
+        # A page built later reads fresh data anyway
+        if report.get("pulled") and task_page is not None:
+            task_page.reloadFromDatabase()
+
+
+    def shutdown(self):
+        """Saves pending habit edits and stops background sync before the application exits."""
+        habit_page = self.content_area.builtPage(MainSection.HABIT_PAGE)
+        if habit_page is not None:
+            habit_page.saveValues()
+        if self.sync_scheduler is not None:
+            self.sync_scheduler.stop()
+
 
 class UserControlSidebar(QFrame):
     """Vertical navigation bar for global actions like Profile, Cloud Sync, and Settings."""
@@ -75,6 +144,17 @@ class UserControlSidebar(QFrame):
         layout.addWidget(self.settings_button)
 
 
+    def showSyncState(self, state: str):
+        """Reflects the background sync state in the upload button's tooltip."""
+        tooltips = {
+            "idle": "Synced",
+            "syncing": "Syncing...",
+            "backing_off": "Sync failed, retrying soon",
+            "paused": "Sync paused",
+        }
+        self.save_button.setToolTip(tooltips.get(state, ""))
+
+
 class MainSection(QFrame):
     """
     The central content switcher. 
@@ -83,10 +163,15 @@ class MainSection(QFrame):
     CONTENTS_MARGINS_SIZE = QMargins(0, 0, 0, 0)
     TODO_PAGE  = 1
     HABIT_PAGE = 2
+    # Pages not visited yet are built this long after startup, one per event-loop turn
+    PREWARM_DELAY_MS = 2000
 
-    def __init__(self, parent=None, account_details: dict = None):
+    def __init__(self, parent=None, account_details: dict = None, database: DatabaseManager = None,
+                 database_worker: DatabaseWorker = None, prewarm: bool = True):
         super().__init__(parent)
         self.account_details = account_details
+        self.database = database or DatabaseManager.shared()
+        self.database_worker = database_worker or DatabaseWorker.shared()
 
         self.layout = QVBoxLayout(self)
         self.layout.setAlignment(Qt.AlignTop)
@@ -110,29 +195,88 @@ class MainSection(QFrame):
                                    self, alignment=Qt.AlignmentFlag.AlignCenter
                                   )
         self.welcome_page.setObjectName("WelcomePage")
-        self.task_page = TaskWidget(self, self.account_details)
-        self.habit_page = QLabel("Habit List") # TODO: habit list class
-
-        # Add pages to stack
         self.pages.addWidget(self.welcome_page)
-        self.pages.addWidget(self.task_page)
-        self.pages.addWidget(self.habit_page)
-        
+
+        # Page index -> factory; a page is built the first time it is shown (or prewarmed)
+        self.page_factories = {}
+        self.built_pages = {}
+        self.registerPage(MainSection.TODO_PAGE,
+                          lambda: TaskWidget(self, self.account_details, self.database, self.database_worker))
+        self.registerPage(MainSection.HABIT_PAGE,
+                          lambda: HabitWidget(self, self.account_details, self.database, self.database_worker))
+
         self.layout.addWidget(self.pages)
 
         # Page Switching Logic
-        self.task_list_btn.clicked.connect(lambda: self.pages.setCurrentIndex(MainSection.TODO_PAGE))
-        self.habit_list_btn.clicked.connect(lambda: self.pages.setCurrentIndex(MainSection.HABIT_PAGE))
+        self.task_list_btn.clicked.connect(lambda: self.showPage(MainSection.TODO_PAGE))
+        self.habit_list_btn.clicked.connect(lambda: self.showPage(MainSection.HABIT_PAGE))
+
+        if prewarm:
+            QTimer.singleShot(MainSection.PREWARM_DELAY_MS, self.prewarmPages)
+
+
+    def registerPage(self, index: int, factory):
+        """Reserves a stack slot for a page that factory() builds on demand."""
+        self.page_factories[index] = factory
+        # An empty placeholder keeps the indices of later pages stable
+        self.pages.insertWidget(index, QWidget(self))
+
+
+    def showPage(self, index: int):
+        self.page(index)
+        self.pages.setCurrentIndex(index)
+
+
+    def page(self, index: int) -> QWidget:
+        """Returns the page at index, building it from its factory on first use."""
+        if index not in self.page_factories:
+            return self.pages.widget(index)
+        if index in self.built_pages:
+            return self.built_pages[index]
+
+        placeholder = self.pages.widget(index)
+        page = self.page_factories[index]()
+        self.pages.insertWidget(index, page)
+        self.pages.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.built_pages[index] = page
+        return page
+
+
+    def builtPage(self, index: int):
+        """The page at index if it has been built, otherwise None."""
+        return self.built_pages.get(index)
+
+
+    def prewarmPages(self):
+        """Builds the next unvisited page and yields to the event loop before building another."""
+        for index in self.page_factories:
+            if index not in self.built_pages:
+                self.page(index)
+                QTimer.singleShot(0, self.prewarmPages)
+                return
 
 
 class TaskWidget(QWidget):
-    """task management view."""
+    """
+    task management view.
+    Database work runs on the DatabaseWorker thread; edits are shown immediately
+    and rolled back if the write fails.
+    """
     STRETCH_SIZE = 1
+    # Typing pauses this long before the search runs
+    SEARCH_DELAY_MS = 250
+    # Scrolling this close to the end of the results fetches the next page
+    SEARCH_PREFETCH_ROWS = 10
 
-    def __init__(self, parent=None, account_details=None):
+    def __init__(self, parent=None, account_details=None, database: DatabaseManager = None,
+                 database_worker: DatabaseWorker = None):
         super().__init__(parent)
         self.account_details = account_details
-        self.database = DatabaseManager()
+        self.database = database or DatabaseManager.shared()
+        self.database_worker = database_worker or DatabaseWorker.shared()
+        self.task_cache = TaskCache(self.database, self.account_details.get("id"))
+        self.destroyed.connect(self.task_cache.close)
         self.notification_handler = NotificationHandler()
 
         self.main_layout = QVBoxLayout(self)
@@ -146,10 +290,8 @@ class TaskWidget(QWidget):
         self.header_layout = QHBoxLayout(self.header_frame)
         self.header_layout.setAlignment(Qt.AlignLeft)
 
-        # Initialize Calendar Popup
-        self.task_calendar = TaskCalendar(self.active_date, parent=self)
-        self.task_calendar.day_changed.connect(self.jumpToSelectedDay)
-        self.highlightTaskDays()
+        # The calendar popup is built the first time it is opened
+        self.task_calendar = None
 
         # Date Navigation Buttons
         self.calendar_btn = PushButton(parent=self)
@@ -171,6 +313,22 @@ class TaskWidget(QWidget):
         self.go_to_today_btn = PushButton("Today", self)
         self.go_to_today_btn.clicked.connect(self.jumpToToday)
 
+        # Full-text search over all of the user's tasks; replaces the day's list while it has text
+        self.search_query = ""
+        self.search_exhausted = True
+        self.search_loading = False
+
+        self.search_input = QLineEdit(self)
+        self.search_input.setObjectName("TaskSearchInput")
+        self.search_input.setPlaceholderText("Search tasks")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(lambda: self.search_timer.start())
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(TaskWidget.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.runSearch)
+
         self.add_task_btn = PushButton("+ Add task", self)
         self.add_task_btn.setObjectName("AddTaskBtn")
         self.add_task_btn.clicked.connect(self.showCreateModal)
@@ -182,15 +340,27 @@ class TaskWidget(QWidget):
         self.header_layout.addWidget(self.go_to_today_btn)
         
         self.header_layout.addStretch(TaskWidget.STRETCH_SIZE)
+        self.header_layout.addWidget(self.search_input)
         self.header_layout.addWidget(self.add_task_btn)
         self.main_layout.addWidget(self.header_frame)
 
-        # Task List Display
-        self.list_widget = QListWidget(self)
-        self.list_widget.horizontalScrollBar()
-        self.list_widget.setFocusPolicy(Qt.NoFocus)
-        self.list_widget.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
-        self.main_layout.addWidget(self.list_widget)
+        # Task List Display: rows are painted by the delegate, so only visible tasks cost anything
+        self.task_model = TaskListModel(self)
+        self.task_delegate = TaskItemDelegate(self)
+        self.task_delegate.check_clicked.connect(self.checkedOrUncheckedTask)
+        self.task_delegate.edit_clicked.connect(self.showEditModal)
+
+        self.list_view = QListView(self)
+        self.list_view.setObjectName("TaskList")
+        self.list_view.setModel(self.task_model)
+        self.list_view.setItemDelegate(self.task_delegate)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setMouseTracking(True)
+        self.list_view.setFocusPolicy(Qt.NoFocus)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.list_view.verticalScrollBar().valueChanged.connect(self.onListScrolled)
+        self.main_layout.addWidget(self.list_view)
 
         # Initial data load
         self.loadTasks()
@@ -200,7 +370,11 @@ class TaskWidget(QWidget):
         """Positions and displays the TaskCalendar popup relative to its trigger button."""
         button_pos = self.calendar_btn.mapToGlobal(QPoint(0, 0))
         calendar_pos = button_pos + QPoint(0, self.calendar_btn.height())
-        
+
+        if self.task_calendar is None:
+            self.task_calendar = TaskCalendar(self.active_date, parent=self)
+            self.task_calendar.day_changed.connect(self.jumpToSelectedDay)
+            self.task_calendar.month_requested.connect(self.loadMonthCounts)
         self.task_calendar.setSelectedDate(self.active_date)
         self.task_calendar.move(calendar_pos)
         self.task_calendar.show()
@@ -213,34 +387,126 @@ class TaskWidget(QWidget):
 
 
     def loadTasks(self):
-        """Retrieves tasks for the currently active date from the database and renders them."""
+        """Renders the tasks of the active date, from the cache if possible, otherwise via the worker."""
+        if self.search_query:
+            self.runSearch()
+            return
+
         date_string = self.active_date.toString(Qt.ISODate)
-        tasks = self.database.getTasksByDate(date_string, self.account_details.get("id"))
+        tasks = self.task_cache.peekTasksByDate(date_string)
+        if tasks is not None:
+            self.task_model.setTasks(tasks)
+            return
+
+        self.task_model.setTasks([])
+        request = self.database_worker.submit(self.task_cache.getTasksByDate, date_string)
+        request.finished.connect(lambda tasks, date=date_string: self.onTasksLoaded(date, tasks))
+
+
+    def runSearch(self):
+        """Shows the first page of matches for the search box text, or the active day when it is empty."""
+        query = self.search_input.text().strip()
+        self.search_timer.stop()
+        self.search_query = query
+        self.search_exhausted = not query
+        self.search_loading = False
+        self.date_label.setText("Search results" if query else self.dateLabelText())
+        if not query:
+            self.loadTasks()
+            return
+
+        self.task_model.setTasks([])
+        self.loadSearchPage()
+
+
+    def loadSearchPage(self):
+        """Fetches the next page of search results in the background."""
+        if self.search_exhausted or self.search_loading:
+            return
+        self.search_loading = True
+        query, offset = self.search_query, self.task_model.rowCount()
+        request = self.database_worker.submit(self.database.searchTasks, self.account_details.get("id"), query,
+                                              DatabaseManager.SEARCH_PAGE_SIZE, offset)
+        request.finished.connect(lambda tasks: self.onSearchResults(query, offset, tasks))
+        request.failed.connect(lambda _: self.onSearchResults(query, offset, []))
+
+
+    def onSearchResults(self, query: str, offset: int, tasks: list):
+        # Results of an older query are dropped
+        if query != self.search_query:
+            return
+        self.search_loading = False
+        # Rows were removed while the page loaded; fetch it again from the new offset
+        if offset != self.task_model.rowCount():
+            self.loadSearchPage()
+            return
+        self.search_exhausted = len(tasks) < DatabaseManager.SEARCH_PAGE_SIZE
+        self.task_model.appendTasks(tasks)
+
+
+    def onListScrolled(self, value: int):
+        if not self.search_query:
+            return
+        scroll_bar = self.list_view.verticalScrollBar()
+        row_height = max(1, self.list_view.sizeHintForRow(0))
+        if scroll_bar.maximum() - value <= TaskWidget.SEARCH_PREFETCH_ROWS * row_height:
+            self.loadSearchPage()
+
+
+    def clearSearch(self):
+        """Leaves search mode without triggering another load; the caller shows the day it wants."""
+        self.search_timer.stop()
+        self.search_query = ""
+        self.search_exhausted = True
+        self.search_loading = False
+        self.search_input.blockSignals(True)
+        self.search_input.clear()
+        self.search_input.blockSignals(False)
+
+
+    def reloadFromDatabase(self):
+        """Drops cached tasks after the database changed underneath the view, e.g. after a sync."""
+        self.task_cache.invalidate()
+        self.loadTasks()
+        if self.task_calendar is not None:
+            self.task_calendar.invalidate()
 
-        for row in tasks:
-            item = QListWidgetItem(self.list_widget)
-            custom_widget = TaskListItemWidget(row, self)
-            # Connect signals from custom item widget for task updates
-            custom_widget.on_check_button_clicked.connect(self.checkedOrUncheckedTask)
-            custom_widget.on_edit_button_clicked.connect(self.showEditModal)
 
-            item.setSizeHint(custom_widget.sizeHint())
-            self.list_widget.addItem(item)
-            self.list_widget.setItemWidget(item, custom_widget)
+    def onTasksLoaded(self, date_string: str, tasks: list):
+        # Ignore results for a day the user has already navigated away from
+        if date_string == self.active_date.toString(Qt.ISODate):
+            self.task_model.setTasks(tasks)
 
 
-    def checkedOrUncheckedTask(self, task_object: QWidget, task_id: str, value: bool):
-        """Updates the completion status of a task in the database."""
-        status = self.database.toggleTask(task_id, value)
+    def checkedOrUncheckedTask(self, task_index: QPersistentModelIndex, task_id: str, value: int):
+        """Shows the new completion state at once and saves it in the background."""
+        task = task_index.data(TaskListModel.TaskRole) or {}
+        self.task_model.updateTask(task_index, {"is_complete": value})
+        self.adjustCalendarCount(self.taskDate(task), 0, 1 if value else -1)
+
+        previous_fields = {"is_complete": int(not value)}
+        request = self.database_worker.submit(self.task_cache.toggleTask, task_id, value)
+        request.finished.connect(lambda status: self.onTaskSaved(status, task_index, previous_fields))
+        request.failed.connect(lambda _: self.onTaskSaved(False, task_index, previous_fields))
+
+
+    def onTaskSaved(self, status: bool, task_index: QPersistentModelIndex, previous_fields: dict):
+        """Restores a row if its optimistic update could not be saved."""
         if status:
-            task_object.toggleCheckedBtn()
-        else:
-            # Fallback if DB update fails
-            task_object.check_btn.setChecked(False)
-            self.notification_handler.showToast(
-                "bottom_right", "Couldn't Create Task",
-                "A temporary error occurred. Please try again.", "error", duration=4000
-            )
+            return
+        task = task_index.data(TaskListModel.TaskRole)
+        if task is not None and "is_complete" in previous_fields:
+            self.adjustCalendarCount(QDate.fromString(task.get("date_time"), Qt.ISODate), 0,
+                                     previous_fields["is_complete"] - task.get("is_complete"))
+        self.task_model.updateTask(task_index, previous_fields)
+        self.showSaveErrorToast()
+
+
+    def showSaveErrorToast(self):
+        self.notification_handler.showToast(
+            "bottom_right", "Couldn't Save Task",
+            "A temporary error occurred. Please try again.", "error", duration=4000
+        )
 
 
     def showCreateModal(self):
@@ -249,101 +515,264 @@ class TaskWidget(QWidget):
         self.modal.add_task_clicked.connect(self.createTask)
 
 
-    def showEditModal(self, task_object: QWidget, task_details: dict):
+    def showEditModal(self, task_index: QPersistentModelIndex, task_details: dict):
         """Opens the modal to edit or delete an existing task."""
-        self.modal = AddTaskModal(self, task_object, task_details)
+        self.modal = AddTaskModal(self, task_index, task_details)
         self.modal.on_update_clicked.connect(self.updateTask)
         self.modal.on_delete_clicked.connect(self.deleteTask)
 
 
-    def updateTask(self, item_object: QWidget, data: dict, local_id: str):
+    def updateTask(self, task_index: QPersistentModelIndex, data: dict, local_id: str):
         """Validates and saves modifications to an existing task."""
-        title = data.get("title")
-        desc = data.get("description")
-        priority = data.get("priority")
-        if self.database.updateTask(local_id, title=title, description=desc, priority=priority):
-            item_object.update(priority, desc, title)
-        else:
-            self.notification_handler.showToast(
-                "bottom_right", "Couldn't Create Task",
-                "A temporary error occurred. Please try again.", "error", duration=4000
-            )
+        fields = {
+            "title": data.get("title"),
+            "description": data.get("description"),
+            "priority": data.get("priority"),
+        }
+        task = task_index.data(TaskListModel.TaskRole) or {}
+        previous_fields = {name: task.get(name) for name in fields}
+        self.task_model.updateTask(task_index, fields)
+
+        request = self.database_worker.submit(self.task_cache.updateTask, local_id, **fields)
+        request.finished.connect(lambda status: self.onTaskSaved(status, task_index, previous_fields))
+        request.failed.connect(lambda _: self.onTaskSaved(False, task_index, previous_fields))
+
+
+    def deleteTask(self, task_index: QPersistentModelIndex, local_id: str):
+        """Removes a task from the UI list at once and from the database in the background."""
+        task = task_index.data(TaskListModel.TaskRole) or {}
+        completed = int(bool(task.get("is_complete")))
+        self.task_model.removeTask(task_index)
+        date = self.taskDate(task)
+        self.adjustCalendarCount(date, -1, -completed)
+
+        request = self.database_worker.submit(self.task_cache.deleteTask, local_id)
+        request.finished.connect(lambda status: self.onTaskDeleted(status, date, completed))
+        request.failed.connect(lambda _: self.onTaskDeleted(False, date, completed))
+
+
+    def onTaskDeleted(self, status: bool, date: QDate, completed: int):
+        """Brings back a task whose deletion could not be saved."""
+        if status:
+            return
+        self.adjustCalendarCount(date, 1, completed)
+        if date == self.active_date or self.search_query:
+            self.loadTasks()
+        self.showSaveErrorToast()
+
 
+    def createTask(self, details: list):
+        """Adds a new task to the database and adds it into the current view once saved."""
+        details["date_time"] = self.active_date.toString(Qt.ISODate)
+        request = self.database_worker.submit(self.task_cache.addTask, details.get("title"),
+                                              details.get("description"), details.get("priority"),
+                                              details.get("date_time"))
+        request.finished.connect(lambda task_id: self.onTaskCreated(details, task_id))
+        request.failed.connect(lambda _: self.onTaskCreated(details, None))
 
-    def deleteTask(self, item_object: QWidget, local_id: str):
-        """Removes a task from the database and the UI list."""
-        if self.database.deleteTask(local_id):
-            item = self.list_widget.itemAt(item_object.pos())
-            row = self.list_widget.row(item)
-            taken_item = self.list_widget.takeItem(row) # Removes the item from view
-            del taken_item
 
-            # Remove calendar highlight if no tasks remain for this date
-            if self.list_widget.count() == 0:
-                self.task_calendar.clearTaskColor(self.active_date)
-        else:
+    def onTaskCreated(self, details: dict, task_id: str):
+        if not task_id:
             self.notification_handler.showToast(
                 "bottom_right", "Couldn't Create Task",
                 "A temporary error occurred. Please try again.", "error", duration=4000
             )
+            return
 
-
-    def createTask(self, details: list):
-        """Adds a new task to the database and add it into the current view."""
-        details["date_time"] = self.active_date.toString(Qt.ISODate)
-        user_id = self.account_details.get("id")
-        task_id = self.database.addTask(details.get("title"), user_id ,details.get("description"),
-                                details.get("priority"), details.get("date_time"))
-        if task_id:
+        # Only add the row if the user is still looking at the task's day
+        if not self.search_query and details.get("date_time") == self.active_date.toString(Qt.ISODate):
             details["local_id"] = task_id
+            details["is_complete"] = 0
+            self.task_model.appendTask(details)
 
-            item = QListWidgetItem(self.list_widget)
-            custom_widget = TaskListItemWidget(details, self)
-            custom_widget.on_check_button_clicked.connect(self.checkedOrUncheckedTask)
-            custom_widget.on_edit_button_clicked.connect(self.showEditModal)
-            item.setSizeHint(custom_widget.sizeHint())
-            self.list_widget.addItem(item)
-            self.list_widget.setItemWidget(item, custom_widget)
-        else:
-            self.notification_handler.showToast(
-                "bottom_right", "Couldn't Create Task",
-                "A temporary error occurred. Please try again.", "error", duration=4000
-            )
         # Update calendar to show this date now has a task
-        self.task_calendar.setTaskColor([self.active_date])
+        self.adjustCalendarCount(QDate.fromString(details.get("date_time"), Qt.ISODate), 1)
 
 
     def nextAndPreviousDay(self, next_or_previous: int):
         """Adjusts the active date, updates labels, and reloads the task list."""
-        curent_day = QDate.currentDate()
+        self.clearSearch()
         self.active_date = self.active_date.addDays(next_or_previous)
-        diff = curent_day.daysTo(self.active_date)
+        self.date_label.setText(self.dateLabelText())
+
+        self.loadTasks()
+
 
-        # Human-readable date labeling
+    def dateLabelText(self) -> str:
+        """Human-readable label of the active date."""
+        diff = QDate.currentDate().daysTo(self.active_date)
         if diff == -1:
-            self.date_label.setText("Yesterday")
+            return "Yesterday"
         elif diff == 0:
-            self.date_label.setText("Today")
+            return "Today"
         elif diff == 1:
-            self.date_label.setText("Tomorrow")
-        else:
-            self.date_label.setText(self.active_date.toString(("d-MMMM-yyyy")))
-        
-        self.list_widget.clear()
-        self.loadTasks()
+            return "Tomorrow"
+        return self.active_date.toString(("d-MMMM-yyyy"))
 
 
     def jumpToToday(self):
         """Reset the view to the current system date."""
+        self.clearSearch()
         self.active_date = QDate.currentDate()
         self.date_label.setText("Today")
 
-        self.list_widget.clear()
         self.loadTasks()
 
 
-    def highlightTaskDays(self):
-        """Queries the database for all dates with tasks and applies calendar formatting."""
-        dates = self.database.getUserTaskDates(self.account_details.get("id"))
-        qdates = [QDate.fromString(date, Qt.ISODate) for date in dates]
-        self.task_calendar.setTaskColor(qdates)
+    @staticmethod
+    def taskDate(task: dict) -> QDate:
+        """The day a task row belongs to; search results can come from any day."""
+        return QDate.fromString((task.get("date_time") or "")[:10], Qt.ISODate)
+
+
+    def adjustCalendarCount(self, date: QDate, total_delta: int, completed_delta: int = 0):
+        """Keeps the calendar heatmap in step with an edit; nothing to do before it is first opened."""
+        if self.task_calendar is not None:
+            self.task_calendar.adjustDateCount(date, total_delta, completed_delta)
+
+
+    def loadMonthCounts(self, year: int, month: int):
+        """Reads the per-day task counts of one calendar page in the background."""
+        first_day = QDate(year, month, 1)
+        request = self.database_worker.submit(self.database.getTaskCountsByDate, self.account_details.get("id"),
+                                              first_day.toString(Qt.ISODate),
+                                              first_day.addMonths(1).addDays(-1).toString(Qt.ISODate))
+        request.finished.connect(lambda counts: self.task_calendar.setMonthCounts(year, month, counts))
+        request.failed.connect(lambda _: self.task_calendar.monthFailed(year, month))
+
+
+class HabitWidget(QWidget):
+    """
+    Habit grid view: habits as rows, days as columns with today on the left.
+    Older days are read DAYS_PER_PAGE at a time as the grid is scrolled to the right,
+    and edits are written together once the user pauses for SAVE_DELAY_MS.
+    """
+    DAYS_PER_PAGE = 42
+    # Start loading the next page when the viewport is this many columns from the last one
+    PREFETCH_COLUMNS = 14
+    SAVE_DELAY_MS = 800
+    CELL_SIZE = 40
+    TITLE_COLUMN_WIDTH = 200
+
+    def __init__(self, parent=None, account_details=None, database: DatabaseManager = None,
+                 database_worker: DatabaseWorker = None):
+        super().__init__(parent)
+        self.account_details = account_details
+        self.database = database or DatabaseManager.shared()
+        self.database_worker = database_worker or DatabaseWorker.shared()
+        self.notification_handler = NotificationHandler()
+
+        # (habit_id, date) -> value of edits not yet written
+        self.pending_values = {}
+        self.loading_days = False
+
+        self.main_layout = QVBoxLayout(self)
+
+        self.habit_model = HabitTableModel(self)
+        self.habit_model.value_edited.connect(self.queueValue)
+        self.habit_delegate = HabitItemDelegate(self)
+
+        # Fixed-size sections let the view map scroll offsets to cells without measuring anything
+        self.table_view = QTableView(self)
+        self.table_view.setObjectName("HabitGrid")
+        self.table_view.setModel(self.habit_model)
+        self.table_view.setItemDelegate(self.habit_delegate)
+        self.table_view.setShowGrid(False)
+        self.table_view.setFocusPolicy(Qt.NoFocus)
+        self.table_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.table_view.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked)
+        self.table_view.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.table_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        for header in (self.table_view.horizontalHeader(), self.table_view.verticalHeader()):
+            header.setSectionResizeMode(QHeaderView.Fixed)
+            header.setDefaultSectionSize(HabitWidget.CELL_SIZE)
+        self.table_view.verticalHeader().setFixedWidth(HabitWidget.TITLE_COLUMN_WIDTH)
+        self.table_view.horizontalScrollBar().valueChanged.connect(self.onHorizontalScroll)
+        self.main_layout.addWidget(self.table_view)
+
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(HabitWidget.SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.saveValues)
+
+        self.loadHabits()
+
+
+    def loadHabits(self):
+        request = self.database_worker.submit(self.database.getHabits, self.account_details.get("id"))
+        request.finished.connect(self.onHabitsLoaded)
+
+
+    def onHabitsLoaded(self, habits: list):
+        self.habit_model.setHabits(habits)
+        if not self.habit_model.dates:
+            self.loadMoreDays()
+
+
+    def loadMoreDays(self):
+        """Reads the values of the next DAYS_PER_PAGE older days in one query."""
+        if self.loading_days:
+            return
+        self.loading_days = True
+
+        dates = self.habit_model.dates
+        newest = QDate.fromString(dates[-1], Qt.ISODate).addDays(-1) if dates else QDate.currentDate()
+        page = [newest.addDays(-offset).toString(Qt.ISODate) for offset in range(HabitWidget.DAYS_PER_PAGE)]
+
+        request = self.database_worker.submit(self.database.getHabitValues, self.account_details.get("id"),
+                                              page[-1], page[0])
+        request.finished.connect(lambda values, page=page: self.onDaysLoaded(page, values))
+        request.failed.connect(lambda _: setattr(self, "loading_days", False))
+
+
+    def onDaysLoaded(self, page: list, values: dict):
+        self.loading_days = False
+        self.habit_model.appendDays(page, values)
+        # A wide window may still show the last column, so keep filling it
+        self.onHorizontalScroll(self.table_view.horizontalScrollBar().value())
+
+
+    def onHorizontalScroll(self, value: int):
+        remaining = self.table_view.horizontalScrollBar().maximum() - value
+        if remaining <= HabitWidget.PREFETCH_COLUMNS * HabitWidget.CELL_SIZE:
+            self.loadMoreDays()
+
+
+    def queueValue(self, habit_id: str, date: str, value: int):
+        """Collects an edit; the save timer restarts so a burst of edits becomes one write."""
+        self.pending_values[(habit_id, date)] = value
+        self.save_timer.start()
+
+
+    def saveValues(self):
+        """Writes every pending edit in one setHabitValues call."""
+        self.save_timer.stop()
+        if not self.pending_values:
+            return
+
+        values = [(habit_id, date, value) for (habit_id, date), value in self.pending_values.items()]
+        self.pending_values = {}
+        request = self.database_worker.submit(self.database.setHabitValues, self.account_details.get("id"), values)
+        request.finished.connect(self.onValuesSaved)
+        request.failed.connect(lambda _: self.onValuesSaved(False))
+
+
+    def onValuesSaved(self, status: bool):
+        """Reloads the loaded days from the database if a batch could not be saved."""
+        if status:
+            return
+        self.notification_handler.showToast(
+            "bottom_right", "Couldn't Save Habits",
+            "A temporary error occurred. Please try again.", "error", duration=4000
+        )
+        dates = self.habit_model.dates
+        if dates:
+            request = self.database_worker.submit(self.database.getHabitValues, self.account_details.get("id"),
+                                                  dates[-1], dates[0])
+            request.finished.connect(self.habit_model.replaceValues)
+
+
+    def hideEvent(self, event):
+        # Leaving the page writes edits right away instead of waiting for the timer
+        self.saveValues()
+        super().hideEvent(event)
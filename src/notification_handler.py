@@ -1,10 +1,12 @@
-from pyqttoast import Toast, ToastPreset, ToastPosition
 from PySide6.QtWidgets import QWidget
 from PySide6.QtGui import QFont, QColor
 
 
 class NotificationHandler(QWidget):
-    """Manages the creation and styling of toast notifications using the pyqttoast library."""
+    """
+    Manages the creation and styling of toast notifications using the pyqttoast library.
+    pyqttoast is imported when the first toast is shown, keeping it off the startup path.
+    """
     def __init__(self, parent=None):
         super().__init__(parent)
         # Identify the top-level window to ensure toasts overlay the entire application
@@ -13,6 +15,8 @@ class NotificationHandler(QWidget):
 
     def showToast(self, position: str, title: str, text: str, type: str, duration: int = 3000):
         """ Creates, styles, and displays a toast notification with the specified parameters. """
+        from pyqttoast import Toast
+
         active_toast = Toast(self.parent_widget)
         active_toast.applyPreset(self.notificationType(type))
         active_toast.setPosition(self.notificationPosition(position))
@@ -25,6 +29,8 @@ class NotificationHandler(QWidget):
 
     def notificationType(self, type: str):
         """ Maps a string identifier to a ToastPreset Enum. """
+        from pyqttoast import ToastPreset
+
         if type == "success":
             return ToastPreset.SUCCESS
         elif type == "error":
@@ -39,6 +45,8 @@ class NotificationHandler(QWidget):
 
     def notificationPosition(self, position: str):
         """ Maps a string identifier to a ToastPosition Enum. """
+        from pyqttoast import ToastPosition
+
         if position == "top_right":
             return ToastPosition.TOP_RIGHT
         elif position == "top_left":
@@ -57,7 +65,7 @@ class NotificationHandler(QWidget):
             return ToastPosition.BOTTOM_RIGHT
 
 
-    def setStyle(self, toast: Toast):
+    def setStyle(self, toast):
         """ Customizes the visual appearance of the toast to match the app theme. """
         toast.setBorderRadius(5)
         toast.setBackgroundColor(QColor("#323339"))
@@ -0,0 +1,156 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QLineEdit
+
+
+class PasswordStrength:
+    """
+    zxcvbn password scoring with an LRU cache of recent results, shared by the live
+    strength meter and form validation so a password is never scored twice.
+    Results are keyed by the password's SHA-256 digest; no plaintext is kept.
+    """
+    CACHE_SIZE = 64
+
+    _shared_instance = None
+
+    def __init__(self, cache_size: int = CACHE_SIZE):
+        self.cache_size = cache_size
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+
+
+    @classmethod
+    def shared(cls) -> "PasswordStrength":
+        """Returns the process-wide instance, creating it on first use."""
+        if cls._shared_instance is None:
+            cls._shared_instance = cls()
+        return cls._shared_instance
+
+
+    def evaluate(self, password: str) -> Dict:
+        """
+        Returns {"score": 0-4, "warning": str, "suggestions": list} for password,
+        from the cache when possible, otherwise by running zxcvbn on the calling thread.
+        """
+        result = self.cached(password)
+        if result is None:
+            result = self.score(password)
+            self.store(password, result)
+        return result
+
+
+    def evaluateAsync(self, password: str) -> Future:
+        """Like evaluate(), but zxcvbn runs on a background thread. Cached results complete at once."""
+        result = self.cached(password)
+        if result is not None:
+            future = Future()
+            future.set_result(result)
+            return future
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PasswordStrength")
+        return self._executor.submit(self.evaluate, password)
+
+
+    def cached(self, password: str) -> Optional[Dict]:
+        key = self.cacheKey(password)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            return result
+
+
+    def store(self, password: str, result: Dict):
+        with self._lock:
+            self._results[self.cacheKey(password)] = result
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+
+
+    @staticmethod
+    def score(password: str) -> Dict:
+        # zxcvbn loads large frequency dictionaries on import, so it is deferred until a password is scored
+        from zxcvbn import zxcvbn
+
+        results = zxcvbn(password)
+        feedback = results.get("feedback") or {}
+        return {
+            "score": results.get("score"),
+            "warning": feedback.get("warning") or "",
+            "suggestions": list(feedback.get("suggestions") or []),
+        }
+
+
+    @staticmethod
+    def cacheKey(password: str) -> bytes:
+        return hashlib.sha256(password.encode("utf-8")).digest()
+
+
+class PasswordStrengthEvaluator(QObject):
+    """
+    Scores the text of a password field while the user types. Scoring starts once typing
+    pauses for DEBOUNCE_MS and runs off the GUI thread; cached passwords are reported at once.
+    """
+    DEBOUNCE_MS = 300
+
+    strength_changed = Signal(object)     # result dict of PasswordStrength.evaluate(), None when empty
+    evaluated = Signal(str, object)       # emitted on the scoring thread, delivered queued
+
+    def __init__(self, field: QLineEdit, parent=None):
+        super().__init__(parent)
+        self.field = field
+        self.strength = PasswordStrength.shared()
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(PasswordStrengthEvaluator.DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.evaluate)
+
+        self.evaluated.connect(self.onEvaluated)
+        self.field.textChanged.connect(self.onTextChanged)
+
+
+    def onTextChanged(self, text: str):
+        # Scored as FormProcessor sees it, so validation hits the same cache entry
+        password = text.strip()
+        self.debounce_timer.stop()
+        if not password:
+            self.strength_changed.emit(None)
+            return
+
+        result = self.strength.cached(password)
+        if result is not None:
+            self.strength_changed.emit(result)
+        else:
+            self.debounce_timer.start()
+
+
+    def evaluate(self):
+        password = self.field.text().strip()
+        future = self.strength.evaluateAsync(password)
+        future.add_done_callback(lambda done, password=password: self.deliver(password, done))
+
+
+    def deliver(self, password: str, future: Future):
+        """Runs on the scoring thread; hands the result to the GUI thread."""
+        if future.exception() is not None:
+            print(f"Error scoring password: {future.exception()}")
+            return
+        try:
+            self.evaluated.emit(password, future.result())
+        except RuntimeError:
+            # The form was closed while zxcvbn was running
+            pass
+
+
+    def onEvaluated(self, password: str, result: dict):
+        # A result for text the user has since changed is already cached for later
+        if password == self.field.text().strip():
+            self.strength_changed.emit(result)
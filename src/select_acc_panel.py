@@ -11,6 +11,7 @@ from PySide6.QtGui import QPixmap
 
 from widgets import ClickableLabel, AccountListItemWidget
 from database_manager import DatabaseManager
+from database_worker import DatabaseWorker
 
 
 class SelectAccountPanel(QFrame):
@@ -21,11 +22,12 @@ class SelectAccountPanel(QFrame):
     SPACING_SIZE = 40
     CONTENTS_MARGINS_SIZE = QMargins(50, 40, 50, 40)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, database: DatabaseManager = None, database_worker: DatabaseWorker = None):
         super().__init__(parent)
         self.setObjectName("SelectAccountPanel")
 
-        self.database = DatabaseManager()
+        self.database = database or DatabaseManager.shared()
+        self.database_worker = database_worker or DatabaseWorker.shared()
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(SelectAccountPanel.CONTENTS_MARGINS_SIZE)
@@ -60,9 +62,13 @@ class SelectAccountPanel(QFrame):
 
 
     def loadAccounts(self):
-        """Fetches users from the database and populates the QListWidget with custom widgets."""
-        accounts = self.database.getListOfUsers()
+        """Fetches users from the database in the background."""
+        request = self.database_worker.submit(self.database.getListOfUsers)
+        request.finished.connect(self.onAccountsLoaded)
 
+
+    def onAccountsLoaded(self, accounts: list):
+        """Populates the QListWidget with custom widgets."""
         for row in accounts:
             # Create a container item for the QListWidget
             item = QListWidgetItem(self.list_widget)
@@ -1,10 +1,12 @@
 from widgets import (
     PasswordField,
+    PasswordStrengthMeter,
     ClickableLabel,
     PushButton, FormRow,
     FieldStyleManager
 )
 from form_processor import FormProcessor
+from password_strength import PasswordStrengthEvaluator
 from notification_handler import NotificationHandler
 
 from PySide6.QtGui import QPixmap
@@ -99,6 +101,14 @@ class SignupPanel(QFrame, FieldStyleManager):
         self.password_input.setObjectName("PasswordInput")
         layout.addWidget(self.password_input)
 
+        # Live strength feedback; zxcvbn runs off the GUI thread once typing pauses
+        self.password_meter = PasswordStrengthMeter(self)
+        self.password_meter.setObjectName("PasswordStrengthMeter")
+        layout.addWidget(self.password_meter)
+
+        self.password_evaluator = PasswordStrengthEvaluator(self.password_input.input, self)
+        self.password_evaluator.strength_changed.connect(self.password_meter.setStrength)
+
         self.signup_btn = PushButton("Sign up", self)
         self.signup_btn.clicked.connect(self.onSignupClicked)
         layout.addWidget(self.signup_btn)
@@ -134,14 +144,14 @@ class SignupPanel(QFrame, FieldStyleManager):
 
     def handleFormatValidation(self, field_map: dict):
         """Checks formatting and displays notifications for invalid input."""
-        is_valid, result = self.form_processor.getValidationErrors(field_map, is_signup=True)
+        result = self.form_processor.validate(field_map, check_strength=True)
 
-        if not is_valid:
+        if not result.isValid():
             form_fields = list(field_map.values())
-            self.updateInvalidFieldStyle(result.get("invalid_widgets"), form_fields)
+            self.updateInvalidFieldStyle(result.invalid_widgets, form_fields)
 
             # Show a toast notification with the specific error reasons
-            errors = "\n".join(result.get("errors"))
+            errors = "\n".join(result.errors)
             duration = max(4000, len(errors) * 50)
 
             self.notification_handler.showToast(
@@ -150,8 +160,7 @@ class SignupPanel(QFrame, FieldStyleManager):
             )
             return False, None
 
-        data = self.form_processor.getValidatedData(field_map)
-        return True, data
+        return True, result.data
 
 
     def handleEmptyValidation(self, field_map: dict):
@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+
+
+class StartupTimeline:
+    """
+    Records how long each startup phase takes, relative to when the timeline was created.
+    Recording is switched on by setting NAZM_ARA_STARTUP_TIMELINE (to anything but "0");
+    the timeline is then printed to stderr once the first frame has been painted, with a
+    warning when time-to-first-frame exceeds FIRST_FRAME_BUDGET_MS.
+    """
+    ENV_VARIABLE = "NAZM_ARA_STARTUP_TIMELINE"
+    FIRST_FRAME_BUDGET_MS = 800
+
+    def __init__(self, enabled: bool = None):
+        self.origin = time.perf_counter()
+        if enabled is None:
+            enabled = os.environ.get(StartupTimeline.ENV_VARIABLE, "0") not in ("", "0")
+        self.enabled = enabled
+        self.marks = []
+        # A disabled timeline starts out finished, so callers have nothing left to do
+        self.finished = not enabled
+
+
+    def mark(self, phase: str):
+        """Records that a phase ended now."""
+        if not self.finished:
+            self.marks.append((phase, (time.perf_counter() - self.origin) * 1000))
+
+
+    def finish(self, phase: str = "first_paint"):
+        """Records the last phase and prints the timeline. Later calls do nothing."""
+        if self.finished:
+            return
+        self.mark(phase)
+        self.finished = True
+        print(self.report(), file=sys.stderr)
+
+
+    def report(self) -> str:
+        lines = ["Startup timeline:"]
+        previous = 0.0
+        for phase, elapsed in self.marks:
+            lines.append(f"  {phase:<20} {elapsed:8.1f} ms  (+{elapsed - previous:.1f})")
+            previous = elapsed
+
+        if self.marks and self.marks[-1][1] > StartupTimeline.FIRST_FRAME_BUDGET_MS:
+            lines.append(f"  over the {StartupTimeline.FIRST_FRAME_BUDGET_MS} ms first-frame budget")
+        return "\n".join(lines)
@@ -4,20 +4,41 @@ from PySide6.QtCore import (
     QIODevice,
     QFile,
     QTextStream,
+    QTimer,
 )
 
 
 class StyleSheetHandler(QObject):
     """Handles loading, parsing, and dynamically updating the application's stylesheet (QSS)."""
+    # Matches pixel-based font sizes, e.g. "font-size: 16px"
+    FONT_SIZE_PATTERN = re.compile(r"(font-size:\s*)(\d+)(px)")
+    # Scale factors are rounded to this step so renders can be reused across similar sizes
+    SCALE_STEP = 0.05
+    # Resize events arriving closer together than this are coalesced into one update
+    RESIZE_DEBOUNCE_MS = 100
+
     def __init__(self, parent_window):
         super().__init__(parent_window)
         self.parent_window = parent_window
 
+        # QSS path -> parsed template, so switching back to a page never re-parses its file
+        self.templates = {}
+        # (QSS path, quantized scale factor) -> rendered stylesheet
+        self.rendered_cache = {}
+        self.applied_qss = None
+
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(StyleSheetHandler.RESIZE_DEBOUNCE_MS)
+        self.resize_timer.timeout.connect(self.updateStylesheet)
+
 
     def setResourceQssPath(self, resource_qss_path: str):
         """Sets the path to the QSS resource file and triggers the initial stylesheet load."""
         self.resource_qss_path = resource_qss_path
-        self.original_qss = self.loadResourceQss()
+        if resource_qss_path not in self.templates:
+            self.templates[resource_qss_path] = self.parseTemplate(self.loadResourceQss())
+        self.template = self.templates[resource_qss_path]
         self.updateStylesheet()
 
 
@@ -34,40 +55,42 @@ class StyleSheetHandler(QObject):
         return ""
 
 
-    def getMergedStylesheet(self):
+    def parseTemplate(self, qss: str) -> list:
         """
-        Parses the original QSS and applies dynamic modifications.
-        Updates font sizes based on scale factor and injects Latin/Persian font families.
+        Splits the QSS once into literal text and font-size slots.
+        The result alternates str and int items, e.g. ["a { font-size: ", 16, "px; }"].
         """
-        scale_factor = self.getScaleFactor()
-        
-        lines = self.original_qss.split('\n')
-        
-        merged_lines = []
-        
-        for line in lines:
-            # Dynamically scale pixel-based font sizes
-            if 'font-size:' in line:
-                line = self.scaleFontSizeInLine(line, scale_factor)
-            # elif 'font-family:' in line:
-            #     line = f'font-family: "{self.parent_window.latin_font_family}", "{self.parent_window.persian_font_family}";'
-            merged_lines.append(line)
-
-        merged_qss = '\n'.join(merged_lines)
-        return merged_qss
+        template = []
+        literal = ""
+        parts = StyleSheetHandler.FONT_SIZE_PATTERN.split(qss)
+        # re.split with 3 groups yields: text, prefix, size, suffix, text, prefix, size, suffix, ...
+        for i in range(0, len(parts) - 1, 4):
+            literal += parts[i] + parts[i + 1]
+            template.append(literal)
+            template.append(int(parts[i + 2]))
+            literal = parts[i + 3]
+        template.append(literal + parts[-1])
+        return template
+
+
+    def renderTemplate(self, template: list, scale_factor: float) -> str:
+        """Fills every font-size slot of the template with its scaled size."""
+        return "".join(
+            part if isinstance(part, str) else str(int(part * scale_factor))
+            for part in template
+        )
 
 
-    def scaleFontSizeInLine(self, line, scale_factor):
-        """Uses regex to find px values in font-size declarations and scales them."""
-
-        match = re.search(r'font-size:\s*(\d+)px', line)
-        if match:
-            original_size = int(match.group(1))
-            # Calculate new size based on window scale factor
-            new_size = int(original_size * scale_factor)
-            line = line.replace(f"{original_size}px", f"{new_size}px")
+    def getMergedStylesheet(self):
+        """Returns the stylesheet with font sizes scaled for the current window, memoized per scale step."""
+        scale_factor = self.getScaleFactor()
+        key = (self.resource_qss_path, scale_factor)
 
-        return line
+        merged_qss = self.rendered_cache.get(key)
+        if merged_qss is None:
+            merged_qss = self.renderTemplate(self.template, scale_factor)
+            self.rendered_cache[key] = merged_qss
+        return merged_qss
 
 
     def getScaleFactor(self):
@@ -79,13 +102,24 @@ class StyleSheetHandler(QObject):
         # Clamps the scaling between 0.95 and 1.5 to prevent extreme text sizes
         scale_factor = max(1, min(scale_factor, 1.5))
 
-        return scale_factor
+        # Quantize so nearby window sizes share one rendered stylesheet
+        steps = round(scale_factor / StyleSheetHandler.SCALE_STEP)
+        return round(steps * StyleSheetHandler.SCALE_STEP, 2)
+
+
+    def scheduleUpdate(self):
+        """Debounced updateStylesheet(); call from resize events."""
+        self.resize_timer.start()
 
 
     def updateStylesheet(self):
-        """Generates the modified QSS and applies it to the parent window."""
-        if hasattr(self, "original_qss"):
+        """Generates the modified QSS and applies it to the parent window if it changed."""
+        if hasattr(self, "template"):
             merged_qss = self.getMergedStylesheet()
+            # setStyleSheet re-polishes every widget, so skip it when nothing changed
+            if merged_qss == self.applied_qss:
+                return
+            self.applied_qss = merged_qss
             self.parent_window.setStyleSheet(merged_qss)
         else:
             print("No QSS resource path set.")
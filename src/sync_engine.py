@@ -0,0 +1,160 @@
+import json
+import zlib
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List
+
+from database_manager import DatabaseManager
+
+
+class SyncError(Exception):
+    """Raised when a batch could not be delivered or the server's reply is unusable."""
+
+
+class SyncTransport:
+    """
+    Carries one encoded batch to the sync server and returns the encoded reply.
+    Subclass and override exchange() to plug in another channel; it may be called
+    from several threads at once.
+    """
+    def exchange(self, payload: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class HttpTransport(SyncTransport):
+    """POSTs batches to a sync endpoint. Bodies are zlib-compressed JSON in both directions."""
+    TIMEOUT = 15
+
+    def __init__(self, url: str, token: str = None, timeout: float = TIMEOUT):
+        self.url = url
+        self.token = token
+        self.timeout = timeout
+
+
+    def exchange(self, payload: bytes) -> bytes:
+        headers = {
+            "Content-Type": "application/json",
+            "Content-Encoding": "deflate",
+            "Accept-Encoding": "deflate",
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        request = urllib.request.Request(self.url, data=payload, headers=headers, method="POST")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.read()
+        except (urllib.error.URLError, OSError) as e:
+            raise SyncError(f"Sync server unreachable: {e}") from e
+
+
+class SyncEngine:
+    """
+    Pushes a user's needs_sync rows to the server and applies the server's changes.
+
+    Dirty rows are read in pages of batch_size through the needs_sync indexes and each page
+    is sent as one compressed batch; up to concurrency batches are in flight at a time. Only
+    the network calls run on the pool; every database call stays on the thread running sync().
+
+    Wire format (JSON, zlib-compressed):
+        push: {"op": "push", "table": t, "rows": [...]}   -> {"acks": [{"local_id", "server_id"}]}
+        pull: {"op": "pull", "since": cursor, "limit": n} -> {"changes": {t: [...]}, "cursor": c, "more": bool}
+    """
+    BATCH_SIZE = 200
+    CONCURRENCY = 2
+
+    def __init__(self, database: DatabaseManager, transport: SyncTransport, user_id: int,
+                 batch_size: int = BATCH_SIZE, concurrency: int = CONCURRENCY):
+        self.database = database
+        self.transport = transport
+        self.user_id = user_id
+        self.batch_size = batch_size
+        self.concurrency = max(1, concurrency)
+
+
+    def sync(self) -> Dict:
+        """
+        Runs a push followed by a pull. Returns a report dict with the number of rows
+        pushed and pulled and "ok", which is False if any step failed.
+        """
+        report = {"pushed": 0, "pulled": 0, "ok": True}
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="SyncTransport") as pool:
+                for table in DatabaseManager.SYNC_TABLES:
+                    report["pushed"] += self.pushTable(table, pool)
+            report["pulled"] = self.pull()
+        except (SyncError, ValueError, zlib.error) as e:
+            print(f"Error syncing: {e}")
+            report["ok"] = False
+        return report
+
+
+    def pushTable(self, table: str, pool: ThreadPoolExecutor) -> int:
+        """Sends every dirty row of one table and clears the acknowledged ones. Returns rows cleared."""
+        cleared = 0
+        in_flight = {}
+        after_rowid = 0
+
+        while True:
+            rows = self.database.getDirtyRows(table, self.user_id, after_rowid, self.batch_size)
+            if not rows:
+                break
+            after_rowid = rows[-1]["sync_rowid"]
+
+            if len(in_flight) >= self.concurrency:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    cleared += self.acknowledge(table, in_flight.pop(future), future.result())
+
+            batch = [{k: v for k, v in row.items() if k not in ("sync_rowid", "needs_sync")} for row in rows]
+            future = pool.submit(self.send, {"op": "push", "table": table, "rows": batch})
+            in_flight[future] = rows
+
+        for future in list(in_flight):
+            cleared += self.acknowledge(table, in_flight.pop(future), future.result())
+        return cleared
+
+
+    def acknowledge(self, table: str, rows: List[Dict], reply: Dict) -> int:
+        """Matches a push reply to the rows that were sent, using the updated_at each had when read."""
+        sent = {row["local_id"]: row.get("updated_at") for row in rows}
+        acks = [
+            {"local_id": ack["local_id"], "server_id": ack.get("server_id"), "updated_at": sent[ack["local_id"]]}
+            for ack in reply.get("acks", [])
+            if ack.get("local_id") in sent
+        ]
+        return self.database.markSynced(table, acks) if acks else 0
+
+
+    def pull(self) -> int:
+        """Applies server changes since the stored cursor, page by page. Returns rows written."""
+        applied = 0
+        while True:
+            since = self.database.getSyncCursor(self.user_id)
+            reply = self.send({"op": "pull", "since": since, "limit": self.batch_size})
+
+            changes = reply.get("changes", {})
+            for table in DatabaseManager.SYNC_TABLES:
+                if changes.get(table):
+                    written = self.database.applyRemoteChanges(table, self.user_id, changes[table])
+                    # Keep the old cursor so the same page is fetched again next time
+                    if written is None:
+                        raise SyncError(f"Could not apply server changes to {table}")
+                    applied += written
+
+            next_cursor = reply.get("cursor")
+            if next_cursor is None or next_cursor == since:
+                return applied
+            self.database.setSyncCursor(self.user_id, next_cursor)
+            if not reply.get("more"):
+                return applied
+
+
+    def send(self, message: Dict) -> Dict:
+        """Encodes a message, exchanges it over the transport and decodes the reply."""
+        payload = zlib.compress(json.dumps(message, separators=(",", ":")).encode("utf-8"))
+        reply = json.loads(zlib.decompress(self.transport.exchange(payload)).decode("utf-8"))
+        if not isinstance(reply, dict):
+            raise SyncError("Malformed reply from sync server")
+        return reply
@@ -0,0 +1,193 @@
+import random
+import time
+
+from database_manager import DatabaseManager
+from database_worker import DatabaseWorker
+from notification_handler import NotificationHandler
+from sync_engine import SyncEngine
+
+from PySide6.QtCore import (
+    Qt,
+    QObject,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QGuiApplication
+
+
+class SyncScheduler(QObject):
+    """
+    Runs a SyncEngine in the background: a few seconds after local edits settle,
+    periodically to pick up server changes, and on demand.
+    Syncs run on a dedicated worker thread, failed ones are retried with exponential
+    backoff, and nothing is scheduled while the application is inactive or minimized.
+    """
+    DEBOUNCE_MS = 5 * 1000
+    # Continuous editing postpones the debounced sync by at most this long after the first edit
+    DEBOUNCE_MAX_WAIT_MS = 30 * 1000
+    PERIODIC_INTERVAL_MS = 5 * 60 * 1000
+    BACKOFF_BASE_MS = 10 * 1000
+    BACKOFF_MAX_MS = 15 * 60 * 1000
+
+    changes_detected = Signal(str)   # emitted on whichever thread edited the database
+    state_changed = Signal(str)      # "idle", "syncing", "backing_off" or "paused"
+    synced = Signal(dict)            # report of every successful sync
+
+    def __init__(self, engine: SyncEngine, database: DatabaseManager,
+                 notification_handler: NotificationHandler, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.database = database
+        self.notification_handler = notification_handler
+        self.sync_worker = DatabaseWorker(self)
+
+        self.state = "idle"
+        self.failures = 0
+        self.syncing = False
+        self.paused = False
+        self.dirty = False           # local edits not yet covered by a started sync
+        self.first_change_at = None  # time.monotonic() of the oldest of those edits
+        self.manual = False          # the running sync was requested by the user
+
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setSingleShot(True)
+        self.sync_timer.timeout.connect(self.runSync)
+
+        self.periodic_timer = QTimer(self)
+        self.periodic_timer.setInterval(SyncScheduler.PERIODIC_INTERVAL_MS)
+        self.periodic_timer.timeout.connect(lambda: self.schedule(0))
+
+        # The listener fires on worker threads; the cross-thread emit is queued to this object's thread
+        self.changes_detected.connect(self.onLocalChange)
+        self.change_listener = self.changes_detected.emit
+
+
+    def start(self):
+        self.database.addChangeListener(self.change_listener)
+        QGuiApplication.instance().applicationStateChanged.connect(self.onApplicationStateChanged)
+        self.dirty = True
+        self.onApplicationStateChanged(QGuiApplication.applicationState())
+
+
+    def stop(self):
+        """Stops scheduling and waits for a running sync to finish."""
+        self.database.removeChangeListener(self.change_listener)
+        QGuiApplication.instance().applicationStateChanged.disconnect(self.onApplicationStateChanged)
+        self.sync_timer.stop()
+        self.periodic_timer.stop()
+        self.sync_worker.stop()
+
+
+    def syncNow(self):
+        """Runs a sync as soon as possible and reports its outcome, skipping any backoff delay."""
+        self.manual = True
+        if self.syncing:
+            self.dirty = True
+            return
+        self.sync_timer.stop()
+        self.runSync()
+
+
+    def onLocalChange(self, table: str):
+        self.dirty = True
+        now = time.monotonic()
+        if self.first_change_at is None:
+            self.first_change_at = now
+        # While backing off the retry timer is already armed; edits join that attempt
+        if self.failures == 0:
+            max_wait_left = SyncScheduler.DEBOUNCE_MAX_WAIT_MS - int((now - self.first_change_at) * 1000)
+            self.schedule(max(0, min(SyncScheduler.DEBOUNCE_MS, max_wait_left)))
+
+
+    def schedule(self, delay_ms: int):
+        """(Re)starts the sync timer; repeated calls within the delay coalesce into one sync."""
+        if self.paused or self.syncing:
+            return
+        self.sync_timer.start(delay_ms)
+
+
+    def runSync(self):
+        if self.syncing or (self.paused and not self.manual):
+            return
+
+        self.syncing = True
+        self.dirty = False
+        self.first_change_at = None
+        self.setState("syncing")
+        request = self.sync_worker.submit(self.engine.sync)
+        request.finished.connect(self.onSyncFinished)
+        request.failed.connect(lambda _: self.onSyncFinished({"ok": False}))
+
+
+    def onSyncFinished(self, report: dict):
+        self.syncing = False
+        manual, self.manual = self.manual, False
+
+        if not report.get("ok"):
+            self.failures += 1
+            # One toast per failure streak; background retries stay quiet
+            if self.failures == 1 or manual:
+                self.notification_handler.showToast(
+                    "bottom_right", "Sync Failed",
+                    "Couldn't reach the server. Your changes are kept and will be retried.", "error"
+                )
+            self.setState("backing_off")
+            if not self.paused:
+                self.sync_timer.start(self.backoffDelay())
+            return
+
+        if self.failures or manual:
+            self.notification_handler.showToast(
+                "bottom_right", "Synced", "Your data is up to date.", "success"
+            )
+        self.failures = 0
+        self.setState("paused" if self.paused else "idle")
+        self.synced.emit(report)
+
+        # Edits made while the sync was running still need to go out
+        if self.dirty:
+            self.schedule(SyncScheduler.DEBOUNCE_MS)
+
+
+    def backoffDelay(self) -> int:
+        """Exponential delay for the current failure streak, with jitter so clients don't retry in step."""
+        delay = min(SyncScheduler.BACKOFF_MAX_MS, SyncScheduler.BACKOFF_BASE_MS * 2 ** (self.failures - 1))
+        return int(delay * random.uniform(0.8, 1.2))
+
+
+    def onApplicationStateChanged(self, state):
+        if state == Qt.ApplicationState.ApplicationActive:
+            self.resume()
+        else:
+            self.pause()
+
+
+    def pause(self):
+        """Stops the timers while the window is minimized or in the background."""
+        if self.paused:
+            return
+        self.paused = True
+        self.dirty = self.dirty or self.sync_timer.isActive()
+        self.sync_timer.stop()
+        self.periodic_timer.stop()
+        if not self.syncing:
+            self.setState("paused")
+
+
+    def resume(self):
+        self.paused = False
+        self.periodic_timer.start()
+        if self.failures:
+            self.setState("backing_off")
+            self.sync_timer.start(self.backoffDelay())
+        elif self.dirty:
+            self.setState("idle")
+            self.schedule(SyncScheduler.DEBOUNCE_MS)
+        elif not self.syncing:
+            self.setState("idle")
+
+
+    def setState(self, state: str):
+        if state != self.state:
+            self.state = state
+            self.state_changed.emit(state)
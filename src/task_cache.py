@@ -0,0 +1,232 @@
+import threading
+from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+
+from database_manager import DatabaseManager
+
+
+class TaskCache:
+    """
+    Month-window cache of a user's tasks, sitting in front of DatabaseManager.
+    A whole month is loaded with one range query, so moving between days of a
+    loaded month costs no SQL. Neighbouring months are prefetched in the background,
+    and task mutations go through this class so the cached rows stay exact.
+    """
+    PREFETCH_RADIUS = 1   # months on each side of the active month
+
+    def __init__(self, database: DatabaseManager, user_id: int):
+        self.database = database
+        self.user_id = user_id
+
+        # "YYYY-MM" -> {"YYYY-MM-DD": [task rows]}
+        self._months = {}
+        # local_id -> "YYYY-MM-DD" of every cached task, used for targeted updates
+        self._task_dates = {}
+        # "YYYY-MM" -> counter bumped on every mutation, so stale prefetches are discarded
+        self._generations = {}
+        self._pending = {}
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="TaskPrefetch")
+
+
+    def getTasksByDate(self, date: str) -> List[Dict]:
+        """Returns copies of the tasks for an ISO date, loading its month on a miss."""
+        month_key = self.monthKey(date)
+        month = self.getMonth(month_key)
+        self.prefetchAround(month_key)
+        with self._lock:
+            return [dict(row) for row in month.get(date, [])]
+
+
+    def peekTasksByDate(self, date: str) -> Optional[List[Dict]]:
+        """Returns copies of the tasks for an ISO date if its month is cached, otherwise None. Never runs SQL."""
+        month_key = self.monthKey(date)
+        with self._lock:
+            month = self._months.get(month_key)
+            if month is None:
+                return None
+            tasks = [dict(row) for row in month.get(date, [])]
+        self.prefetchAround(month_key)
+        return tasks
+
+
+    def getMonth(self, month_key: str) -> Dict:
+        """Returns the cached month, waiting on an in-flight prefetch or loading it synchronously."""
+        waited = None
+        while True:
+            with self._lock:
+                month = self._months.get(month_key)
+                pending = self._pending.get(month_key)
+            if month is not None:
+                return month
+
+            if pending is not None and pending is not waited:
+                pending.result()
+                waited = pending
+                continue
+
+            month = self.loadMonth(month_key)
+            if month is not None:
+                return month
+            # A mutation landed during the read and discarded it, so read the month again
+
+
+    def loadMonth(self, month_key: str) -> Optional[Dict]:
+        """
+        Reads one month of tasks and installs it unless it was mutated during the read.
+        Returns the installed month, or None when the read was discarded.
+        """
+        with self._lock:
+            generation = self._generations.get(month_key, 0)
+
+        start, end = self.monthBounds(month_key)
+        rows = self.database.getTasksInRange(self.user_id, start, end)
+
+        month = {}
+        for row in rows:
+            month.setdefault(row.get("date_time"), []).append(row)
+
+        with self._lock:
+            if self._generations.get(month_key, 0) != generation:
+                return None
+            self._months[month_key] = month
+            for row in rows:
+                self._task_dates[row.get("local_id")] = row.get("date_time")
+        return month
+
+
+    def prefetchAround(self, month_key: str):
+        """Schedules background loads for the months next to month_key."""
+        year, month = (int(part) for part in month_key.split("-"))
+        for offset in range(-TaskCache.PREFETCH_RADIUS, TaskCache.PREFETCH_RADIUS + 1):
+            if offset == 0:
+                continue
+            neighbour = self.shiftMonth(year, month, offset)
+            with self._lock:
+                if neighbour in self._months or neighbour in self._pending:
+                    continue
+                future = self._executor.submit(self.loadMonth, neighbour)
+                self._pending[neighbour] = future
+            future.add_done_callback(lambda _, key=neighbour: self.clearPending(key))
+
+
+    def clearPending(self, month_key: str):
+        with self._lock:
+            self._pending.pop(month_key, None)
+
+
+    # ==================== MUTATIONS ====================
+
+    def addTask(self, title: str, description: str = None, priority: int = 1,
+                date_time: str = None, tag_id: str = None) -> Optional[str]:
+        """Saves a task and appends it to the cached day. Returns the new local_id."""
+        local_id = self.database.addTask(title, self.user_id, description, priority, date_time, tag_id)
+        if not local_id or not date_time:
+            return local_id
+
+        row = {
+            "local_id": local_id,
+            "server_id": None,
+            "user_id": self.user_id,
+            "title": title,
+            "is_complete": 0,
+            "description": description,
+            "priority": priority,
+            "date_time": date_time,
+            "tag_id": tag_id,
+            "needs_sync": 1,
+            "deleted_at": None,
+        }
+        with self._lock:
+            month_key = self.monthKey(date_time)
+            self.bumpGeneration(month_key)
+            month = self._months.get(month_key)
+            if month is not None:
+                month.setdefault(date_time, []).append(row)
+                self._task_dates[local_id] = date_time
+        return local_id
+
+
+    def toggleTask(self, task_id: str, value: bool) -> bool:
+        status = self.database.toggleTask(task_id, value)
+        if status:
+            self.patchTask(task_id, {"is_complete": int(value)})
+        return status
+
+
+    def updateTask(self, local_id: str, **kwargs) -> bool:
+        # Only what the database wrote, so keys it ignores never reach the cached row
+        written = self.database.updateTaskFields(local_id, **kwargs)
+        if written is None:
+            return False
+        self.patchTask(local_id, written)
+        return True
+
+
+    def deleteTask(self, local_id: str) -> bool:
+        status = self.database.deleteTask(local_id)
+        if status:
+            with self._lock:
+                date = self._task_dates.pop(local_id, None)
+                if date is not None:
+                    month_key = self.monthKey(date)
+                    self.bumpGeneration(month_key)
+                    rows = self._months.get(month_key, {}).get(date, [])
+                    rows[:] = [row for row in rows if row.get("local_id") != local_id]
+        return status
+
+
+    def patchTask(self, local_id: str, fields: dict):
+        """Applies changed columns to the cached copy of a task."""
+        with self._lock:
+            date = self._task_dates.get(local_id)
+            if date is None:
+                return
+            month_key = self.monthKey(date)
+            self.bumpGeneration(month_key)
+            for row in self._months.get(month_key, {}).get(date, []):
+                if row.get("local_id") == local_id:
+                    row.update(fields)
+                    break
+
+
+    def bumpGeneration(self, month_key: str):
+        self._generations[month_key] = self._generations.get(month_key, 0) + 1
+
+
+    def invalidate(self):
+        """Drops every cached month; the next read reloads from the database."""
+        with self._lock:
+            for month_key in list(self._months) + list(self._pending):
+                self.bumpGeneration(month_key)
+            self._months.clear()
+            self._task_dates.clear()
+
+
+    def close(self):
+        """Stops the prefetch thread without waiting for queued loads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+    # ==================== HELPERS ====================
+
+    @staticmethod
+    def monthKey(date: str) -> str:
+        """Maps an ISO date ("YYYY-MM-DD") to its month key ("YYYY-MM")."""
+        return date[:7]
+
+
+    @staticmethod
+    def monthBounds(month_key: str) -> tuple:
+        """Returns the first and last ISO dates of a month key."""
+        year, month = (int(part) for part in month_key.split("-"))
+        last_day = monthrange(year, month)[1]
+        return f"{month_key}-01", f"{month_key}-{last_day:02d}"
+
+
+    @staticmethod
+    def shiftMonth(year: int, month: int, offset: int) -> str:
+        """Returns the month key offset months away from year/month."""
+        index = year * 12 + (month - 1) + offset
+        return f"{index // 12:04d}-{index % 12 + 1:02d}"
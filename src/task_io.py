@@ -0,0 +1,82 @@
+import csv
+import json
+from typing import Iterator, Dict
+
+from database_manager import DatabaseManager
+
+
+class TaskTransfer:
+    """
+    Imports and exports a user's tasks as CSV or JSON Lines.
+    Every method streams rows between the file and DatabaseManager's bulk APIs,
+    so memory use does not grow with the number of tasks.
+    """
+    FIELDS = ["local_id", "title", "description", "priority", "is_complete", "date_time"]
+    TRUE_VALUES = {"1", "true", "yes", "done", "x"}
+
+    def __init__(self, database: DatabaseManager):
+        self.database = database
+
+
+    def exportCsv(self, user_id: int, path: str) -> int:
+        """Writes the user's active tasks to a CSV file. Returns the number of rows written."""
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=TaskTransfer.FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for task in self.database.iterTasks(user_id):
+                writer.writerow(task)
+                count += 1
+        return count
+
+
+    def importCsv(self, user_id: int, path: str) -> int:
+        """Reads tasks from a CSV file with a header row. Returns the number of tasks inserted."""
+        with open(path, newline="", encoding="utf-8") as file:
+            return self.database.addTasksBulk(user_id, self.normalizeRows(csv.DictReader(file)))
+
+
+    def exportJsonl(self, user_id: int, path: str) -> int:
+        """Writes the user's active tasks as one JSON object per line. Returns the number of rows written."""
+        count = 0
+        with open(path, "w", encoding="utf-8") as file:
+            for task in self.database.iterTasks(user_id):
+                record = {field: task.get(field) for field in TaskTransfer.FIELDS}
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+        return count
+
+
+    def importJsonl(self, user_id: int, path: str) -> int:
+        """Reads tasks from a JSON Lines file. Returns the number of tasks inserted."""
+        with open(path, encoding="utf-8") as file:
+            records = (json.loads(line) for line in file if line.strip())
+            return self.database.addTasksBulk(user_id, self.normalizeRows(records))
+
+
+    def normalizeRows(self, rows) -> Iterator[Dict]:
+        """Converts loosely typed records (all strings in CSV) into task dicts, skipping untitled rows."""
+        for row in rows:
+            title = (row.get("title") or "").strip()
+            if not title:
+                continue
+
+            yield {
+                "local_id": (row.get("local_id") or "").strip() or None,
+                "title": title,
+                "description": (row.get("description") or "").strip() or None,
+                "priority": self.parsePriority(row.get("priority")),
+                "is_complete": int(str(row.get("is_complete") or "").strip().lower() in TaskTransfer.TRUE_VALUES),
+                "date_time": (row.get("date_time") or "").strip() or None,
+            }
+
+
+    def parsePriority(self, value) -> int:
+        """Accepts 0-2 or Low/Medium/High; anything else falls back to Medium."""
+        names = {"low": 0, "medium": 1, "high": 2}
+        text = str(value if value is not None else "").strip().lower()
+        if text in names:
+            return names[text]
+        if text in {"0", "1", "2"}:
+            return int(text)
+        return 1
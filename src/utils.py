@@ -21,3 +21,18 @@ def loadFont(font_path: str):
 
     # Return the primary font family name (e.g., "Nunito" or "Vazirmatn")
     return font_families[0]
+
+
+def setDynamicProperty(widget, name: str, value):
+    """
+    Sets a dynamic property used by QSS attribute selectors (e.g. [priority="High"])
+    and re-polishes only that widget, instead of re-applying the whole stylesheet.
+    """
+    if widget.property(name) == value:
+        return
+
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
@@ -5,22 +5,40 @@ from PySide6.QtWidgets import (
     QPushButton,
     QLineEdit,
     QLabel,
+    QProgressBar,
     QCalendarWidget,
-    QApplication
+    QApplication,
+    QStyledItemDelegate,
+    QStyle,
 )
 from PySide6.QtGui import (
     QIcon,
     QColor,
     QTextCharFormat,
-    QBrush,
+    QFont,
+    QFontInfo,
+    QFontMetrics,
+    QPainter,
+    QPen,
+    QCursor,
+    QPixmap,
+    QRegion,
 )
 from PySide6.QtCore import (
     QSize,
     QMargins,
     Signal,
     Qt,
-    QDate
+    QDate,
+    QRect,
+    QPoint,
+    QEvent,
+    QModelIndex,
+    QPersistentModelIndex,
+    QAbstractListModel,
+    QAbstractTableModel,
 )
+from utils import setDynamicProperty
 
 
 class RadioButton(QPushButton):
@@ -108,6 +126,50 @@ class PasswordField(QWidget):
             self.toggle_button.setIcon(self.eye_open_icon)
 
 
+class PasswordStrengthMeter(QWidget):
+    """
+    Bar and caption showing a zxcvbn result (see PasswordStrengthEvaluator).
+    The bar's "strength" property (0-4) lets the stylesheet color it.
+    """
+    LABELS = ("Very weak", "Weak", "Fair", "Strong", "Very strong")
+    BAR_HEIGHT = 6
+    CONTENTS_MARGINS_SIZE = QMargins(0, 0, 0, 0)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.bar = QProgressBar(self)
+        self.bar.setRange(0, len(PasswordStrengthMeter.LABELS))
+        self.bar.setTextVisible(False)
+        self.bar.setFixedHeight(PasswordStrengthMeter.BAR_HEIGHT)
+
+        self.caption = QLabel(self)
+        self.caption.setWordWrap(True)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(PasswordStrengthMeter.CONTENTS_MARGINS_SIZE)
+        layout.addWidget(self.bar)
+        layout.addWidget(self.caption)
+        self.setStrength(None)
+
+
+    def setStrength(self, result: dict):
+        """Shows a result dict with "score" and "warning", or clears the meter for None."""
+        if result is None:
+            self.bar.setValue(0)
+            setDynamicProperty(self.bar, "strength", "")
+            self.caption.clear()
+            return
+
+        score = result.get("score")
+        # Even a score of 0 fills one segment, so the bar visibly reacts to typing
+        self.bar.setValue(score + 1)
+        setDynamicProperty(self.bar, "strength", str(score))
+        warning = result.get("warning")
+        label = PasswordStrengthMeter.LABELS[score]
+        self.caption.setText(f"{label}: {warning}" if warning else label)
+
+
 class ClickableLabel(QLabel):
     """A QLabel that behaves like a button, emitting a clicked signal."""
     clicked = Signal()
@@ -210,124 +272,479 @@ class AccountListItemWidget(QWidget):
         return account_row.get("user_id") is not None
 
 
-class TaskListItemWidget(QWidget):
+class TaskListModel(QAbstractListModel):
+    """List model holding the task rows (dicts) of the active day."""
+    TaskRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tasks = []
+
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.tasks)
+
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        task = self.tasks[index.row()]
+        if role == Qt.DisplayRole:
+            return task.get("title")
+        if role == TaskListModel.TaskRole:
+            return task
+        return None
+
+
+    def setTasks(self, tasks: list):
+        """Replaces all rows at once."""
+        self.beginResetModel()
+        self.tasks = list(tasks)
+        self.endResetModel()
+
+
+    def appendTask(self, task: dict):
+        row = len(self.tasks)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.tasks.append(task)
+        self.endInsertRows()
+
+
+    def appendTasks(self, tasks: list):
+        """Adds several rows at the end, e.g. the next page of search results."""
+        if not tasks:
+            return
+        row = len(self.tasks)
+        self.beginInsertRows(QModelIndex(), row, row + len(tasks) - 1)
+        self.tasks.extend(tasks)
+        self.endInsertRows()
+
+
+    def removeTask(self, index):
+        """Removes the row at index (a QModelIndex or QPersistentModelIndex)."""
+        if not index.isValid():
+            return
+        row = index.row()
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.tasks[row]
+        self.endRemoveRows()
+
+
+    def updateTask(self, index, fields: dict):
+        """Merges fields into one row and repaints only that row."""
+        if not index.isValid():
+            return
+        self.tasks[index.row()].update(fields)
+        model_index = self.index(index.row())
+        self.dataChanged.emit(model_index, model_index)
+
+
+    def indexOf(self, local_id: str) -> QModelIndex:
+        for row, task in enumerate(self.tasks):
+            if task.get("local_id") == local_id:
+                return self.index(row)
+        return QModelIndex()
+
+
+class TaskItemDelegate(QStyledItemDelegate):
     """
-    Custom widget for Task items. 
-    Includes a completion check, priority badge, and edit button.
+    Paints a task row (completion check, title, priority badge, description and
+    edit button) directly, so no per-row widgets are created. Clicks on the check
+    box and the edit button are hit-tested here and reported through signals.
     """
-    on_check_button_clicked = Signal(object, str, int)
-    on_edit_button_clicked = Signal(object, dict)
+    check_clicked = Signal(object, str, int)
+    edit_clicked = Signal(object, dict)
 
     CONTENTS_MARGINS_SIZE = QMargins(20, 20, 20, 20)
     SPACING_SIZE = 15
-    STRETCH_SIZE = 1
+    LINE_SPACING_SIZE = 6
+    CHECK_BOX_SIZE = QSize(25, 25)
+    BADGE_SIZE = QSize(70, 30)
+    EDIT_BUTTON_SIZE = QSize(30, 30)
+    EDIT_ICON_SIZE = QSize(16, 16)
+
+    # Sizes at a scale factor of 1; the description uses the view font, which the
+    # QSS sets to DESC_FONT_PX and StyleSheetHandler scales with the window
+    TITLE_FONT_PX = 18
+    DESC_FONT_PX = 15
+    TEXT_COLOR = QColor("#ffffff")
+
+    PRIORITY_LABELS = {
+        0: "Low",
+        1: "Medium",
+        2: "High"
+    }
 
-    def __init__(self, task_details: dict, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
+        self.edit_icon = QIcon(":/icons/edit.svg")
+        # Priority text -> hidden QLabel styled by the QSS badge rules
+        self.badge_stamps = {}
+        # (priority text, device pixel ratio) -> the stamp rendered once, drawn into every row
+        self.badge_pixmaps = {}
+
+
+    def fonts(self, option):
+        """Returns the (title, description) fonts derived from the view font."""
+        desc_px = QFontInfo(option.font).pixelSize() or TaskItemDelegate.DESC_FONT_PX
+        desc_font = QFont(option.font)
+        desc_font.setPixelSize(desc_px)
+
+        title_font = QFont(option.font)
+        title_font.setPixelSize(round(desc_px * TaskItemDelegate.TITLE_FONT_PX / TaskItemDelegate.DESC_FONT_PX))
+        title_font.setWeight(QFont.DemiBold)
+        return title_font, desc_font
+
+
+    def itemLayout(self, option, task: dict) -> dict:
+        """Computes the rectangles of every part of a row; shared by painting and hit-testing."""
+        title_font, desc_font = self.fonts(option)
+        content = option.rect.marginsRemoved(TaskItemDelegate.CONTENTS_MARGINS_SIZE)
+        first_line_height = max(TaskItemDelegate.CHECK_BOX_SIZE.height(), TaskItemDelegate.BADGE_SIZE.height())
+
+        edit_rect = QRect(QPoint(0, 0), TaskItemDelegate.EDIT_BUTTON_SIZE)
+        edit_rect.moveCenter(QPoint(content.right() - edit_rect.width() // 2, content.center().y()))
+        text_right = edit_rect.left() - TaskItemDelegate.SPACING_SIZE
+
+        check_rect = QRect(QPoint(0, 0), TaskItemDelegate.CHECK_BOX_SIZE)
+        check_rect.moveCenter(QPoint(content.left() + check_rect.width() // 2,
+                                     content.top() + first_line_height // 2))
+
+        title_left = check_rect.right() + TaskItemDelegate.SPACING_SIZE
+        badge_space = TaskItemDelegate.BADGE_SIZE.width() + TaskItemDelegate.SPACING_SIZE
+        title_width = min(QFontMetrics(title_font).horizontalAdvance(task.get("title") or ""),
+                          max(0, text_right - title_left - badge_space))
+        title_rect = QRect(title_left, content.top(), title_width, first_line_height)
+
+        badge_rect = QRect(QPoint(0, 0), TaskItemDelegate.BADGE_SIZE)
+        badge_rect.moveCenter(QPoint(title_rect.right() + TaskItemDelegate.SPACING_SIZE + badge_rect.width() // 2,
+                                     title_rect.center().y()))
+
+        desc_top = content.top() + first_line_height + TaskItemDelegate.LINE_SPACING_SIZE
+        desc_rect = QRect(content.left(), desc_top, max(0, text_right - content.left()),
+                          QFontMetrics(desc_font).height())
+
+        return {
+            "check": check_rect,
+            "title": title_rect,
+            "badge": badge_rect,
+            "desc": desc_rect,
+            "edit": edit_rect,
+        }
 
-        self.task_details = task_details
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(TaskListItemWidget.CONTENTS_MARGINS_SIZE)
-        layout.setSpacing(TaskListItemWidget.SPACING_SIZE)
 
-        desc_and_title_layout = QVBoxLayout()
-        text_and_check_box_layout = QHBoxLayout()
+    def sizeHint(self, option, index):
+        _, desc_font = self.fonts(option)
+        margins = TaskItemDelegate.CONTENTS_MARGINS_SIZE
+        first_line_height = max(TaskItemDelegate.CHECK_BOX_SIZE.height(), TaskItemDelegate.BADGE_SIZE.height())
+        height = (margins.top() + first_line_height + TaskItemDelegate.LINE_SPACING_SIZE
+                  + QFontMetrics(desc_font).height() + margins.bottom())
+        return QSize(option.rect.width(), height)
+
+
+    def paint(self, painter, option, index):
+        task = index.data(TaskListModel.TaskRole)
+        if task is None:
+            return
+
+        title_font, desc_font = self.fonts(option)
+        rects = self.itemLayout(option, task)
+        is_complete = bool(task.get("is_complete"))
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Row background, border and hover state still come from the QListView::item QSS rules
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+
+        # Completion check box
+        painter.setPen(QPen(TaskItemDelegate.TEXT_COLOR, 2))
+        painter.setBrush(TaskItemDelegate.TEXT_COLOR if is_complete else Qt.NoBrush)
+        painter.drawRoundedRect(rects["check"].adjusted(1, 1, -1, -1), 5, 5)
+
+        # Title, struck out once the task is complete
+        title_font.setStrikeOut(is_complete)
+        painter.setFont(title_font)
+        painter.setPen(TaskItemDelegate.TEXT_COLOR)
+        title = QFontMetrics(title_font).elidedText(task.get("title") or "", Qt.ElideRight, rects["title"].width())
+        painter.drawText(rects["title"], Qt.AlignLeft | Qt.AlignVCenter, title)
+
+        # Priority badge, colored by the QLabel#PriorityBadge[priority=...] QSS rules
+        label = TaskItemDelegate.PRIORITY_LABELS.get(task.get("priority"), "unknown")
+        painter.drawPixmap(rects["badge"].topLeft(), self.badgePixmap(label, option.widget))
+
+        # Description
+        painter.setFont(desc_font)
+        painter.setPen(TaskItemDelegate.TEXT_COLOR)
+        description = QFontMetrics(desc_font).elidedText(task.get("description") or "", Qt.ElideRight,
+                                                          rects["desc"].width())
+        painter.drawText(rects["desc"], Qt.AlignLeft | Qt.AlignVCenter, description)
+
+        # Edit button, outlined while hovered
+        cursor_position = option.widget.viewport().mapFromGlobal(QCursor.pos()) if option.widget else QPoint(-1, -1)
+        if option.state & QStyle.State_MouseOver and rects["edit"].contains(cursor_position):
+            painter.setPen(TaskItemDelegate.TEXT_COLOR)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(rects["edit"].adjusted(0, 0, -1, -1), 5, 5)
+        icon_rect = QRect(QPoint(0, 0), TaskItemDelegate.EDIT_ICON_SIZE)
+        icon_rect.moveCenter(rects["edit"].center())
+        self.edit_icon.paint(painter, icon_rect)
+
+        painter.restore()
+
+
+    def badgePixmap(self, label: str, widget: QWidget) -> QPixmap:
+        """
+        Returns the badge of one priority as a pixmap, rendering its stamp on first use.
+        Rows only draw the pixmap; it is rendered again after the stylesheet changes.
+        """
+        ratio = widget.devicePixelRatioF() if widget else 1.0
+        pixmap = self.badge_pixmaps.get((label, ratio))
+        if pixmap is None:
+            pixmap = QPixmap(TaskItemDelegate.BADGE_SIZE * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            # Without DrawWindowBackground, so the corners outside the rounded badge stay transparent
+            self.badgeStamp(label, widget).render(pixmap, QPoint(), QRegion(), QWidget.RenderFlag.DrawChildren)
+            self.badge_pixmaps[(label, ratio)] = pixmap
+        return pixmap
+
+
+    def badgeStamp(self, label: str, parent: QWidget) -> QLabel:
+        """Returns the hidden badge label for one priority, creating it on first use."""
+        stamp = self.badge_stamps.get(label)
+        if stamp is None:
+            stamp = QLabel(label, parent)
+            stamp.setObjectName("PriorityBadge")
+            stamp.setAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignVCenter)
+            stamp.setFixedSize(TaskItemDelegate.BADGE_SIZE)
+            stamp.setMargin(5)
+            stamp.hide()
+            setDynamicProperty(stamp, "priority", label)
+            # Restyling the window sends the stamp a StyleChange; its pixmaps are stale from then on
+            stamp.installEventFilter(self)
+            self.badge_stamps[label] = stamp
+        return stamp
+
+
+    def eventFilter(self, watched, event):
+        if event.type() in (QEvent.StyleChange, QEvent.FontChange) and watched in self.badge_stamps.values():
+            self.badge_pixmaps.clear()
+        return super().eventFilter(watched, event)
+
+
+    def editorEvent(self, event, model, option, index):
+        """Hit-tests clicks against the check box and edit button of the row."""
+        task = index.data(TaskListModel.TaskRole)
+        if task is None:
+            return False
+
+        rects = self.itemLayout(option, task)
+        if event.type() == QEvent.MouseMove:
+            # Pointing hand over the clickable parts, like PushButton
+            on_button = any(rects[name].contains(event.position().toPoint()) for name in ("check", "edit"))
+            if option.widget:
+                option.widget.viewport().setCursor(Qt.PointingHandCursor if on_button else Qt.ArrowCursor)
+                # Repaint just this row so the edit button hover outline follows the cursor
+                option.widget.viewport().update(option.rect)
+            return False
+
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            position = event.position().toPoint()
+            persistent_index = QPersistentModelIndex(index)
+            if rects["check"].contains(position):
+                self.check_clicked.emit(persistent_index, task.get("local_id"), int(not task.get("is_complete")))
+                return True
+            if rects["edit"].contains(position):
+                self.edit_clicked.emit(persistent_index, dict(task))
+                return True
+        return False
+
+
+class HabitTableModel(QAbstractTableModel):
+    """
+    Habits as rows and days as columns, newest day first.
+    Older days are appended on the right by appendDays() as the grid is scrolled,
+    so a model only ever holds the columns that have been loaded.
+    """
+    HabitRole = Qt.UserRole + 1
+    # Habits with this unit are done / not done; any other unit counts an amount per day
+    BOOLEAN_UNIT = 0
 
-        # Check/Completion button
-        title_text = self.task_details.get("title")
-        description_text = self.task_details.get("description")
-        self.check_btn = PushButton(self)
-        self.check_btn.setObjectName("TaskButton")
-        self.check_btn.setCheckable(True)
-        self.check_btn.clicked.connect(self.checkBtnClicked)
-        self.check_btn.setFixedSize(25, 25)
+    value_edited = Signal(str, str, int)   # habit_id, ISO date, new value
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.habits = []
+        self.dates = []     # ISO dates, newest first
+        self.values = {}    # habit_id -> {ISO date: value}
+
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.habits)
+
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.dates)
+
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        habit = self.habits[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.values.get(habit.get("local_id"), {}).get(self.dates[index.column()], 0)
+        if role == HabitTableModel.HabitRole:
+            return habit
+        return None
+
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return QDate.fromString(self.dates[section], Qt.ISODate).toString("ddd\nd")
+        return self.habits[section].get("title")
+
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        # Yes/no habits are toggled by a click in the delegate; counted ones get a spin box editor
+        if self.isBoolean(self.habits[index.row()]):
+            return Qt.ItemIsEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        habit_id = self.habits[index.row()].get("local_id")
+        date = self.dates[index.column()]
+        value = int(value)
+        if self.values.get(habit_id, {}).get(date, 0) == value:
+            return False
+
+        self.values.setdefault(habit_id, {})[date] = value
+        self.dataChanged.emit(index, index)
+        self.value_edited.emit(habit_id, date, value)
+        return True
+
+
+    def setHabits(self, habits: list):
+        self.beginResetModel()
+        self.habits = list(habits)
+        self.endResetModel()
+
+
+    def appendDays(self, dates: list, values: dict):
+        """Adds older day columns on the right together with their {habit_id: {date: value}}."""
+        if not dates:
+            return
+        first = len(self.dates)
+        self.beginInsertColumns(QModelIndex(), first, first + len(dates) - 1)
+        self.dates.extend(dates)
+        for habit_id, days in values.items():
+            self.values.setdefault(habit_id, {}).update(days)
+        self.endInsertColumns()
 
-        self.title_label = QLabel(title_text, self)
-        self.title_label.setObjectName("TaskTitle")
-
-        # Priority Badge
-        task_prio = self.task_details.get("priority")
-        self.priority_label_text = self.getPriorityText(task_prio)
-        self.priority_label_obj_name = self.getPriorityText(task_prio) #"Low", "Medium", "High"
-        self.priority_type_lbl = QLabel(self.priority_label_text, self)
-        # The object name is used in QSS to color-code Low/Medium/High
-        self.priority_type_lbl.setObjectName(self.priority_label_obj_name)
-        self.priority_type_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignVCenter)
-        self.priority_type_lbl.setFixedSize(70, 30)
-        self.priority_type_lbl.setMargin(5)
-
-        self.desc_label = QLabel(description_text, self)
-        self.desc_label.setObjectName("TaskDesc")
-
-        self.edit_btn = PushButton(self)
-        self.edit_btn.setObjectName("EditButton")
-        self.edit_btn.setIcon(QIcon(":/icons/edit.svg"))
-        self.edit_btn.clicked.connect(lambda: self.on_edit_button_clicked.emit(self, self.task_details))
-        self.edit_btn.setFixedSize(30, 30)
-
-        text_and_check_box_layout.addWidget(self.check_btn)
-        text_and_check_box_layout.addWidget(self.title_label)
-        text_and_check_box_layout.addWidget(self.priority_type_lbl)
-
-        desc_and_title_layout.addLayout(text_and_check_box_layout)
-        desc_and_title_layout.addWidget(self.desc_label)
-
-        layout.addLayout(desc_and_title_layout)
-        layout.addStretch(TaskListItemWidget.STRETCH_SIZE)
-        layout.addWidget(self.edit_btn)
-
-        # Initialize visual state if task is already complete
-        if self.task_details.get("is_complete"):
-            self.check_btn.setChecked(True)
-            self.toggleCheckedBtn()
-
-
-    def checkBtnClicked(self):
-        """Emits signal to update database and toggles visual strike-out."""
-        task_id = self.task_details.get("local_id")
-        btn_value = self.check_btn.isChecked()
-        self.on_check_button_clicked.emit(self, task_id, btn_value)
-
-
-    def update(self, priority, description, title):
-        """Updates internal data and UI labels after an edit."""
-        self.priority_type_lbl.setText(self.getPriorityText(priority))
-        self.priority_type_lbl.setObjectName(self.getPriorityText(priority))
-
-        # Refresh stylesheet to apply priority-based color change
-        self.window().style_sheet_handler.updateStylesheet()
-
-        self.desc_label.setText(description)
-        self.title_label.setText(title)
-        self.task_details.update({"priority": priority, "title": title, "description": description})
-        # self.task_details["priority"] = priority
-        # self.task_details["title"] = title
-        # self.task_details["description"] = description
-
-
-    def toggleCheckedBtn(self):
-        """Applies or removes strike-out font effect based on completion status."""
-        btn_font = self.title_label.font()
-        btn_font.setStrikeOut(self.check_btn.isChecked())
-        self.title_label.setFont(btn_font)
-
-
-    def getPriorityText(self, priority):
-        """Maps integer priority levels to display strings."""
-        mapping = {
-            0: "Low",
-            1: "Medium",
-            2: "High"
-        }
-        return mapping.get(priority, "unknown")
+
+    def replaceValues(self, values: dict):
+        """Swaps in freshly read values for the loaded days, e.g. after a failed save."""
+        self.values = values
+        if self.habits and self.dates:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.habits) - 1, len(self.dates) - 1))
+
+
+    def isBoolean(self, habit: dict) -> bool:
+        return habit.get("unit") == HabitTableModel.BOOLEAN_UNIT
+
+
+class HabitItemDelegate(QStyledItemDelegate):
+    """
+    Paints one habit cell: a dot filled with the habit's color for yes/no habits,
+    or the counted amount. Everything paint() needs is prepared up front and colors
+    are cached per habit, so scrolling a year of cells allocates almost nothing.
+    """
+    DOT_SIZE = 18
+    EMPTY_COLOR = QColor("#3a3b41")
+    TEXT_COLOR = QColor("#ffffff")
+    DEFAULT_COLOR = QColor("#5865f2")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.colors = {}
+        self.empty_pen = QPen(HabitItemDelegate.EMPTY_COLOR, 2)
+
+
+    def habitColor(self, habit: dict) -> QColor:
+        name = habit.get("color") or ""
+        color = self.colors.get(name)
+        if color is None:
+            color = QColor(name)
+            if not color.isValid():
+                color = HabitItemDelegate.DEFAULT_COLOR
+            self.colors[name] = color
+        return color
+
+
+    def paint(self, painter, option, index):
+        habit = index.data(HabitTableModel.HabitRole)
+        if habit is None:
+            return
+        value = index.data(Qt.EditRole)
+        color = self.habitColor(habit)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        if habit.get("unit") == HabitTableModel.BOOLEAN_UNIT:
+            dot = QRect(0, 0, HabitItemDelegate.DOT_SIZE, HabitItemDelegate.DOT_SIZE)
+            dot.moveCenter(option.rect.center())
+            if value:
+                painter.setPen(Qt.NoPen)
+                painter.setBrush(color)
+            else:
+                painter.setPen(self.empty_pen)
+                painter.setBrush(Qt.NoBrush)
+            painter.drawEllipse(dot)
+        else:
+            painter.setPen(color if value else HabitItemDelegate.EMPTY_COLOR)
+            painter.drawText(option.rect, Qt.AlignCenter, str(value))
+
+        painter.restore()
+
+
+    def editorEvent(self, event, model, option, index):
+        """Toggles yes/no habits on click; counted habits fall through to the default editor."""
+        habit = index.data(HabitTableModel.HabitRole)
+        if habit is None or habit.get("unit") != HabitTableModel.BOOLEAN_UNIT:
+            return super().editorEvent(event, model, option, index)
+
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            model.setData(index, 0 if index.data(Qt.EditRole) else 1)
+            return True
+        return False
 
 
 class TaskCalendar(QCalendarWidget):
     """
     Customized calendar for task date selection.
-    Uses QTextCharFormat to highlight dates containing tasks.
+    Days are shaded as a heatmap of how many tasks they hold, with a tooltip of the total
+    and completed counts. Counts are requested one month at a time, only for pages that
+    are actually shown, and kept per month so task edits can adjust single days.
     """
     day_changed = Signal(object)
+    month_requested = Signal(int, int)   # year, month whose task counts are needed
+
+    # Minimum task count of each heat level and that level's shade, lightest first
+    HEAT_LEVELS = (
+        (1, QColor(88, 101, 242, 60)),
+        (3, QColor(88, 101, 242, 110)),
+        (6, QColor(88, 101, 242, 170)),
+        (10, QColor(88, 101, 242, 230)),
+    )
 
     def __init__(self, current_day: QDate, parent=None):
         super().__init__(parent)
@@ -339,18 +756,81 @@ class TaskCalendar(QCalendarWidget):
         self.setWindowFlags(Qt.Popup | Qt.FramelessWindowHint)
         self.setFocusPolicy(Qt.ClickFocus)
 
-        # Format for days with existing tasks
-        self.task_format = QTextCharFormat()
-        self.task_format.setBackground(QBrush(QColor("#2D2926")))
         self.normal_format = QTextCharFormat()
 
+        # (year, month) -> {ISO date: [total, completed]}
+        self.month_counts = {}
+        # (year, month) -> edit counter, so counts read before an edit are re-requested
+        self.generations = {}
+        self.pending_months = {}
+
         self.selectionChanged.connect(self.onSelectionChanged)
+        self.currentPageChanged.connect(self.ensureMonth)
+
+
+    def showEvent(self, event):
+        self.ensureMonth(self.yearShown(), self.monthShown())
+        super().showEvent(event)
+
+
+    def ensureMonth(self, year: int, month: int):
+        """Requests a month's task counts unless they are cached or already on their way."""
+        key = (year, month)
+        if key in self.month_counts or key in self.pending_months:
+            return
+        self.pending_months[key] = self.generations.get(key, 0)
+        self.month_requested.emit(year, month)
+
+
+    def setMonthCounts(self, year: int, month: int, counts: dict):
+        """Stores a month's {ISO date: count} and highlights its days with tasks."""
+        key = (year, month)
+        generation = self.pending_months.pop(key, None)
+        if generation is None:
+            return
+        if generation != self.generations.get(key, 0):
+            # A task changed while these counts were being read
+            self.ensureMonth(year, month)
+            return
+
+        self.month_counts[key] = {date: list(day_counts) for date, day_counts in counts.items()}
+        for date, (total, completed) in counts.items():
+            self.setDateTextFormat(QDate.fromString(date, Qt.ISODate), self.heatFormat(total, completed))
+
+
+    def monthFailed(self, year: int, month: int):
+        """Forgets a request whose read failed, so the month is requested again next time it is shown."""
+        self.pending_months.pop((year, month), None)
+
+
+    def adjustDateCount(self, date: QDate, total_delta: int, completed_delta: int = 0):
+        """Applies a task edit to one day's cached counts and reshades only that day."""
+        key = (date.year(), date.month())
+        self.generations[key] = self.generations.get(key, 0) + 1
+
+        counts = self.month_counts.get(key)
+        if counts is None:
+            return
+        iso_date = date.toString(Qt.ISODate)
+        total, completed = counts.get(iso_date, (0, 0))
+        total = max(0, total + total_delta)
+        completed = min(total, max(0, completed + completed_delta))
+        if total:
+            counts[iso_date] = [total, completed]
+            self.setDateTextFormat(date, self.heatFormat(total, completed))
+        else:
+            counts.pop(iso_date, None)
+            self.clearTaskColor(date)
 
 
-    def setTaskColor(self, dates_list: list):
-        """Applies task highlighting to specific dates."""
-        for date in dates_list:
-            self.setDateTextFormat(date, self.task_format)
+    def heatFormat(self, total: int, completed: int) -> QTextCharFormat:
+        """Returns the format of a day holding total tasks, completed of them done."""
+        text_format = QTextCharFormat()
+        for minimum, color in TaskCalendar.HEAT_LEVELS:
+            if total >= minimum:
+                text_format.setBackground(color)
+        text_format.setToolTip(f"{total} task{'s' if total != 1 else ''}, {completed} done")
+        return text_format
 
 
     def clearTaskColor(self, date: QDate):
@@ -358,6 +838,17 @@ class TaskCalendar(QCalendarWidget):
         self.setDateTextFormat(date, self.normal_format)
 
 
+    def invalidate(self):
+        """Forgets every cached month, e.g. after tasks were changed by a sync."""
+        for key in list(self.month_counts) + list(self.pending_months):
+            self.generations[key] = self.generations.get(key, 0) + 1
+        self.month_counts.clear()
+        # A null date clears the formats of every date
+        self.setDateTextFormat(QDate(), self.normal_format)
+        if self.isVisible():
+            self.ensureMonth(self.yearShown(), self.monthShown())
+
+
     def onSelectionChanged(self):
         """Emits the new date and hides the popup on selection."""
         self.day_changed.emit(self.selectedDate())
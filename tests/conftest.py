@@ -0,0 +1,31 @@
+import os
+import sys
+
+# The application runs from src/ with flat imports; mirror that for the tests
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pytest
+
+from database_manager import DatabaseManager
+
+
+@pytest.fixture
+def database(tmp_path):
+    """A file database with one offline user, so WAL and per-thread connections behave as in the app."""
+    database = DatabaseManager(str(tmp_path / "tasks.db"))
+    database.addOfflineUser("tester", "Test", "User")
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def user_id(database) -> int:
+    return database.getListOfUsers()[0]["id"]
+
+
+@pytest.fixture
+def memory_database():
+    """A fresh in-memory database, migrated from scratch."""
+    database = DatabaseManager(":memory:")
+    yield database
+    database.close()
@@ -0,0 +1,71 @@
+import sqlite3
+
+from database_manager import DatabaseManager
+
+
+def legacyDatabase(tmp_path) -> DatabaseManager:
+    """A database created before auto_vacuum=INCREMENTAL was enabled."""
+    path = str(tmp_path / "tasks.db")
+    DatabaseManager(path).close()
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA auto_vacuum = NONE")
+    conn.execute("VACUUM")
+    conn.close()
+    return DatabaseManager(path)
+
+
+def autoVacuumMode(database: DatabaseManager) -> int:
+    with database.getConnection() as conn:
+        return conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+
+def test_vacuum_never_rewrites_a_legacy_database_unless_asked(tmp_path):
+    database = legacyDatabase(tmp_path)
+    try:
+        report = database.compactTombstones(vacuum=True)
+        assert autoVacuumMode(database) == 0
+        assert report["pages_reclaimed"] == 0
+    finally:
+        database.close()
+
+
+def test_first_full_vacuum_of_a_legacy_database_reports_no_negative_reclaim(tmp_path):
+    database = legacyDatabase(tmp_path)
+    try:
+        report = database.compactTombstones(full_vacuum=True)
+        assert autoVacuumMode(database) == 2
+        assert report["pages_reclaimed"] == 0
+    finally:
+        database.close()
+
+
+def test_old_synced_tombstones_are_purged_in_batches(database, user_id):
+    old_synced = [database.addTask(f"old {i}", user_id, None, 1, "2026-01-01") for i in range(12)]
+    old_unsynced = [database.addTask(f"unsynced {i}", user_id, None, 1, "2026-01-01") for i in range(2)]
+    recent = [database.addTask(f"recent {i}", user_id, None, 1, "2026-01-01") for i in range(2)]
+    alive = database.addTask("alive", user_id, None, 1, "2026-01-01")
+    for local_id in old_synced + old_unsynced + recent:
+        database.deleteTask(local_id)
+
+    with database.getConnection() as conn:
+        conn.executemany("UPDATE tasks SET deleted_at = '2000-01-01 00:00:00' WHERE local_id = ?",
+                         [(local_id,) for local_id in old_synced + old_unsynced])
+        conn.executemany("UPDATE tasks SET needs_sync = 0 WHERE local_id = ?",
+                         [(local_id,) for local_id in old_synced + recent])
+
+    transaction = database.transaction
+    batches = []
+
+    def countedTransaction(*args, **kwargs):
+        batches.append(kwargs.get("immediate"))
+        return transaction(*args, **kwargs)
+
+    database.transaction = countedTransaction
+    report = database.compactTombstones(batch_size=5)
+
+    assert report["rows"]["tasks"] == 12
+    # 5 + 5 + 2 rows of tasks, and one empty batch for each other table
+    assert batches.count(True) == 3 + len(DatabaseManager.SYNC_TABLES) - 1
+    with database.getConnection() as conn:
+        remaining = {row[0] for row in conn.execute("SELECT local_id FROM tasks")}
+    assert remaining == set(old_unsynced + recent + [alive])
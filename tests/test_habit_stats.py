@@ -0,0 +1,15 @@
+def test_habit_pulled_from_the_server_gets_stats(database, user_id):
+    habit = {"local_id": "remote-habit", "title": "Read", "question": "Did you read?", "unit": 0,
+             "color": "#ffffff", "updated_at": "2026-01-01 10:00:00.000"}
+    day = {"habit_id": "remote-habit", "date": "2026-01-01", "value": 3,
+           "updated_at": "2026-01-01 10:00:00.000"}
+
+    assert database.applyRemoteChanges("habits", user_id, [habit]) == 1
+    assert database.getHabitStats(user_id)["remote-habit"]["total_value"] == 0
+    assert database.applyRemoteChanges("daily_habits", user_id, [day]) == 1
+
+    stats = database.getHabitStats(user_id)["remote-habit"]
+    assert stats["total_value"] == 3
+    assert stats["best_streak"] == 1
+    assert database.rebuildHabitStats(user_id) == {"rebuilt": 1, "mismatched": []}
+
@@ -0,0 +1,9 @@
+def test_hot_queries_use_indexes(memory_database):
+    assert memory_database.findUnindexedQueries() == []
+
+
+def test_dropped_index_is_reported_as_scan(memory_database):
+    with memory_database.getConnection() as conn:
+        conn.execute("DROP INDEX idx_tasks_user_day")
+    regressed = {step["query"] for step in memory_database.findUnindexedQueries()}
+    assert "tasks_by_date" in regressed
@@ -0,0 +1,23 @@
+def test_bulk_import_counts_only_inserted_tasks(database, user_id):
+    tasks = [{"title": f"task {i}", "description": "imported", "date_time": "2026-01-01"} for i in range(1200)]
+    assert database.addTasksBulk(user_id, tasks) == 1200
+    # Existing local_ids are skipped and not counted
+    existing = database.getTasksByDate("2026-01-01", user_id)[:10]
+    assert database.addTasksBulk(user_id, existing) == 0
+
+
+def test_remote_changes_count_only_written_rows(database, user_id):
+    row = {"local_id": "remote-1", "title": "from server", "description": "synced",
+           "date_time": "2026-01-01", "updated_at": "2026-01-01 10:00:00.000"}
+    assert database.applyRemoteChanges("tasks", user_id, [row]) == 1
+    # Not newer than the stored copy, so last-writer-wins leaves it alone
+    assert database.applyRemoteChanges("tasks", user_id, [row]) == 0
+    newer = {**row, "title": "edited on server", "updated_at": "2026-01-02 10:00:00.000"}
+    assert database.applyRemoteChanges("tasks", user_id, [newer]) == 1
+
+
+def test_mark_synced_counts_acknowledged_rows(database, user_id):
+    local_id = database.addTask("task", user_id, None, 1, "2026-01-01")
+    row = database.getDirtyRows("tasks", user_id, 0, 10)[0]
+    acks = [{"local_id": local_id, "server_id": 7, "updated_at": row["updated_at"]}]
+    assert database.markSynced("tasks", acks) == 1
@@ -0,0 +1,31 @@
+import sqlite3
+
+ARABIC_YEH = chr(0x064A)
+PERSIAN_YEH = chr(0x06CC)
+
+
+def test_other_clients_can_write_tasks_and_their_text_is_indexed(database, user_id):
+    local_id = database.addTask("groceries", user_id, "milk", 1, "2026-01-01")
+
+    # A client without nazm_normalize(), such as the sqlite3 shell or a DB browser
+    conn = sqlite3.connect(database.db_name)
+    with conn:
+        conn.execute("INSERT INTO tasks (local_id, user_id, title, date_time) VALUES (?, ?, ?, ?)",
+                     ("external", user_id, "Al" + ARABIC_YEH, "2026-01-01"))
+        conn.execute("UPDATE tasks SET title = 'laundry' WHERE local_id = ?", (local_id,))
+    conn.close()
+
+    assert [task["local_id"] for task in database.searchTasks(user_id, "Al" + PERSIAN_YEH)] == ["external"]
+    assert [task["local_id"] for task in database.searchTasks(user_id, "laund")] == [local_id]
+    assert database.searchTasks(user_id, "groceries") == []
+
+
+def test_deleted_rows_leave_the_index(database, user_id):
+    local_id = database.addTask("groceries", user_id, None, 1, "2026-01-01")
+    with database.getConnection() as conn:
+        conn.execute("DELETE FROM tasks WHERE local_id = ?", (local_id,))
+
+    assert database.searchTasks(user_id, "groceries") == []
+    with database.getConnection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM search_pending").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM tasks_fts").fetchone()[0] == 0
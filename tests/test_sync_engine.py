@@ -0,0 +1,146 @@
+import json
+import threading
+import time
+import zlib
+
+from database_manager import DatabaseManager
+from sync_engine import SyncEngine, SyncError, SyncTransport
+
+
+class FakeServer(SyncTransport):
+    """
+    In-process stand-in for the sync server. Pushed rows are stored per table and acked
+    with a server_id; pulls page through changes in order, with their index as the cursor.
+    """
+    def __init__(self, changes: list = None, delay: float = 0):
+        self.pushes = []
+        self.pulls = []
+        self.changes = changes or []   # [(table, row)] handed out by pulls
+        self.delay = delay
+        self.on_push = None
+        self.fail = False
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+
+    def exchange(self, payload: bytes) -> bytes:
+        if self.fail:
+            raise SyncError("Sync server unreachable: connection refused")
+        message = json.loads(zlib.decompress(payload))
+        if message["op"] == "push":
+            reply = self.push(message)
+        else:
+            reply = self.pull(message)
+        return zlib.compress(json.dumps(reply).encode("utf-8"))
+
+
+    def push(self, message: dict) -> dict:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.pushes.append(message)
+        if self.on_push is not None:
+            self.on_push(message)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        return {"acks": [{"local_id": row["local_id"], "server_id": 1000 + i}
+                         for i, row in enumerate(message["rows"])]}
+
+
+    def pull(self, message: dict) -> dict:
+        self.pulls.append(message)
+        start = int(message["since"] or 0)
+        page = self.changes[start:start + message["limit"]]
+        changes = {}
+        for table, row in page:
+            changes.setdefault(table, []).append(row)
+        end = start + len(page)
+        return {"changes": changes, "cursor": str(end), "more": end < len(self.changes)}
+
+
+def addTasks(database: DatabaseManager, user_id: int, count: int) -> list:
+    return [database.addTask(f"task {i}", user_id, None, 1, "2026-01-01") for i in range(count)]
+
+
+def dirtyTaskIds(database: DatabaseManager, user_id: int) -> set:
+    return {row["local_id"] for row in database.getDirtyRows("tasks", user_id, 0, 1000)}
+
+
+def test_push_pages_dirty_rows_with_bounded_concurrency(database, user_id):
+    local_ids = addTasks(database, user_id, 25)
+    server = FakeServer(delay=0.02)
+    engine = SyncEngine(database, server, user_id, batch_size=10, concurrency=2)
+
+    report = engine.sync()
+
+    assert report == {"pushed": 25, "pulled": 0, "ok": True}
+    task_pushes = [push for push in server.pushes if push["table"] == "tasks"]
+    assert [len(push["rows"]) for push in task_pushes] == [10, 10, 5]
+    assert sorted(row["local_id"] for push in task_pushes for row in push["rows"]) == sorted(local_ids)
+    assert server.max_in_flight == 2
+    assert dirtyTaskIds(database, user_id) == set()
+
+
+def test_rows_edited_during_a_push_stay_dirty(database, user_id):
+    kept_id, edited_id = addTasks(database, user_id, 2)
+    server = FakeServer()
+
+    def editWhileInFlight(message):
+        time.sleep(0.002)
+        database.updateTask(edited_id, title="edited later")
+
+    server.on_push = editWhileInFlight
+    report = SyncEngine(database, server, user_id).sync()
+
+    assert report["pushed"] == 1
+    assert dirtyTaskIds(database, user_id) == {edited_id}
+    synced = {task["local_id"]: task for task in database.getTasksByDate("2026-01-01", user_id)}
+    assert synced[kept_id]["server_id"] == 1000
+
+
+def test_pull_follows_the_cursor_until_the_server_has_no_more(database, user_id):
+    changes = [("tasks", {"local_id": f"remote-{i}", "title": f"remote {i}", "date_time": "2026-01-02",
+                          "updated_at": "2026-01-01 10:00:00.000"}) for i in range(5)]
+    server = FakeServer(changes)
+
+    report = SyncEngine(database, server, user_id, batch_size=2).sync()
+
+    assert report == {"pushed": 0, "pulled": 5, "ok": True}
+    assert [pull["since"] for pull in server.pulls] == [None, "2", "4"]
+    assert database.getSyncCursor(user_id) == "5"
+    assert len(database.getTasksByDate("2026-01-02", user_id)) == 5
+
+    # The next sync starts from the stored cursor and finds nothing new
+    assert SyncEngine(database, server, user_id, batch_size=2).sync()["pulled"] == 0
+    assert server.pulls[-1]["since"] == "5"
+
+
+def test_pulled_rows_win_only_when_their_updated_at_is_newer(database, user_id):
+    local_id = addTasks(database, user_id, 1)[0]
+    SyncEngine(database, FakeServer(), user_id).sync()
+    stored = database.getTasksByDate("2026-01-01", user_id)[0]
+
+    older = {"local_id": local_id, "title": "older server copy", "updated_at": "2000-01-01 00:00:00.000"}
+    newer = {"local_id": local_id, "title": "newer server copy", "updated_at": "2999-01-01 00:00:00.000"}
+
+    SyncEngine(database, FakeServer([("tasks", older)]), user_id).sync()
+    assert database.getTasksByDate("2026-01-01", user_id)[0]["title"] == stored["title"]
+
+    database.setSyncCursor(user_id, "0")
+    SyncEngine(database, FakeServer([("tasks", newer)]), user_id).sync()
+    assert database.getTasksByDate("2026-01-01", user_id)[0]["title"] == "newer server copy"
+
+
+def test_transport_failure_reports_not_ok_and_keeps_rows_dirty(database, user_id):
+    local_ids = addTasks(database, user_id, 3)
+    server = FakeServer()
+    server.fail = True
+
+    report = SyncEngine(database, server, user_id).sync()
+
+    assert report["ok"] is False
+    assert report["pushed"] == 0
+    assert dirtyTaskIds(database, user_id) == set(local_ids)
+    assert database.getSyncCursor(user_id) is None
@@ -0,0 +1,45 @@
+from task_cache import TaskCache
+
+
+def test_month_load_discarded_by_a_mutation_is_read_again(database, user_id):
+    database.addTask("task", user_id, None, 1, "2026-01-01")
+    cache = TaskCache(database, user_id)
+
+    read_range = database.getTasksInRange
+    reads = []
+
+    def mutatedDuringFirstRead(*args):
+        rows = read_range(*args)
+        reads.append(rows)
+        if len(reads) == 1:
+            # What an edit on the GUI thread does while the month is being read
+            with cache._lock:
+                cache.bumpGeneration("2026-01")
+        return rows
+
+    database.getTasksInRange = mutatedDuringFirstRead
+    try:
+        month = cache.getMonth("2026-01")
+    finally:
+        cache.close()
+
+    assert len(reads) == 2
+    assert [task["title"] for task in month["2026-01-01"]] == ["task"]
+
+
+def test_update_patches_the_cache_with_only_the_written_fields(database, user_id):
+    local_id = database.addTask("task", user_id, None, 1, "2026-01-01")
+    cache = TaskCache(database, user_id)
+    try:
+        cache.getTasksByDate("2026-01-01")
+        # date_time is not an updatable column, so the database ignores it
+        assert cache.updateTask(local_id, title="renamed", date_time="2026-02-02")
+        cached = cache.getTasksByDate("2026-01-01")[0]
+    finally:
+        cache.close()
+
+    stored = database.getTasksByDate("2026-01-01", user_id)[0]
+    assert cached["title"] == stored["title"] == "renamed"
+    assert cached["date_time"] == stored["date_time"] == "2026-01-01"
+    assert cached["updated_at"] == stored["updated_at"]
+    assert cached["needs_sync"] == 1
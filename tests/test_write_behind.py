@@ -0,0 +1,131 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from database_manager import DatabaseManager
+
+
+def addTask(database: DatabaseManager, title: str = "task") -> str:
+    user_id = database.getListOfUsers()[0]["id"]
+    return database.addTask(title, user_id, None, 1, "2026-01-01")
+
+
+def storedTask(database: DatabaseManager, local_id: str) -> dict:
+    """Reads a task through a separate connection, bypassing the buffer and its flushes."""
+    conn = sqlite3.connect(database.db_name)
+    conn.row_factory = sqlite3.Row
+    try:
+        return dict(conn.execute("SELECT * FROM tasks WHERE local_id = ?", (local_id,)).fetchone())
+    finally:
+        conn.close()
+
+
+def test_buffered_writes_are_coalesced_last_write_wins(database):
+    local_id = addTask(database)
+    database.enableWriteBehind(flush_interval=60)
+
+    database.toggleTask(local_id, True)
+    database.updateTask(local_id, title="renamed")
+    database.toggleTask(local_id, False)
+
+    assert database.hasPendingWrites()
+    assert database.flushPendingWrites() == 1
+    task = storedTask(database, local_id)
+    assert task["is_complete"] == 0
+    assert task["title"] == "renamed"
+
+
+def test_unflushed_writes_are_lost_on_crash_but_flushed_ones_survive(database):
+    flushed_id = addTask(database, "flushed")
+    buffered_id = addTask(database, "buffered")
+    database.enableWriteBehind(flush_interval=60)
+
+    database.toggleTask(flushed_id, True)
+    database.flushPendingWrites()
+    database.toggleTask(buffered_id, True)
+
+    # A crash: the buffer is never flushed and only what was committed is on disk
+    assert storedTask(database, flushed_id)["is_complete"] == 1
+    assert storedTask(database, buffered_id)["is_complete"] == 0
+
+
+def slowFlusherCommits(database: DatabaseManager, delay: float = 0.2):
+    """Delays the flush thread between taking the buffer and writing it, widening that window."""
+    transaction = database.transaction
+
+    @contextmanager
+    def slowTransaction(*args, **kwargs):
+        if threading.current_thread().name == "DatabaseFlusher":
+            time.sleep(delay)
+        with transaction(*args, **kwargs) as conn:
+            yield conn
+
+    database.transaction = slowTransaction
+
+
+def waitForFlusherToTakeBuffer(database: DatabaseManager):
+    deadline = time.monotonic() + 5
+    while database.hasPendingWrites():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_read_waits_for_a_flush_in_progress(database, user_id):
+    local_id = addTask(database)
+    slowFlusherCommits(database)
+    database.enableWriteBehind(flush_interval=0)
+
+    database.toggleTask(local_id, True)
+    waitForFlusherToTakeBuffer(database)
+
+    tasks = database.getTasksByDate("2026-01-01", user_id)
+    assert tasks[0]["is_complete"] == 1
+
+
+def test_flushes_commit_in_buffer_order(database):
+    local_id = addTask(database)
+    slowFlusherCommits(database)
+    database.enableWriteBehind(flush_interval=0)
+
+    database.toggleTask(local_id, True)
+    waitForFlusherToTakeBuffer(database)
+    # Flushed on this thread while the flush thread is still committing the older write
+    database.toggleTask(local_id, False)
+    database.flushPendingWrites()
+
+    database.disableWriteBehind()
+    assert storedTask(database, local_id)["is_complete"] == 0
+
+
+def test_constraint_violation_is_quarantined_without_blocking_other_writes(database):
+    good_id = addTask(database, "good")
+    bad_id = addTask(database, "bad")
+    database.enableWriteBehind(flush_interval=60)
+
+    database.toggleTask(good_id, True)
+    database.updateTask(bad_id, priority=7)
+
+    assert database.flushPendingWrites() == 1
+    assert not database.hasPendingWrites()
+    assert storedTask(database, good_id)["is_complete"] == 1
+    assert storedTask(database, bad_id)["priority"] == 1
+    assert [write["local_id"] for write in database.failed_writes] == [bad_id]
+
+
+def test_write_failing_every_flush_is_dropped_after_max_attempts(database):
+    local_id = addTask(database)
+    database.enableWriteBehind(flush_interval=60)
+    database.toggleTask(local_id, True)
+
+    def failingWrite(pending):
+        raise sqlite3.OperationalError("database is locked")
+
+    database.writeTaskFields = failingWrite
+    for _ in range(DatabaseManager.MAX_FLUSH_ATTEMPTS - 1):
+        assert database.flushPendingWrites() == 0
+        assert database.hasPendingWrites()
+
+    database.flushPendingWrites()
+    assert not database.hasPendingWrites()
+    assert database.failed_writes[0]["local_id"] == local_id